@@ -4,7 +4,7 @@ Provides standardized interface for ChatterBox operations in multilingual engine
 """
 
 import torch
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 # Use absolute import to avoid relative import issues in ComfyUI
 import sys
 import os
@@ -83,33 +83,7 @@ class ChatterBoxEngineAdapter:
         enable_cache = params.get("enable_audio_cache", True)
         
         # Create cache function if caching is enabled
-        cache_fn = None
-        if enable_cache:
-            from utils.audio.cache import create_cache_function
-            
-            # Get current language/model for cache key
-            current_language = params.get("current_language", params.get("model", "English"))
-            audio_component = params.get("stable_audio_component", "main_reference")
-            if character != "narrator":
-                audio_component = f"char_file_{character}"
-            
-            # Get model source
-            model_source = params.get("model_source")
-            if not model_source and hasattr(self.node, 'model_manager'):
-                model_source = self.node.model_manager.get_model_source("tts")
-            
-            cache_fn = create_cache_function(
-                engine_type="chatterbox",
-                character=character,
-                exaggeration=exaggeration,
-                temperature=temperature,
-                cfg_weight=cfg_weight,
-                seed=seed,
-                audio_component=audio_component,
-                model_source=model_source or "unknown",
-                device=params.get("device", "auto"),
-                language=current_language
-            )
+        cache_fn = self._create_cache_function(character, params) if enable_cache else None
         
         # Handle caching externally for consistency with F5-TTS
         if cache_fn:
@@ -140,6 +114,86 @@ class ChatterBoxEngineAdapter:
         
         return audio_result
     
+    def generate_segments_audio_batch(self, segments: List[Tuple[int, str, str, str]], **params) -> Dict[int, torch.Tensor]:
+        """
+        Generate a whole group of ChatterBox segments with batched T3 sampling.
+        
+        Args:
+            segments: List of (segment index, text, reference audio path, character)
+            **params: Additional ChatterBox parameters (batch_size sets the T3 batch size)
+            
+        Returns:
+            Dict mapping segment index to audio. Segments with pause tags are not included
+            and must be generated with generate_segment_audio.
+        """
+        from utils.text.pause_processor import PauseTagProcessor
+        
+        enable_cache = params.get("enable_audio_cache", True)
+        template = params.get("crash_protection_template", "hmm ,, {seg} hmm ,,")
+        
+        results = {}
+        pending = []  # (segment index, text, reference audio, cache function)
+        for segment_idx, text, char_audio, character in segments:
+            if PauseTagProcessor.has_pause_tags(text):
+                continue
+            cache_fn = self._create_cache_function(character, params) if enable_cache else None
+            if cache_fn:
+                cached_audio = cache_fn(text)
+                if cached_audio is not None:
+                    results[segment_idx] = cached_audio
+                    continue
+            pending.append((segment_idx, text, char_audio, cache_fn))
+        
+        if not pending:
+            return results
+        
+        print(f"⚡ ChatterBox: Batch generating {len(pending)} segment(s) with batch size {params.get('batch_size', 1)}")
+        wavs = self.node.generate_tts_audio_batch(
+            [self.node._pad_short_text_for_chatterbox(text, template) for _, text, _, _ in pending],
+            [char_audio for _, _, char_audio, _ in pending],
+            exaggeration=params.get("exaggeration", 1.0),
+            temperature=params.get("temperature", 0.8),
+            cfg_weight=params.get("cfg_weight", 1.0),
+            batch_size=params.get("batch_size", 1)
+        )
+        for (segment_idx, text, _, cache_fn), wav in zip(pending, wavs):
+            if cache_fn:
+                cache_fn(text, wav)
+            results[segment_idx] = wav
+        return results
+    
+    def _create_cache_function(self, character: str, params: Dict[str, Any]):
+        """Create the segment cache function for a character with the current generation parameters."""
+        from utils.audio.cache import create_cache_function
+        
+        # Get current language/model for cache key
+        current_language = params.get("current_language", params.get("model", "English"))
+        audio_component = params.get("stable_audio_component", "main_reference")
+        if character != "narrator":
+            audio_component = f"char_file_{character}"
+        
+        # Get model source
+        model_source = params.get("model_source")
+        if not model_source and hasattr(self.node, 'model_manager'):
+            model_source = self.node.model_manager.get_model_source("tts")
+        
+        # Flow solver settings change the rendered audio, as in the single-speaker cache key
+        flow_component = self.node.get_flow_cache_component() if hasattr(self.node, 'get_flow_cache_component') else ""
+        
+        return create_cache_function(
+            engine_type="chatterbox",
+            character=character,
+            exaggeration=params.get("exaggeration", 1.0),
+            temperature=params.get("temperature", 0.8),
+            cfg_weight=params.get("cfg_weight", 1.0),
+            seed=params.get("seed", 0),
+            audio_component=audio_component,
+            model_source=model_source or "unknown",
+            device=params.get("device", "auto"),
+            language=current_language,
+            flow=flow_component
+        )
+    
     def combine_audio_chunks(self, audio_segments: List[torch.Tensor], **params) -> torch.Tensor:
         """
         Combine ChatterBox audio segments.
@@ -4,10 +4,10 @@ Provides time-stretching, silence padding, and sample-accurate timing conversion
 """
 
 import torch
+import torch.nn.functional as F
 import torchaudio
 import numpy as np
-from typing import Tuple, Optional, List, Union
-import librosa
+from typing import Tuple, Optional, List, Union, Dict
 from scipy.signal import stft, istft
 import warnings
 import subprocess
@@ -15,6 +15,11 @@ import tempfile
 import os
 import shutil
 import soundfile as sf
+from concurrent.futures import ThreadPoolExecutor
+
+# Time stretcher used by stretch_to_fit and smart_natural timing ("wsola", "ffmpeg" or "phase_vocoder")
+TIME_STRETCHER_ENV = "CHATTERBOX_TIME_STRETCHER"
+STRETCHER_TYPES = ("wsola", "ffmpeg", "phase_vocoder")
 
 
 class AudioTimingError(Exception):
@@ -22,6 +27,57 @@ class AudioTimingError(Exception):
     pass
 
 
+# Result of the `ffmpeg -version` probe: None = not probed yet, "" = available, otherwise the error
+_ffmpeg_probe_error: Optional[str] = None
+# max_workers -> thread pool stretching segments concurrently, kept for the lifetime of the process
+_stretch_pools: Dict[int, ThreadPoolExecutor] = {}
+
+
+def check_ffmpeg_available():
+    """Raise AudioTimingError if FFmpeg is not usable. Probes once per process."""
+    global _ffmpeg_probe_error
+    if _ffmpeg_probe_error is None:
+        try:
+            result = subprocess.run(['ffmpeg', '-version'], capture_output=True)
+            _ffmpeg_probe_error = "" if result.returncode == 0 else "FFmpeg check failed"
+        except Exception as e:
+            _ffmpeg_probe_error = f"FFmpeg not found: {str(e)}"
+    if _ffmpeg_probe_error:
+        raise AudioTimingError(_ffmpeg_probe_error)
+
+
+def get_stretch_pool(max_workers: Optional[int] = None) -> ThreadPoolExecutor:
+    """Process-wide thread pool for concurrent segment stretching (default: CPU count, at most 8)."""
+    max_workers = max_workers or min(8, os.cpu_count() or 1)
+    pool = _stretch_pools.get(max_workers)
+    if pool is None:
+        pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="time_stretch")
+        _stretch_pools[max_workers] = pool
+    return pool
+
+
+def stretch_concurrently(stretch_fn, segments: List[torch.Tensor], stretch_factors: List[float],
+                         sample_rate: int, max_workers: Optional[int] = None) -> List[torch.Tensor]:
+    """
+    Run stretch_fn(audio, stretch_factor, sample_rate) for every segment on the stretch pool
+    
+    Segments with a factor of 1.0 are returned as-is. Results keep the input order; the first
+    failing segment's exception is re-raised.
+    """
+    if len(segments) != len(stretch_factors):
+        raise AudioTimingError("Need one stretch factor per segment")
+    pool = get_stretch_pool(max_workers)
+    futures = {
+        i: pool.submit(stretch_fn, audio, stretch_factor, sample_rate)
+        for i, (audio, stretch_factor) in enumerate(zip(segments, stretch_factors))
+        if abs(stretch_factor - 1.0) >= 1e-6
+    }
+    results = list(segments)
+    for i, future in futures.items():
+        results[i] = future.result()
+    return results
+
+
 class AudioTimingUtils:
     """
     Utilities for audio timing manipulation and synchronization
@@ -149,18 +205,32 @@ class AudioTimingUtils:
 class PhaseVocoderTimeStretcher:
     """
     Phase vocoder-based time stretching implementation
+    
+    Runs librosa's phase vocoder algorithm as one batched torch STFT over every channel (and
+    batch item) of the input, on whatever device the audio already lives on.
     """
     
-    def __init__(self, hop_length: int = 512, win_length: int = 2048):
+    def __init__(self, hop_length: int = 512, win_length: int = 2048, max_workers: Optional[int] = None):
         """
         Initialize phase vocoder
         
         Args:
             hop_length: STFT hop length
-            win_length: STFT window length
+            win_length: STFT window length (also the FFT size)
+            max_workers: Segments stretched concurrently by time_stretch_batch (default: CPU count, at most 8)
         """
         self.hop_length = hop_length
         self.win_length = win_length
+        self.max_workers = max_workers
+        self._window_cache = {}  # device -> Hann window
+    
+    def _get_window(self, device) -> torch.Tensor:
+        key = str(device)
+        window = self._window_cache.get(key)
+        if window is None:
+            window = torch.hann_window(self.win_length, device=device)
+            self._window_cache[key] = window
+        return window
     
     def time_stretch(self, audio: torch.Tensor, stretch_factor: float, 
                     sample_rate: int) -> torch.Tensor:
@@ -168,12 +238,12 @@ class PhaseVocoderTimeStretcher:
         Time-stretch audio using phase vocoder
         
         Args:
-            audio: Input audio tensor (1D or 2D)
+            audio: Input audio tensor, (samples), (channels, samples) or (batch, channels, samples)
             stretch_factor: Time stretching factor (>1 = slower, <1 = faster)
             sample_rate: Audio sample rate
             
         Returns:
-            Time-stretched audio tensor
+            Time-stretched audio tensor with the same leading dimensions, on the input's device
         """
         if stretch_factor <= 0:
             raise AudioTimingError(f"Stretch factor must be positive: {stretch_factor}")
@@ -181,64 +251,220 @@ class PhaseVocoderTimeStretcher:
         if abs(stretch_factor - 1.0) < 1e-6:
             return audio  # No stretching needed
         
-        # Handle different tensor dimensions
-        original_shape = audio.shape
-        if audio.dim() == 1:
-            audio = audio.unsqueeze(0)  # Add channel dimension
-        elif audio.dim() > 2:
+        if audio.dim() > 3:
             raise AudioTimingError(f"Unsupported audio tensor dimensions: {audio.dim()}")
+        if audio.size(-1) == 0:
+            return audio
         
-        stretched_channels = []
+        # Every channel of every batch item goes through the same STFT
+        signals = audio.reshape(-1, audio.size(-1))
+        if not signals.is_floating_point() or signals.dtype == torch.float16 or signals.dtype == torch.bfloat16:
+            signals = signals.float()
+        stretched = self._phase_vocoder(signals, stretch_factor)
+        return stretched.reshape(*audio.shape[:-1], stretched.size(-1)).to(audio.dtype)
+    
+    def _phase_vocoder(self, signals: torch.Tensor, stretch_factor: float) -> torch.Tensor:
+        """
+        Stretch a (N, samples) batch; same result as librosa.effects.time_stretch per row
         
-        for channel in range(audio.size(0)):
-            channel_audio = audio[channel].cpu().numpy()
-            
-            try:
-                # Use librosa for phase vocoder time stretching
-                stretched = librosa.effects.time_stretch(
-                    channel_audio, 
-                    rate=1.0/stretch_factor,  # librosa uses rate = 1/stretch_factor
-                    hop_length=self.hop_length
-                )
-                stretched_channels.append(torch.from_numpy(stretched))
-                
-            except Exception as e:
-                # Fallback to simple resampling if phase vocoder fails
-                warnings.warn(f"Phase vocoder failed, using simple resampling: {e}")
-                stretched = self._simple_time_stretch(channel_audio, stretch_factor)
-                stretched_channels.append(torch.from_numpy(stretched))
+        librosa's frame loop is vectorized: magnitudes are interpolated between neighbouring frames
+        at every output step, and the running phase is an exclusive cumulative sum of the per-step
+        phase advances (accumulated in float64 so long inputs do not drift).
+        """
+        n_fft = self.win_length
+        window = self._get_window(signals.device)
+        spec = torch.stft(signals, n_fft, self.hop_length, window=window, center=True,
+                          pad_mode="constant", return_complex=True)  # (N, bins, frames)
         
-        # Combine channels
-        result = torch.stack(stretched_channels, dim=0).to(audio.device)
+        n_frames = spec.size(-1)
+        time_steps = torch.arange(0, n_frames, 1.0 / stretch_factor, dtype=torch.float64, device=spec.device)
+        spec = F.pad(spec, (0, 2))  # frames past the end are silent, as in librosa
+        left_index = time_steps.floor().long()
+        alpha = (time_steps - left_index).to(signals.dtype)
+        left = spec[..., left_index]
+        right = spec[..., left_index + 1]
+        
+        magnitude = (1 - alpha) * left.abs() + alpha * right.abs()
+        
+        # Expected phase advance per hop for each bin, and the measured deviation from it
+        phi_advance = torch.linspace(0, np.pi * self.hop_length, spec.size(-2), device=spec.device,
+                                     dtype=signals.dtype).unsqueeze(-1)
+        dphase = right.angle() - left.angle() - phi_advance
+        dphase = dphase - 2.0 * np.pi * torch.round(dphase / (2.0 * np.pi))
+        
+        acc_dtype = torch.float32 if spec.device.type == "mps" else torch.float64  # no float64 on MPS
+        increments = (phi_advance + dphase).to(acc_dtype)
+        phase = torch.cumsum(increments, dim=-1) - increments  # phase before each step's advance
+        phase = torch.remainder(phase + spec[..., :1].angle().to(acc_dtype), 2.0 * np.pi).to(signals.dtype)
+        
+        stretched = torch.polar(magnitude, phase)
+        out_length = int(round(signals.size(-1) * stretch_factor))
+        return torch.istft(stretched, n_fft, self.hop_length, window=window, center=True, length=out_length)
+    
+    def time_stretch_batch(self, segments: List[torch.Tensor], stretch_factors: List[float],
+                           sample_rate: int) -> List[torch.Tensor]:
+        """Time-stretch several segments concurrently on the stretch thread pool"""
+        return stretch_concurrently(self.time_stretch, segments, stretch_factors, sample_rate, self.max_workers)
+
+
+class WSOLATimeStretcher:
+    """
+    In-process WSOLA (waveform similarity overlap-add) time stretching - the algorithm behind
+    FFmpeg's atempo filter - running on tensors on any device without subprocesses or temp files.
+    Several segments are stretched in one batched pass, and all channels of a segment share the
+    same frame alignment so the stereo image is preserved.
+    """
+    
+    # quality mode -> (frame length in seconds, similarity search range as a fraction of the frame)
+    QUALITY_MODES = {
+        "quality": (0.030, 0.5),   # atempo defaults: 30 ms Hann frames, +-half a frame search
+        "fast": (0.030, 0.125),
+    }
+    
+    def __init__(self, quality: str = "quality", max_batch_size: int = 16):
+        """
+        Initialize WSOLA stretcher
         
-        # Restore original shape if input was 1D
-        if len(original_shape) == 1:
-            result = result.squeeze(0)
+        Args:
+            quality: "quality" (close to atempo) or "fast" (narrower similarity search)
+            max_batch_size: Maximum number of segments stretched together
+        """
+        if quality not in self.QUALITY_MODES:
+            raise AudioTimingError(f"Invalid WSOLA quality: {quality}. Use one of {list(self.QUALITY_MODES)}")
+        self.quality = quality
+        self.max_batch_size = max_batch_size
+        self._windows = {}  # (length, device, dtype) -> Hann window
+    
+    def _get_window(self, win_length: int, device) -> torch.Tensor:
+        key = (win_length, str(device))
+        window = self._windows.get(key)
+        if window is None:
+            window = torch.hann_window(win_length, periodic=True, device=device)
+            self._windows[key] = window
+        return window
+    
+    def time_stretch(self, audio: torch.Tensor, stretch_factor: float,
+                    sample_rate: int) -> torch.Tensor:
+        """
+        Time-stretch audio with WSOLA
         
-        return result
+        Args:
+            audio: Input audio tensor (1D or 2D)
+            stretch_factor: Time stretching factor (>1 = slower, <1 = faster)
+            sample_rate: Audio sample rate
+            
+        Returns:
+            Time-stretched audio tensor with round(length * stretch_factor) samples
+        """
+        return self.time_stretch_batch([audio], [stretch_factor], sample_rate)[0]
     
-    def _simple_time_stretch(self, audio: np.ndarray, stretch_factor: float) -> np.ndarray:
+    def time_stretch_batch(self, segments: List[torch.Tensor], stretch_factors: List[float],
+                          sample_rate: int) -> List[torch.Tensor]:
         """
-        Simple time stretching using interpolation (fallback method)
+        Time-stretch several segments, batching segments of similar length together
         
         Args:
-            audio: Input audio array
-            stretch_factor: Time stretching factor
+            segments: Audio tensors (1D or 2D), each with its own stretch factor
+            stretch_factors: Time stretching factor per segment
+            sample_rate: Audio sample rate
             
         Returns:
-            Time-stretched audio array
+            List of time-stretched tensors in input order
         """
-        original_length = len(audio)
-        new_length = int(original_length * stretch_factor)
+        if len(segments) != len(stretch_factors):
+            raise AudioTimingError("Number of segments must match number of stretch factors")
+        
+        results = list(segments)
+        pending = []
+        for i, (audio, factor) in enumerate(zip(segments, stretch_factors)):
+            if factor <= 0:
+                raise AudioTimingError(f"Stretch factor must be positive: {factor}")
+            if audio.dim() > 2:
+                raise AudioTimingError(f"Unsupported audio tensor dimensions: {audio.dim()}")
+            if abs(factor - 1.0) >= 1e-6 and audio.size(-1) > 0:
+                pending.append(i)
+        
+        # Group segments with the same channel count and similar length to limit padding
+        def channels(i):
+            return 1 if segments[i].dim() == 1 else segments[i].size(0)
+        pending.sort(key=lambda i: (channels(i), segments[i].size(-1)))
+        
+        start = 0
+        while start < len(pending):
+            group = [pending[start]]
+            while (len(group) < self.max_batch_size and start + len(group) < len(pending)
+                   and channels(pending[start + len(group)]) == channels(group[0])):
+                group.append(pending[start + len(group)])
+            stretched = self._stretch_group([segments[i] for i in group],
+                                            [stretch_factors[i] for i in group], sample_rate)
+            for i, audio in zip(group, stretched):
+                results[i] = audio
+            start += len(group)
+        
+        return results
+    
+    def _stretch_group(self, segments: List[torch.Tensor], stretch_factors: List[float],
+                      sample_rate: int) -> List[torch.Tensor]:
+        """Stretch segments with equal channel counts in one padded (B, C, T) batch."""
+        frame_seconds, search_fraction = self.QUALITY_MODES[self.quality]
+        win = max(4, int(sample_rate * frame_seconds) // 2 * 2)
+        hop = win // 2
+        delta = int(win * search_fraction)
+        
+        device = segments[0].device
+        batch = len(segments)
+        lengths = [seg.size(-1) for seg in segments]
+        out_lengths = [max(1, int(round(n * f))) for n, f in zip(lengths, stretch_factors)]
+        n_frames = max((n + hop - 1) // hop + 2 for n in out_lengths)
+        
+        # Nominal analysis positions (in padded coordinates) of every output frame
+        factors = torch.tensor(stretch_factors, dtype=torch.float64, device=device)
+        frame_index = torch.arange(n_frames, dtype=torch.float64, device=device)
+        nominal = (frame_index[None, :] * hop / factors[:, None]).round().long() + delta
+        
+        # Zero-padded input: half a frame plus the search range on the left (so frame k is centred
+        # on input sample k * hop / factor), enough for every frame and search window on the right
+        left = hop + delta
+        padded_length = max(int(nominal.max()) + 2 * delta + hop + win, left + max(lengths)) + 1
+        x = torch.zeros(batch, 1 if segments[0].dim() == 1 else segments[0].size(0), padded_length,
+                        device=device, dtype=torch.float32)
+        for b, seg in enumerate(segments):
+            x[b, :, left:left + lengths[b]] = seg.float()
         
-        # Create new time indices
-        old_indices = np.linspace(0, original_length - 1, original_length)
-        new_indices = np.linspace(0, original_length - 1, new_length)
+        window = self._get_window(win, device)
+        mono = x.mean(dim=1)
+        win_range = torch.arange(win, device=device)
+        search_range = torch.arange(win + 2 * delta, device=device)
         
-        # Interpolate
-        stretched = np.interp(new_indices, old_indices, audio)
+        # Sequential WSOLA alignment, vectorized over the batch: each frame is shifted by up to
+        # +-delta to best match the natural continuation of the previously chosen frame
+        positions = torch.empty(batch, n_frames, dtype=torch.long, device=device)
+        positions[:, 0] = nominal[:, 0]
+        for k in range(1, n_frames):
+            target = mono.gather(1, (positions[:, k - 1] + hop)[:, None] + win_range) * window
+            if delta == 0:
+                positions[:, k] = nominal[:, k]
+                continue
+            candidates = mono.gather(1, (nominal[:, k] - delta)[:, None] + search_range)
+            correlation = F.conv1d(candidates[None], target[:, None, :], groups=batch)[0]
+            best = correlation.argmax(dim=-1)
+            best = torch.where(target.abs().amax(dim=-1) > 0, best, torch.full_like(best, delta))
+            positions[:, k] = nominal[:, k] - delta + best
         
-        return stretched
+        # Overlap-add all frames at once (periodic Hann at 50% overlap sums to one)
+        channels = x.size(1)
+        frame_idx = (positions[:, :, None] + win_range).view(batch, 1, -1).expand(batch, channels, -1)
+        frames = x.gather(2, frame_idx).view(batch * channels, n_frames, win) * window
+        output = F.fold(
+            frames.transpose(1, 2), output_size=(1, (n_frames - 1) * hop + win),
+            kernel_size=(1, win), stride=(1, hop),
+        ).view(batch, channels, -1)
+        
+        results = []
+        for b, seg in enumerate(segments):
+            out = output[b, :, hop:hop + out_lengths[b]].to(seg.dtype)
+            results.append(out.squeeze(0) if seg.dim() == 1 else out)
+        return results
 
 
 class FFmpegTimeStretcher:
@@ -246,12 +472,9 @@ class FFmpegTimeStretcher:
     
     def __init__(self):
         """Verify FFmpeg is available"""
-        try:
-            result = subprocess.run(['ffmpeg', '-version'], capture_output=True)
-            if result.returncode != 0:
-                raise AudioTimingError("FFmpeg check failed")
-        except Exception as e:
-            raise AudioTimingError(f"FFmpeg not found: {str(e)}")
+        check_ffmpeg_available()
+        self.max_workers = None
+
     def _build_filter_chain(self, stretch_factor: float) -> str:
         """Build safe FFmpeg filter chain for any stretch factor"""
         if stretch_factor <= 0:
@@ -369,8 +592,12 @@ class FFmpegTimeStretcher:
             
         except Exception as e:
             raise AudioTimingError(f"Time stretching failed: {str(e)}")
-                    
-                    # Run FFmpeg with checks
+    
+    def time_stretch_batch(self, segments: List[torch.Tensor], stretch_factors: List[float],
+                           sample_rate: int) -> List[torch.Tensor]:
+        """Time stretch several segments concurrently on the stretch thread pool"""
+        return stretch_concurrently(self.time_stretch, segments, stretch_factors, sample_rate, self.max_workers)
+    
     def _process_audio_file(self, in_path: str, out_path: str, filter_str: str,
                           sample_rate: int) -> np.ndarray:
         """Process a single audio file through FFmpeg"""
@@ -442,44 +669,149 @@ class FFmpegTimeStretcher:
         return f'atempo={speed:0.6f}'
 
 
+class PooledFFmpegTimeStretcher(FFmpegTimeStretcher):
+    """
+    FFmpeg atempo stretching over pipes: raw f32le PCM goes in on stdin and comes back on stdout,
+    so no temp files are written, and all channels of a segment go through one FFmpeg process.
+    Batches run concurrently on a bounded, process-wide thread pool.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None, timeout: float = 60.0):
+        """
+        Initialize pooled FFmpeg stretcher
+        
+        Args:
+            max_workers: Concurrent FFmpeg processes (default: CPU count, at most 8)
+            timeout: Seconds before a single FFmpeg run is aborted
+        """
+        super().__init__()
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.timeout = timeout
+    
+    def time_stretch(self, audio: torch.Tensor, stretch_factor: float, sample_rate: int) -> torch.Tensor:
+        """Time stretch audio with one FFmpeg process fed through pipes"""
+        return self.time_stretch_batch([audio], [stretch_factor], sample_rate)[0]
+    
+    def time_stretch_batch(self, segments: List[torch.Tensor], stretch_factors: List[float],
+                           sample_rate: int) -> List[torch.Tensor]:
+        """
+        Time stretch several segments concurrently
+        
+        Args:
+            segments: Audio tensors, 1D (samples) or 2D (channels, samples)
+            stretch_factors: Stretch factor per segment (>1 = slower/longer)
+            sample_rate: Sample rate shared by all segments
+            
+        Returns:
+            Stretched segments in input order, each with its input's shape layout and device
+        """
+        for audio, stretch_factor in zip(segments, stretch_factors):
+            if not isinstance(audio, torch.Tensor):
+                raise AudioTimingError("Input must be a tensor")
+            if not isinstance(stretch_factor, (int, float)) or stretch_factor <= 0:
+                raise AudioTimingError(f"Invalid stretch factor: {stretch_factor}")
+            if audio.dim() > 2:
+                raise AudioTimingError("Only mono/stereo supported")
+        return stretch_concurrently(self._run_ffmpeg, segments, stretch_factors, sample_rate, self.max_workers)
+    
+    def _run_ffmpeg(self, audio: torch.Tensor, stretch_factor: float, sample_rate: int) -> torch.Tensor:
+        """Stretch one segment: interleaved f32le in on stdin, f32le out on stdout"""
+        if audio.shape[-1] == 0:
+            return audio
+        filter_str = self._build_filter_chain(stretch_factor)
+        frames = audio.unsqueeze(0) if audio.dim() == 1 else audio
+        num_channels = frames.shape[0]
+        pcm = frames.detach().to("cpu", torch.float32).t().contiguous().numpy()
+        
+        cmd = [
+            'ffmpeg',
+            '-hide_banner',
+            '-v', 'error',
+            '-f', 'f32le', '-ar', str(sample_rate), '-ac', str(num_channels), '-i', 'pipe:0',
+            '-filter:a', filter_str,
+            '-f', 'f32le', '-ar', str(sample_rate), '-ac', str(num_channels), 'pipe:1',
+        ]
+        try:
+            result = subprocess.run(cmd, input=pcm.tobytes(), capture_output=True, timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            raise AudioTimingError("FFmpeg process timed out")
+        except Exception as e:
+            raise AudioTimingError(f"FFmpeg processing failed: {str(e)}")
+        if result.returncode != 0:
+            raise AudioTimingError(f"FFmpeg processing failed: {result.stderr.decode(errors='replace')}")
+        
+        data = np.frombuffer(result.stdout, dtype=np.float32)
+        if data.size == 0:
+            raise AudioTimingError("Empty output")
+        data = data[:data.size - data.size % num_channels].reshape(-1, num_channels).T
+        stretched = torch.from_numpy(data.copy()).to(device=audio.device, dtype=audio.dtype)
+        return stretched.squeeze(0) if audio.dim() == 1 else stretched
+
+
+def default_stretcher_type() -> str:
+    """Stretcher type from CHATTERBOX_TIME_STRETCHER, "wsola" when unset or invalid."""
+    stretcher_type = os.environ.get(TIME_STRETCHER_ENV, "wsola").strip().lower()
+    if stretcher_type not in STRETCHER_TYPES:
+        print(f"⚠️ Ignoring invalid {TIME_STRETCHER_ENV}={stretcher_type!r}, using WSOLA")
+        return "wsola"
+    return stretcher_type
+
+
+def create_time_stretcher(stretcher_type: Optional[str] = None):
+    """
+    Create a time stretcher, falling back to the phase vocoder when FFmpeg is unavailable
+    
+    Args:
+        stretcher_type: "wsola", "ffmpeg" (pooled, pipe-based) or "phase_vocoder"
+            (None = CHATTERBOX_TIME_STRETCHER, default "wsola")
+            
+    Returns:
+        Tuple of (stretcher, stretcher type actually used)
+    """
+    stretcher_type = stretcher_type or default_stretcher_type()
+    if stretcher_type == "wsola":
+        return WSOLATimeStretcher(), "wsola"
+    if stretcher_type == "ffmpeg":
+        try:
+            return PooledFFmpegTimeStretcher(), "ffmpeg"
+        except AudioTimingError as e:
+            print(f"⚠️ FFmpeg initialization failed ({str(e)}), falling back to Phase Vocoder")
+            return PhaseVocoderTimeStretcher(), "phase_vocoder"
+    if stretcher_type == "phase_vocoder":
+        return PhaseVocoderTimeStretcher(), "phase_vocoder"
+    raise AudioTimingError(f"Invalid stretcher_type: {stretcher_type}. Use 'wsola', 'ffmpeg' or 'phase_vocoder'")
+
+
 class TimedAudioAssembler:
     """
     Assembles audio segments with precise timing control
     """
     
-    def __init__(self, sample_rate: int, stretcher_type: str = "ffmpeg",
-                 time_stretcher: Optional[Union[PhaseVocoderTimeStretcher, FFmpegTimeStretcher]] = None):
+    def __init__(self, sample_rate: int, stretcher_type: Optional[str] = None,
+                 time_stretcher: Optional[Union[WSOLATimeStretcher, PhaseVocoderTimeStretcher, FFmpegTimeStretcher]] = None):
         """
         Initialize audio assembler
         
         Args:
             sample_rate: Target sample rate for output
-            stretcher_type: Type of time stretcher to use ("ffmpeg" or "phase_vocoder")
+            stretcher_type: Type of time stretcher to use ("wsola", "ffmpeg" or "phase_vocoder";
+                None = CHATTERBOX_TIME_STRETCHER, default "wsola")
             time_stretcher: Custom time stretching utility (creates default if None)
         """
         self.sample_rate = sample_rate
         self.stretch_method_used = None  # Track which stretching method was used
         
         if time_stretcher is not None:
-            if not isinstance(time_stretcher, (PhaseVocoderTimeStretcher, FFmpegTimeStretcher)):
-                raise AudioTimingError("time_stretcher must be PhaseVocoderTimeStretcher or FFmpegTimeStretcher")
+            if not isinstance(time_stretcher, (WSOLATimeStretcher, PhaseVocoderTimeStretcher, FFmpegTimeStretcher)):
+                raise AudioTimingError("time_stretcher must be WSOLATimeStretcher, PhaseVocoderTimeStretcher or FFmpegTimeStretcher")
             self.time_stretcher = time_stretcher
         else:
-            if stretcher_type == "ffmpeg":
-                try:
-                    self.time_stretcher = FFmpegTimeStretcher()
-                except AudioTimingError as e:
-                    # Fall back to phase vocoder silently
-                    self.time_stretcher = PhaseVocoderTimeStretcher()
-            elif stretcher_type == "phase_vocoder":
-                self.time_stretcher = PhaseVocoderTimeStretcher()
-            else:
-                raise AudioTimingError(f"Invalid stretcher_type: {stretcher_type}. Use 'ffmpeg' or 'phase_vocoder'")
+            self.time_stretcher, _ = create_time_stretcher(stretcher_type)
     
     def assemble_timed_audio(self, audio_segments: List[torch.Tensor], 
                            target_timings: List[Tuple[float, float]],
                            total_duration: Optional[float] = None,
-                           fade_duration: float = 0.01) -> torch.Tensor:
+                           fade_duration: float = 0.01, writer=None):
         """
         Assemble audio segments with precise timing
         
@@ -488,9 +820,11 @@ class TimedAudioAssembler:
             target_timings: List of (start_time, end_time) tuples in seconds
             total_duration: Total duration of output (auto-calculated if None)
             fade_duration: Crossfade duration in seconds for overlaps
+            writer: Optional StreamingAudioWriter (utils/timing/streaming.py); segments are then
+                stretched and written in time-ordered windows instead of into one output tensor
             
         Returns:
-            Assembled audio tensor
+            Assembled audio tensor, or the StreamedAudio handle when streaming to a writer
         """
         if len(audio_segments) != len(target_timings):
             raise AudioTimingError(
@@ -510,19 +844,26 @@ class TimedAudioAssembler:
         
         # Determine output shape based on first segment
         first_segment = audio_segments[0]
-        if first_segment.dim() == 1:
+        if writer is not None:
+            output = None
+        elif first_segment.dim() == 1:
             output = torch.zeros(total_samples, device=first_segment.device, dtype=first_segment.dtype)
         else:
             output = torch.zeros(first_segment.size(0), total_samples, 
                                device=first_segment.device, dtype=first_segment.dtype)
         
-        # Process each segment
+        # Planning pass: validate timings and work out every stretch factor up front
+        planned_segments = []
+        stretch_indices = []
+        stretch_factors = []
+        methods_used = []
         for i, (audio_segment, (start_time, end_time)) in enumerate(zip(audio_segments, target_timings)):
             if start_time < 0 or end_time <= start_time:
                 raise AudioTimingError(f"Invalid timing for segment {i}: {start_time} -> {end_time}")
             
             target_duration = end_time - start_time
             current_duration = AudioTimingUtils.get_audio_duration(audio_segment, self.sample_rate)
+            method = "none"
             
             # If input audio is empty but target duration is positive, create silence.
             if current_duration == 0.0 and target_duration > 0.0:
@@ -535,7 +876,7 @@ class TimedAudioAssembler:
                     dtype=first_segment.dtype
                 )
                 current_duration = target_duration # Update duration, no stretching needed for this segment
-                self.stretch_method_used = "silence_created"
+                method = "silence_created"
             
             # Time-stretch if needed
             if abs(current_duration - target_duration) > 0.01:  # 10ms tolerance
@@ -545,44 +886,111 @@ class TimedAudioAssembler:
                     stretch_factor = target_duration / current_duration
                 
                 # Determine and track stretching method
-                if isinstance(self.time_stretcher, FFmpegTimeStretcher):
-                    self.stretch_method_used = "ffmpeg"
+                if isinstance(self.time_stretcher, WSOLATimeStretcher):
+                    method = "wsola"
+                elif isinstance(self.time_stretcher, FFmpegTimeStretcher):
+                    method = "ffmpeg"
                 elif isinstance(self.time_stretcher, PhaseVocoderTimeStretcher):
-                    self.stretch_method_used = "phase_vocoder"
-                
-                audio_segment = self.time_stretcher.time_stretch(
-                    audio_segment, stretch_factor, self.sample_rate
-                )
+                    method = "phase_vocoder"
+                stretch_indices.append(i)
+                stretch_factors.append(stretch_factor)
             else:
                 # No stretching needed
-                self.stretch_method_used = "none"
+                method = "none"
             
+            planned_segments.append(audio_segment)
+            methods_used.append(method)
+        
+        self.stretch_method_used = methods_used[-1]
+        
+        if writer is not None:
+            return self._stream_timed_audio(writer, planned_segments, target_timings, stretch_indices,
+                                            stretch_factors, total_samples, fade_duration, first_segment.dim())
+        
+        # Stretch all planned segments at once (batched WSOLA, or concurrently on the stretch pool)
+        self._stretch_planned(planned_segments, stretch_indices, stretch_factors)
+        
+        # Place each segment
+        for audio_segment, (start_time, end_time) in zip(planned_segments, target_timings):
             # Calculate sample positions
             start_sample = AudioTimingUtils.seconds_to_samples(start_time, self.sample_rate)
             end_sample = AudioTimingUtils.seconds_to_samples(end_time, self.sample_rate)
-            
-            # Ensure segment fits exactly
-            target_samples = end_sample - start_sample
-            current_samples = audio_segment.size(-1)
-            
-            if current_samples != target_samples:
-                # Fine-tune length to match exactly
-                if current_samples > target_samples:
-                    audio_segment = audio_segment[..., :target_samples]
-                else:
-                    padding_needed = target_samples - current_samples
-                    if audio_segment.dim() == 1:
-                        padding = torch.zeros(padding_needed, device=audio_segment.device, dtype=audio_segment.dtype)
-                    else:
-                        padding = torch.zeros(audio_segment.size(0), padding_needed, 
-                                            device=audio_segment.device, dtype=audio_segment.dtype)
-                    audio_segment = torch.cat([audio_segment, padding], dim=-1)
+            audio_segment = self._fit_segment_length(audio_segment, end_sample - start_sample)
             
             # Place segment in output buffer with crossfading for overlaps
             self._place_segment_with_fade(output, audio_segment, start_sample, end_sample, fade_duration)
         
         return output
     
+    def _stretch_planned(self, planned_segments: List[torch.Tensor], stretch_indices: List[int],
+                         stretch_factors: List[float]):
+        """Stretch planned segments in place, in one batch (batched WSOLA, or concurrently on the stretch pool)"""
+        if not stretch_indices:
+            return
+        to_stretch = [planned_segments[i] for i in stretch_indices]
+        if hasattr(self.time_stretcher, "time_stretch_batch"):
+            stretched = self.time_stretcher.time_stretch_batch(to_stretch, stretch_factors, self.sample_rate)
+        else:
+            stretched = [self.time_stretcher.time_stretch(audio, factor, self.sample_rate)
+                         for audio, factor in zip(to_stretch, stretch_factors)]
+        for i, audio_segment in zip(stretch_indices, stretched):
+            planned_segments[i] = audio_segment
+    
+    @staticmethod
+    def _fit_segment_length(audio_segment: torch.Tensor, target_samples: int) -> torch.Tensor:
+        """Trim or zero-pad a segment to exactly target_samples"""
+        current_samples = audio_segment.size(-1)
+        if current_samples > target_samples:
+            return audio_segment[..., :target_samples]
+        if current_samples < target_samples:
+            padding_needed = target_samples - current_samples
+            if audio_segment.dim() == 1:
+                padding = torch.zeros(padding_needed, device=audio_segment.device, dtype=audio_segment.dtype)
+            else:
+                padding = torch.zeros(audio_segment.size(0), padding_needed, 
+                                    device=audio_segment.device, dtype=audio_segment.dtype)
+            return torch.cat([audio_segment, padding], dim=-1)
+        return audio_segment
+    
+    def _stream_timed_audio(self, writer, planned_segments: List[torch.Tensor],
+                            target_timings: List[Tuple[float, float]], stretch_indices: List[int],
+                            stretch_factors: List[float], total_samples: int, fade_duration: float,
+                            segment_dim: int, window_size: int = 16):
+        """
+        Stretch and place segments window by window into a StreamingAudioWriter
+        
+        Only window_size segments (stretched) are held at a time; audio before the earliest start
+        of the remaining segments is final and flushed to the file after every window.
+        """
+        factors = dict(zip(stretch_indices, stretch_factors))
+        starts = [AudioTimingUtils.seconds_to_samples(start, self.sample_rate) for start, _ in target_timings]
+        # Earliest start of any segment from index i on
+        next_starts = starts + [total_samples]
+        for i in range(len(starts) - 1, -1, -1):
+            next_starts[i] = min(next_starts[i], next_starts[i + 1])
+        fade_samples = AudioTimingUtils.seconds_to_samples(fade_duration, self.sample_rate)
+        
+        for window_start in range(0, len(planned_segments), window_size):
+            window = range(window_start, min(window_start + window_size, len(planned_segments)))
+            window_indices = [i for i in window if i in factors]
+            self._stretch_planned(planned_segments, window_indices, [factors[i] for i in window_indices])
+            
+            for i in window:
+                start_sample = starts[i]
+                end_sample = AudioTimingUtils.seconds_to_samples(target_timings[i][1], self.sample_rate)
+                audio_segment = self._fit_segment_length(planned_segments[i], end_sample - start_sample)
+                planned_segments[i] = None  # placed: release it
+                
+                # The region also covers the fade-out check after the segment, like the full buffer would
+                region = writer.region(start_sample, min(end_sample + fade_samples, total_samples))
+                if segment_dim == 1:
+                    region = region[0]
+                self._place_segment_with_fade(region, audio_segment.to(region.device, region.dtype),
+                                              0, end_sample - start_sample, fade_duration)
+            writer.flush_until(next_starts[window.stop])
+        
+        return writer.close(total_samples)
+    
     def _place_segment_with_fade(self, output: torch.Tensor, segment: torch.Tensor,
                                start_sample: int, end_sample: int, fade_duration: float):
         """
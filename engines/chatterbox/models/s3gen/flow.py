@@ -110,7 +110,10 @@ class MaskedDiffWithXvec(torch.nn.Module):
                   prompt_feat,
                   prompt_feat_len,
                   embedding,
-                  flow_cache):
+                  flow_cache,
+                  n_timesteps=10,
+                  solver="euler",
+                  cfg_skip_after=None):
         if self.fp16 is True:
             prompt_feat = prompt_feat.half()
             embedding = embedding.half()
@@ -143,9 +146,11 @@ class MaskedDiffWithXvec(torch.nn.Module):
             mask=mask.unsqueeze(1),
             spks=embedding,
             cond=conds,
-            n_timesteps=10,
+            n_timesteps=n_timesteps,
             prompt_len=mel_len1,
-            flow_cache=flow_cache
+            flow_cache=flow_cache,
+            solver=solver,
+            cfg_skip_after=cfg_skip_after
         )
         feat = feat[:, :, mel_len1:]
         assert feat.shape[2] == mel_len2
@@ -202,7 +207,10 @@ class CausalMaskedDiffWithXvec(torch.nn.Module):
                   prompt_feat,
                   prompt_feat_len,
                   embedding,
-                  finalize):
+                  finalize,
+                  n_timesteps=10,
+                  solver="euler",
+                  cfg_skip_after=None):
         if self.fp16 is True:
             prompt_feat = prompt_feat.half()
             embedding = embedding.half()
@@ -235,8 +243,64 @@ class CausalMaskedDiffWithXvec(torch.nn.Module):
             mask=mask.unsqueeze(1),
             spks=embedding,
             cond=conds,
-            n_timesteps=10
+            n_timesteps=n_timesteps,
+            solver=solver,
+            cfg_skip_after=cfg_skip_after
         )
         feat = feat[:, :, mel_len1:]
         assert feat.shape[2] == mel_len2
         return feat.float(), None  # NOTE jrm: why are they returning None here?
+
+    @torch.inference_mode()
+    def inference_batch(self,
+                        tokens,
+                        ref_dicts,
+                        n_timesteps=10,
+                        solver="euler",
+                        cfg_skip_after=None):
+        """
+        Batched `inference(..., finalize=True)`: one CFM solve for several token sequences, each with its own
+        reference (`ref_dicts` entries hold prompt_token, prompt_feat and embedding as for `inference`).
+        Rows (prompt + tokens) are right-padded and masked; returns one (1, 80, T_i) mel per sequence.
+        """
+        device = tokens[0].device
+        prompt_feats = [ref_dict["prompt_feat"] for ref_dict in ref_dicts]
+        embedding = torch.cat([ref_dict["embedding"] for ref_dict in ref_dicts], dim=0)
+        if self.fp16 is True:
+            prompt_feats = [prompt_feat.half() for prompt_feat in prompt_feats]
+            embedding = embedding.half()
+
+        # xvec projection
+        embedding = F.normalize(embedding, dim=1)
+        embedding = self.spk_embed_affine_layer(embedding)
+
+        # concat prompt and speech tokens per row, then pad
+        rows = [torch.cat([ref_dict["prompt_token"].view(-1), token.view(-1)]) for ref_dict, token in zip(ref_dicts, tokens)]
+        token_len = torch.tensor([row.numel() for row in rows], device=device)
+        token = nn.utils.rnn.pad_sequence(rows, batch_first=True)
+        mask = (~make_pad_mask(token_len)).unsqueeze(-1).to(embedding)
+        token = self.input_embedding(torch.clamp(token, min=0)) * mask
+
+        # text encode
+        h, _ = self.encoder(token, token_len)
+        h = self.encoder_proj(h)
+        mel_lens = token_len * self.token_mel_ratio
+        mel_len1s = [prompt_feat.shape[1] for prompt_feat in prompt_feats]
+
+        # get conditions
+        conds = torch.zeros([len(rows), h.shape[1], self.output_size], device=device).to(h.dtype)
+        for i, prompt_feat in enumerate(prompt_feats):
+            conds[i, :mel_len1s[i]] = prompt_feat[0]
+        conds = conds.transpose(1, 2)
+
+        mask = (~make_pad_mask(mel_lens, h.shape[1])).to(h)
+        feat, _ = self.decoder(
+            mu=h.transpose(1, 2).contiguous(),
+            mask=mask.unsqueeze(1),
+            spks=embedding,
+            cond=conds,
+            n_timesteps=n_timesteps,
+            solver=solver,
+            cfg_skip_after=cfg_skip_after
+        )
+        return [feat[i:i + 1, :, mel_len1s[i]:int(mel_lens[i])].float() for i in range(len(rows))]
@@ -27,6 +27,9 @@ CFM_PARAMS = OmegaConf.create({
     "reg_loss_type": "l1"
 })
 
+# Fixed-step ODE solvers available at inference: euler (1 estimator call per step), midpoint and heun (2 calls)
+FLOW_SOLVERS = ("euler", "midpoint", "heun")
+
 
 class ConditionalCFM(BASECFM):
     def __init__(self, in_channels, cfm_params, n_spks=1, spk_emb_dim=64, estimator: torch.nn.Module = None):
@@ -45,7 +48,8 @@ class ConditionalCFM(BASECFM):
         self.lock = threading.Lock()
 
     @torch.inference_mode()
-    def forward(self, mu, mask, n_timesteps, temperature=1.0, spks=None, cond=None, prompt_len=0, flow_cache=torch.zeros(1, 80, 0, 2)):
+    def forward(self, mu, mask, n_timesteps, temperature=1.0, spks=None, cond=None, prompt_len=0, flow_cache=torch.zeros(1, 80, 0, 2),
+                solver="euler", cfg_skip_after=None):
         """Forward diffusion
 
         Args:
@@ -58,6 +62,8 @@ class ConditionalCFM(BASECFM):
             spks (torch.Tensor, optional): speaker ids. Defaults to None.
                 shape: (batch_size, spk_emb_dim)
             cond: Not used but kept for future purposes
+            solver (str, optional): one of FLOW_SOLVERS. Defaults to "euler".
+            cfg_skip_after (int, optional): see `solve`. Defaults to None (CFG on every step).
 
         Returns:
             sample: generated mel-spectrogram
@@ -77,11 +83,16 @@ class ConditionalCFM(BASECFM):
         t_span = torch.linspace(0, 1, n_timesteps + 1, device=mu.device, dtype=mu.dtype)
         if self.t_scheduler == 'cosine':
             t_span = 1 - torch.cos(t_span * 0.5 * torch.pi)
-        return self.solve_euler(z, t_span=t_span, mu=mu, mask=mask, spks=spks, cond=cond), flow_cache
+        return self.solve(z, t_span=t_span, mu=mu, mask=mask, spks=spks, cond=cond,
+                          solver=solver, cfg_skip_after=cfg_skip_after), flow_cache
 
     def solve_euler(self, x, t_span, mu, mask, spks, cond):
+        """Fixed euler solver for ODEs (see `solve`)."""
+        return self.solve(x, t_span, mu, mask, spks, cond, solver="euler")
+
+    def solve(self, x, t_span, mu, mask, spks, cond, solver="euler", cfg_skip_after=None):
         """
-        Fixed euler solver for ODEs.
+        Fixed-step solver for ODEs.
         Args:
             x (torch.Tensor): random noise
             t_span (torch.Tensor): n_timesteps interpolated
@@ -93,29 +104,40 @@ class ConditionalCFM(BASECFM):
             spks (torch.Tensor, optional): speaker ids. Defaults to None.
                 shape: (batch_size, spk_emb_dim)
             cond: Not used but kept for future purposes
+            solver (str): "euler", or the second-order "midpoint" / "heun" (two estimator calls per step)
+            cfg_skip_after (int, optional): apply classifier-free guidance on the first k steps only; later
+                steps run the conditional branch alone at batch 1. None keeps CFG on every step.
         """
+        if solver not in FLOW_SOLVERS:
+            raise ValueError(f"Unknown flow solver '{solver}', expected one of {FLOW_SOLVERS}")
+        # The TensorRT engine is built for the batch-2 CFG layout only
+        can_skip_cfg = isinstance(self.estimator, torch.nn.Module)
+
         t, _, dt = t_span[0], t_span[-1], t_span[1] - t_span[0]
         t = t.unsqueeze(dim=0)
 
-        # I am storing this because I can later plot it by putting a debugger here and saving it to a file
-        # Or in future might add like a return_all_steps flag
-        sol = []
-
         # Do not use concat, it may cause memory format changed and trt infer with wrong results!
-        x_in = torch.zeros([2, 80, x.size(2)], device=x.device, dtype=x.dtype)
-        mask_in = torch.zeros([2, 1, x.size(2)], device=x.device, dtype=x.dtype)
-        mu_in = torch.zeros([2, 80, x.size(2)], device=x.device, dtype=x.dtype)
-        t_in = torch.zeros([2], device=x.device, dtype=x.dtype)
-        spks_in = torch.zeros([2, 80], device=x.device, dtype=x.dtype)
-        cond_in = torch.zeros([2, 80, x.size(2)], device=x.device, dtype=x.dtype)
-        for step in range(1, len(t_span)):
-            # Classifier-Free Guidance inference introduced in VoiceBox
-            x_in[:] = x
-            mask_in[:] = mask
-            mu_in[0] = mu
+        # Rows [0, B) are conditional, rows [B, 2B) the unconditional CFG branch (B > 1 for batched inference)
+        B = x.size(0)
+        x_in = torch.zeros([2 * B, 80, x.size(2)], device=x.device, dtype=x.dtype)
+        mask_in = torch.zeros([2 * B, 1, x.size(2)], device=x.device, dtype=x.dtype)
+        mu_in = torch.zeros([2 * B, 80, x.size(2)], device=x.device, dtype=x.dtype)
+        t_in = torch.zeros([2 * B], device=x.device, dtype=x.dtype)
+        spks_in = torch.zeros([2 * B, 80], device=x.device, dtype=x.dtype)
+        cond_in = torch.zeros([2 * B, 80, x.size(2)], device=x.device, dtype=x.dtype)
+        # Classifier-Free Guidance inference introduced in VoiceBox: unconditional rows keep zeroed conditions
+        mask_in[:B] = mask
+        mask_in[B:] = mask
+        mu_in[:B] = mu
+        spks_in[:B] = spks
+        cond_in[:B] = cond
+
+        def velocity(x, t, use_cfg):
+            x_in[:B] = x
+            x_in[B:] = x
             t_in[:] = t.unsqueeze(0)
-            spks_in[0] = spks
-            cond_in[0] = cond
+            if not use_cfg:
+                return self.forward_estimator(x_in[:B], mask_in[:B], mu_in[:B], t_in[:B], spks_in[:B], cond_in[:B])
             dphi_dt = self.forward_estimator(
                 x_in, mask_in,
                 mu_in, t_in,
@@ -123,14 +145,22 @@ class ConditionalCFM(BASECFM):
                 cond_in
             )
             dphi_dt, cfg_dphi_dt = torch.split(dphi_dt, [x.size(0), x.size(0)], dim=0)
-            dphi_dt = ((1.0 + self.inference_cfg_rate) * dphi_dt - self.inference_cfg_rate * cfg_dphi_dt)
-            x = x + dt * dphi_dt
+            return ((1.0 + self.inference_cfg_rate) * dphi_dt - self.inference_cfg_rate * cfg_dphi_dt)
+
+        for step in range(1, len(t_span)):
+            use_cfg = cfg_skip_after is None or step <= cfg_skip_after or not can_skip_cfg
+            dphi_dt = velocity(x, t, use_cfg)
+            if solver == "euler":
+                x = x + dt * dphi_dt
+            elif solver == "midpoint":
+                x = x + dt * velocity(x + 0.5 * dt * dphi_dt, t + 0.5 * dt, use_cfg)
+            else:  # heun
+                x = x + 0.5 * dt * (dphi_dt + velocity(x + dt * dphi_dt, t + dt, use_cfg))
             t = t + dt
-            sol.append(x)
             if step < len(t_span) - 1:
                 dt = t_span[step + 1] - t
 
-        return sol[-1].float()
+        return x.float()
 
     def forward_estimator(self, x, mask, mu, t, spks, cond):
         if isinstance(self.estimator, torch.nn.Module):
@@ -201,7 +231,7 @@ class CausalConditionalCFM(ConditionalCFM):
         self.rand_noise = torch.randn([1, 80, 50 * 300])
 
     @torch.inference_mode()
-    def forward(self, mu, mask, n_timesteps, temperature=1.0, spks=None, cond=None):
+    def forward(self, mu, mask, n_timesteps, temperature=1.0, spks=None, cond=None, solver="euler", cfg_skip_after=None):
         """Forward diffusion
 
         Args:
@@ -214,6 +244,8 @@ class CausalConditionalCFM(ConditionalCFM):
             spks (torch.Tensor, optional): speaker ids. Defaults to None.
                 shape: (batch_size, spk_emb_dim)
             cond: Not used but kept for future purposes
+            solver (str, optional): one of FLOW_SOLVERS. Defaults to "euler".
+            cfg_skip_after (int, optional): see `solve`. Defaults to None (CFG on every step).
 
         Returns:
             sample: generated mel-spectrogram
@@ -221,8 +253,10 @@ class CausalConditionalCFM(ConditionalCFM):
         """
 
         z = self.rand_noise[:, :, :mu.size(2)].to(mu.device).to(mu.dtype) * temperature
+        z = z.expand(mu.size(0), -1, -1)  # same fixed noise for every row of a batch
         # fix prompt and overlap part mu and z
         t_span = torch.linspace(0, 1, n_timesteps + 1, device=mu.device, dtype=mu.dtype)
         if self.t_scheduler == 'cosine':
             t_span = 1 - torch.cos(t_span * 0.5 * torch.pi)
-        return self.solve_euler(z, t_span=t_span, mu=mu, mask=mask, spks=spks, cond=cond), None
+        return self.solve(z, t_span=t_span, mu=mu, mask=mask, spks=spks, cond=cond,
+                          solver=solver, cfg_skip_after=cfg_skip_after), None
@@ -16,6 +16,7 @@ import logging
 
 import numpy as np
 import torch
+import torch.nn.functional as F
 import torchaudio as ta
 from functools import lru_cache
 from typing import Optional
@@ -33,6 +34,13 @@ from .flow_matching import CausalConditionalCFM
 from .decoder import ConditionalDecoder
 
 
+# Streaming: mel frames re-vocoded at every chunk boundary (HiFT source/speech overlap), as in CosyVoice2
+STREAM_MEL_CACHE_LEN = 8
+STREAM_SOURCE_CACHE_LEN = STREAM_MEL_CACHE_LEN * (S3GEN_SR // 50)  # 50 mel frames per second
+# Already vocoded tokens re-run through the flow as left context of each streamed chunk (2 s at 25 tokens/s)
+STREAM_TOKEN_LOOKBACK = 50
+
+
 def drop_invalid_tokens(x):
     assert len(x.shape) <= 2 and x.shape[0] == 1, "only batch size of one allowed for now"
     return x[x < SPEECH_VOCAB_SIZE]
@@ -163,6 +171,15 @@ class S3Token2Mel(torch.nn.Module):
             embedding=ref_x_vector,
         )
 
+    def _ref_dict_to_device(self, ref_dict: dict) -> dict:
+        """type/device casting (all values will be numpy if it's from a prod API call)"""
+        for rk in list(ref_dict):
+            if isinstance(ref_dict[rk], np.ndarray):
+                ref_dict[rk] = torch.from_numpy(ref_dict[rk])
+            if torch.is_tensor(ref_dict[rk]):
+                ref_dict[rk] = ref_dict[rk].to(self.device)
+        return ref_dict
+
     def forward(
         self,
         speech_tokens: torch.LongTensor,
@@ -172,6 +189,9 @@ class S3Token2Mel(torch.nn.Module):
         # pre-computed ref embedding (prod API)
         ref_dict: Optional[dict] = None,
         finalize: bool = False,
+        n_timesteps: int = 10,
+        solver: str = "euler",
+        cfg_skip_after: Optional[int] = None,
     ):
         """
         Generate waveforms from S3 speech tokens and a reference waveform, which the speaker timbre is inferred from.
@@ -188,18 +208,15 @@ class S3Token2Mel(torch.nn.Module):
         - `ref_wav`: reference waveform (`torch.Tensor` with shape=[B=1, T])
         - `ref_sr`: reference sample rate
         - `finalize`: whether streaming is finished or not. Note that if False, the last 3 tokens will be ignored.
+        - `n_timesteps` / `solver` / `cfg_skip_after`: flow-matching step count, ODE solver ("euler", "midpoint",
+          "heun") and the step after which classifier-free guidance is dropped (None = never).
         """
         assert (ref_wav is None) ^ (ref_dict is None), f"Must provide exactly one of ref_wav or ref_dict (got {ref_wav} and {ref_dict})"
 
         if ref_dict is None:
             ref_dict = self.embed_ref(ref_wav, ref_sr)
         else:
-            # type/device casting (all values will be numpy if it's from a prod API call)
-            for rk in list(ref_dict):
-                if isinstance(ref_dict[rk], np.ndarray):
-                    ref_dict[rk] = torch.from_numpy(ref_dict[rk])
-                if torch.is_tensor(ref_dict[rk]):
-                    ref_dict[rk] = ref_dict[rk].to(self.device)
+            ref_dict = self._ref_dict_to_device(ref_dict)
 
         if len(speech_tokens.shape) == 1:
             speech_tokens = speech_tokens.unsqueeze(0)
@@ -211,6 +228,9 @@ class S3Token2Mel(torch.nn.Module):
             token=speech_tokens,
             token_len=speech_token_lens,
             finalize=finalize,
+            n_timesteps=n_timesteps,
+            solver=solver,
+            cfg_skip_after=cfg_skip_after,
             **ref_dict,
         )
         return output_mels
@@ -242,6 +262,10 @@ class S3Token2Wav(S3Token2Mel):
         trim_fade[n_trim:] = (torch.cos(torch.linspace(torch.pi, 0, n_trim)) + 1) / 2
         self.register_buffer("trim_fade", trim_fade, persistent=False) # (buffers get automatic device casting)
 
+        # crossfade window for the overlapping samples of consecutive streaming chunks
+        stream_window = torch.hann_window(2 * STREAM_SOURCE_CACHE_LEN, periodic=True)  # halves sum to 1
+        self.register_buffer("stream_window", stream_window, persistent=False)
+
     def forward(
         self,
         speech_tokens,
@@ -250,9 +274,10 @@ class S3Token2Wav(S3Token2Mel):
         ref_sr: Optional[int],
         # pre-computed ref embedding (prod API)
         ref_dict: Optional[dict] = None,
-        finalize: bool = False
+        finalize: bool = False,
+        **flow_kwargs,
     ):
-        output_mels = super().forward(speech_tokens, ref_wav=ref_wav, ref_sr=ref_sr, ref_dict=ref_dict, finalize=finalize)
+        output_mels = super().forward(speech_tokens, ref_wav=ref_wav, ref_sr=ref_sr, ref_dict=ref_dict, finalize=finalize, **flow_kwargs)
 
         # TODO jrm: ignoring the speed control (mel interpolation) and the HiFTGAN caching mechanisms for now.
         hift_cache_source = torch.zeros(1, 1, 0).to(self.device)
@@ -275,8 +300,9 @@ class S3Token2Wav(S3Token2Mel):
         # pre-computed ref embedding (prod API)
         ref_dict: Optional[dict] = None,
         finalize: bool = False,
+        **flow_kwargs,
     ):
-        return super().forward(speech_tokens, ref_wav=ref_wav, ref_sr=ref_sr, ref_dict=ref_dict, finalize=finalize)
+        return super().forward(speech_tokens, ref_wav=ref_wav, ref_sr=ref_sr, ref_dict=ref_dict, finalize=finalize, **flow_kwargs)
 
     @torch.inference_mode()
     def hift_inference(self, speech_feat, cache_source: torch.Tensor = None):
@@ -295,11 +321,113 @@ class S3Token2Wav(S3Token2Mel):
         ref_dict: Optional[dict] = None,
         cache_source: torch.Tensor = None, # NOTE: this arg is for streaming, it can probably be removed here
         finalize: bool = True,
+        **flow_kwargs,
     ):
-        output_mels = self.flow_inference(speech_tokens, ref_wav=ref_wav, ref_sr=ref_sr, ref_dict=ref_dict, finalize=finalize)
+        output_mels = self.flow_inference(speech_tokens, ref_wav=ref_wav, ref_sr=ref_sr, ref_dict=ref_dict, finalize=finalize, **flow_kwargs)
         output_wavs, output_sources = self.hift_inference(output_mels, cache_source)
 
         # NOTE: ad-hoc method to reduce "spillover" from the reference clip.
         output_wavs[:, :len(self.trim_fade)] *= self.trim_fade
 
         return output_wavs, output_sources
+
+    @torch.inference_mode()
+    def inference_batch(
+        self,
+        speech_tokens,
+        ref_dicts,
+        max_batch_size: int = 8,
+        **flow_kwargs,
+    ):
+        """
+        Vocode several token sequences (e.g. a subtitle group) with one batched CFM solve and one HiFT pass
+        per group of up to `max_batch_size` sequences, grouped by length to limit padding.
+        Returns one (1, T) waveform per sequence, trimmed to its own length, in input order.
+        """
+        speech_tokens = [tokens.view(1, -1).to(self.device) for tokens in speech_tokens]
+        ref_dicts = [self._ref_dict_to_device(ref_dict) for ref_dict in ref_dicts]
+        if not isinstance(self.flow.decoder.estimator, torch.nn.Module):
+            # TensorRT estimator engines take a single CFG pair only
+            return [self.inference(tokens, ref_dict=ref_dict, **flow_kwargs)[0] for tokens, ref_dict in zip(speech_tokens, ref_dicts)]
+
+        order = sorted(range(len(speech_tokens)), key=lambda idx: speech_tokens[idx].size(1))
+        output_wavs = [None] * len(speech_tokens)
+        for start in range(0, len(order), max_batch_size):
+            batch_idx = order[start:start + max_batch_size]
+            output_mels = self.flow.inference_batch(
+                [speech_tokens[idx] for idx in batch_idx], [ref_dicts[idx] for idx in batch_idx], **flow_kwargs
+            )
+
+            # pad each row by repeating its last frame, so HiFT sees a smooth edge past the true end
+            mel_lens = [mels.size(2) for mels in output_mels]
+            max_len = max(mel_lens)
+            batch_mels = torch.cat([F.pad(mels, (0, max_len - mels.size(2)), mode="replicate") for mels in output_mels])
+            batch_wavs, _ = self.mel2wav.inference(speech_feat=batch_mels, cache_source=torch.zeros(1, 1, 0).to(self.device))
+
+            samples_per_frame = batch_wavs.size(1) // max_len
+            for row, (idx, mel_len) in enumerate(zip(batch_idx, mel_lens)):
+                wav = batch_wavs[row:row + 1, :mel_len * samples_per_frame].clone()
+                # NOTE: ad-hoc method to reduce "spillover" from the reference clip.
+                wav[:, :len(self.trim_fade)] *= self.trim_fade
+                output_wavs[idx] = wav
+        return output_wavs
+
+    @torch.inference_mode()
+    def inference_stream_step(
+        self,
+        speech_tokens,
+        ref_dict: dict,
+        stream_cache: dict,
+        finalize: bool = False,
+        **flow_kwargs,
+    ):
+        """
+        Vocode the next chunk of a streamed utterance.
+
+        `speech_tokens` holds every (valid) token generated so far. The flow decoder attends over its
+        whole input, so re-running it would change the mel of frames that were already vocoded; instead
+        it runs over the tokens not vocoded yet plus up to STREAM_TOKEN_LOOKBACK earlier tokens of left
+        context, and only the new tokens' mel frames are kept. Each call therefore costs a bounded
+        window, and the chunk mels differ slightly from a single full pass. `stream_cache` (an empty
+        dict on the first call) carries the number of tokens vocoded plus the HiFT mel/source/speech
+        overlap, which is re-vocoded and crossfaded to hide the chunk seams.
+        Returns the new waveform samples (1, T); T can be 0 while there are too few new frames.
+        """
+        num_tokens = speech_tokens.size(-1)
+        # Without finalize, the last pre_lookahead_len tokens only serve as lookahead for earlier ones
+        ready_tokens = num_tokens if finalize else num_tokens - self.flow.pre_lookahead_len
+        token_offset = stream_cache.get("token_offset", 0)
+        new_frames = (ready_tokens - token_offset) * self.flow.token_mel_ratio
+        if finalize and new_frames <= 0:
+            # Nothing left to vocode: release the overlap held back for the next chunk's crossfade
+            return stream_cache.pop("speech", torch.zeros(1, 0, device=self.device))
+        if not finalize and new_frames <= STREAM_MEL_CACHE_LEN:
+            return torch.zeros(1, 0, device=self.device)  # wait for more tokens
+
+        window_start = max(0, token_offset - STREAM_TOKEN_LOOKBACK)
+        output_mels = self.flow_inference(speech_tokens[..., window_start:], ref_dict=ref_dict,
+                                          finalize=finalize, **flow_kwargs)
+        new_mels = output_mels[:, :, output_mels.size(2) - new_frames:]
+        stream_cache["token_offset"] = ready_tokens
+
+        if "mel" in stream_cache:
+            new_mels = torch.cat([stream_cache["mel"], new_mels], dim=2)
+            cache_source = stream_cache["source"]
+        else:
+            cache_source = torch.zeros(1, 1, 0).to(self.device)
+        output_wavs, output_sources = self.mel2wav.inference(speech_feat=new_mels, cache_source=cache_source)
+
+        if "speech" in stream_cache:
+            overlap = STREAM_SOURCE_CACHE_LEN
+            output_wavs[:, :overlap] = (output_wavs[:, :overlap] * self.stream_window[:overlap]
+                                        + stream_cache["speech"] * self.stream_window[overlap:])
+        else:
+            # NOTE: ad-hoc method to reduce "spillover" from the reference clip.
+            output_wavs[:, :len(self.trim_fade)] *= self.trim_fade
+
+        if not finalize:
+            stream_cache["mel"] = new_mels[:, :, -STREAM_MEL_CACHE_LEN:]
+            stream_cache["source"] = output_sources[:, :, -STREAM_SOURCE_CACHE_LEN:]
+            stream_cache["speech"] = output_wavs[:, -STREAM_SOURCE_CACHE_LEN:]
+            output_wavs = output_wavs[:, :-STREAM_SOURCE_CACHE_LEN]
+        return output_wavs
@@ -277,7 +277,9 @@ class UpsampleConformerEncoder(torch.nn.Module):
                                               self.static_chunk_size,
                                               num_decoding_left_chunks)
         # lookahead + conformer encoder
-        xs = self.pre_lookahead_layer(xs)
+        # (zero padded frames first, so the last frames of a shorter batch row look ahead into zeros,
+        # exactly as an unpadded sequence does)
+        xs = self.pre_lookahead_layer(xs.masked_fill(~mask_pad.transpose(1, 2), 0.0))
         xs = self.forward_layers(xs, chunk_masks, pos_emb, mask_pad)
 
         # upsample + conformer encoder
@@ -35,10 +35,25 @@ class AlignmentStreamAnalyzer:
         position, repetition, etc.
 
         NOTE: currently requires no queues.
+
+        The hook is installed once; call `reset` before each new utterance and `remove` to detach it.
         """
         # self.queue = queue
-        self.text_tokens_slice = (i, j) = text_tokens_slice
         self.eos_idx = eos_idx
+        # When inactive the hook is a no-op and the layer runs without attention outputs
+        self.active = True
+        self._hook_handle = None
+        self._target_layer = None
+        self.reset(text_tokens_slice)
+
+        # Using `output_attentions=True` is incompatible with optimized attention kernels, so
+        # using it for all layers slows things down too much. We can apply it to just one layer
+        # by intercepting the kwargs and adding a forward hook (credit: jrm)
+        self._add_attention_spy(tfmr, alignment_layer_idx)
+
+    def reset(self, text_tokens_slice):
+        """Reset per-utterance alignment state without re-registering the attention hook."""
+        self.text_tokens_slice = (i, j) = text_tokens_slice
         self.alignment = torch.zeros(0, j-i)
         # self.alignment_bin = torch.zeros(0, j-i)
         self.curr_frame_pos = 0
@@ -50,11 +65,7 @@ class AlignmentStreamAnalyzer:
         self.complete = False
         self.completed_at = None
 
-        # Using `output_attentions=True` is incompatible with optimized attention kernels, so
-        # using it for all layers slows things down too much. We can apply it to just one layer
-        # by intercepting the kwargs and adding a forward hook (credit: jrm)
         self.last_aligned_attn = None
-        self._add_attention_spy(tfmr, alignment_layer_idx)
 
     def _add_attention_spy(self, tfmr, alignment_layer_idx):
         """
@@ -71,20 +82,33 @@ class AlignmentStreamAnalyzer:
             - When `output_attentions=True`, `LlamaSdpaAttention.forward` calls `LlamaAttention.forward`.
             - `attn_output` has shape [B, H, T0, T0] for the 0th entry, and [B, H, 1, T0+i] for the rest i-th.
             """
+            if not self.active or output[1] is None:
+                return
             step_attention = output[1].cpu() # (B, 16, N, N)
             self.last_aligned_attn = step_attention[0].mean(0) # (N, N)
 
         target_layer = tfmr.layers[alignment_layer_idx].self_attn
-        hook_handle = target_layer.register_forward_hook(attention_forward_hook)
+        self._hook_handle = target_layer.register_forward_hook(attention_forward_hook)
 
-        # Backup original forward
+        # Patch the bound forward on the instance; removing the instance attribute restores the class forward
         original_forward = target_layer.forward
+        analyzer = self
         def patched_forward(self, *args, **kwargs):
-            kwargs['output_attentions'] = True
+            if analyzer.active:
+                kwargs['output_attentions'] = True
             return original_forward(*args, **kwargs)
 
-        # TODO: how to unpatch it?
         target_layer.forward = MethodType(patched_forward, target_layer)
+        self._target_layer = target_layer
+
+    def remove(self):
+        """Detach the attention hook and restore the layer's original forward."""
+        if self._hook_handle is not None:
+            self._hook_handle.remove()
+            self._hook_handle = None
+        if self._target_layer is not None:
+            self._target_layer.__dict__.pop('forward', None)
+            self._target_layer = None
 
     def step(self, logits):
         """
@@ -0,0 +1,85 @@
+import torch
+from torch import Tensor
+
+
+class T3Sampler:
+    """
+    Token sampler for the T3 decode loops with a flat per-step cost.
+
+    Replaces the HF `RepetitionPenaltyLogitsProcessor` + `TopPLogitsWarper` pair, which
+    re-scan the growing `generated_ids` tensor and fully sort the vocabulary every step:
+        * repetition penalty reads a fixed-size (B, V) token-count buffer updated in place
+        * top-p runs on a top-k pre-filter and only falls back to a full sort when the
+          nucleus does not fit inside the k candidates, so the result matches the full sort
+        * sampled tokens go into a preallocated (B, max_new_tokens) buffer
+    All operations are vectorized over rows, so batched decoding shares one sampler.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        vocab_size: int,
+        max_new_tokens: int,
+        device,
+        temperature=0.8,
+        top_p=0.8,
+        repetition_penalty=2.0,
+        top_k_prefilter=128,
+        initial_tokens: Tensor = None,
+    ):
+        self.temperature = temperature
+        self.top_p = top_p
+        self.repetition_penalty = repetition_penalty
+        self.top_k_prefilter = min(top_k_prefilter, vocab_size)
+
+        self.token_counts = torch.zeros(batch_size, vocab_size, dtype=torch.int32, device=device)
+        self.tokens = torch.empty(batch_size, max_new_tokens, dtype=torch.long, device=device)
+        self.num_tokens = 0
+        if initial_tokens is not None:
+            # Prompt tokens (e.g. BOS) count towards the penalty like HF's `generated_ids`
+            self._count(initial_tokens.view(batch_size, -1))
+
+    def _count(self, tokens: Tensor):
+        self.token_counts.scatter_add_(1, tokens, torch.ones_like(tokens, dtype=torch.int32))
+
+    def apply_repetition_penalty(self, logits: Tensor) -> Tensor:
+        """Same rule as HF: divide positive / multiply negative logits of already seen tokens."""
+        if self.repetition_penalty == 1.0:
+            return logits
+        penalized = torch.where(logits < 0, logits * self.repetition_penalty, logits / self.repetition_penalty)
+        return torch.where(self.token_counts > 0, penalized, logits)
+
+    def sample(self, logits: Tensor) -> Tensor:
+        """Sample one token per row from (B, V) logits. Returns (B, 1); call `update` to record it."""
+        logits = logits.float()
+        if self.temperature != 1.0:
+            logits = logits / self.temperature
+        logits = self.apply_repetition_penalty(logits)
+
+        if self.top_p >= 1.0:
+            return torch.multinomial(torch.softmax(logits, dim=-1), num_samples=1)
+
+        log_norm = torch.logsumexp(logits, dim=-1, keepdim=True)
+        top_logits, top_indices = logits.topk(self.top_k_prefilter, dim=-1)
+        top_probs = (top_logits - log_norm).exp()  # sorted descending
+        if not bool((top_probs.sum(dim=-1) >= self.top_p).all()):
+            # Nucleus is wider than the pre-filter for some row: sort the full vocabulary
+            top_logits, top_indices = logits.sort(dim=-1, descending=True)
+            top_probs = (top_logits - log_norm).exp()
+
+        # Keep a token while the mass of strictly more likely tokens is below top_p (HF semantics)
+        mass_before = top_probs.cumsum(dim=-1) - top_probs
+        top_probs = top_probs.masked_fill(mass_before >= self.top_p, 0.0)
+        choice = torch.multinomial(top_probs, num_samples=1)
+        return top_indices.gather(1, choice)
+
+    def update(self, next_token: Tensor):
+        """Record the (B, 1) tokens actually emitted this step."""
+        self.tokens[:, self.num_tokens] = next_token[:, 0]
+        self.num_tokens += 1
+        self._count(next_token)
+
+    @property
+    def generated(self) -> Tensor:
+        """(B, num_tokens) view of the tokens recorded so far."""
+        return self.tokens[:, :self.num_tokens]
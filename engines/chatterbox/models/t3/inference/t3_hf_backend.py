@@ -86,6 +86,8 @@ class T3HuggingfaceBackend(LlamaPreTrainedModel, GenerationMixin):
         self,
         inputs_embeds: torch.Tensor,
         past_key_values: Optional[torch.Tensor]=None,
+        attention_mask: Optional[torch.Tensor]=None,
+        position_ids: Optional[torch.Tensor]=None,
         use_cache=True,
         output_attentions=False,
         output_hidden_states=True,
@@ -97,12 +99,13 @@ class T3HuggingfaceBackend(LlamaPreTrainedModel, GenerationMixin):
 
         :param inputs_embeds: (B, S, C) float32 tensor of conditioning inputs. If past key values are given,
         S should be 1.
+        :param attention_mask: optional (B, past + S) mask, used for left-padded batched decoding.
+        :param position_ids: optional (B, S) positions matching the attention mask.
         """
         is_large_input = inputs_embeds.size(1) != 1
         has_cache = past_key_values is not None and len(past_key_values) > 0
         assert not (is_large_input and has_cache)
         assert return_dict
-        assert output_hidden_states
 
         from transformers.cache_utils import DynamicCache
         
@@ -117,12 +120,14 @@ class T3HuggingfaceBackend(LlamaPreTrainedModel, GenerationMixin):
         tfmr_out = self.model(
             inputs_embeds=inputs_embeds,
             past_key_values=pkv,
+            attention_mask=attention_mask,
+            position_ids=position_ids,
             use_cache=use_cache,
             output_attentions=False,  # Always disable attention outputs
-            output_hidden_states=True,
+            output_hidden_states=output_hidden_states,
             return_dict=True,
         )
-        hidden_states = tfmr_out.hidden_states[-1]  # (B, seq, dim)
+        hidden_states = tfmr_out.last_hidden_state  # final normed layer output, (B, seq, dim)
 
         logits = self.speech_head(hidden_states)
         # assert inputs_embeds.size(0) == 1 # (disabled for CFG)
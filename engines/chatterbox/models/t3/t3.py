@@ -8,7 +8,6 @@ import torch
 import torch.nn.functional as F
 from torch import nn, Tensor
 from transformers import LlamaModel, LlamaConfig
-from transformers.generation.logits_process import TopPLogitsWarper, RepetitionPenaltyLogitsProcessor
 
 from .modules.learned_pos_emb import LearnedPositionEmbeddings
 
@@ -17,10 +16,15 @@ from .modules.t3_config import T3Config
 from .llama_configs import LLAMA_CONFIGS
 from .inference.t3_hf_backend import T3HuggingfaceBackend
 from .inference.alignment_stream_analyzer import AlignmentStreamAnalyzer
+from .inference.sampler import T3Sampler
 
 
 logger = logging.getLogger(__name__)
 
+# StaticCache lengths for the fast decode loop are rounded up to a multiple of this, so the
+# compiled decode step (and its CUDA graph) is shared by every text that lands in the same bucket
+STATIC_CACHE_BUCKET = 1024
+
 
 class AttrDict(dict):
     def __init__(self, *args, **kwargs):
@@ -83,6 +87,10 @@ class T3(nn.Module):
         self.text_head = nn.Linear(self.cfg.hidden_size, hp.text_tokens_dict_size, bias=False)
         self.speech_head = nn.Linear(self.cfg.hidden_size, hp.speech_tokens_dict_size, bias=False)
         self.compiled = False
+        self.patched_model = None
+        self.alignment_stream_analyzer = None
+        self._compiled_decode_step = None
+        self._static_caches = {}  # (batch_size, max_cache_len, device, dtype) -> StaticCache of the compiled step
 
     @property
     def device(self):
@@ -219,6 +227,54 @@ class T3(nn.Module):
 
         return loss_text, loss_speech
 
+    def _ensure_backend(self):
+        """Build the inference backend and alignment analyzer once per model."""
+        # TODO? synchronize the expensive compile function
+        # with self.compile_lock:
+        if self.compiled:
+            return self.patched_model
+
+        self.alignment_stream_analyzer = AlignmentStreamAnalyzer(
+            self.tfmr,
+            None,
+            text_tokens_slice=(0, 0),  # set per call with reset()
+            alignment_layer_idx=9,
+            eos_idx=self.hp.stop_speech_token,
+        )
+        self.patched_model = self._build_backend(self.alignment_stream_analyzer)
+        self.compiled = True
+        return self.patched_model
+
+    def release_backend(self):
+        """Remove the alignment hook and drop the cached inference backend."""
+        if self.alignment_stream_analyzer is not None:
+            self.alignment_stream_analyzer.remove()
+        self.alignment_stream_analyzer = None
+        self.patched_model = None
+        self.compiled = False
+
+    def _build_backend(self, alignment_stream_analyzer=None):
+        """Wrap the transformer with our speech embedding / head layers for token-by-token decoding."""
+        # Override transformer settings for alignment
+        self.tfmr.output_attentions = False
+        self.tfmr.use_cache = True
+        self.tfmr.return_dict = True
+
+        # Create backend with updated settings
+        patched_model = T3HuggingfaceBackend(
+            config=self.cfg,
+            llama=self.tfmr,
+            speech_enc=self.speech_emb,
+            speech_head=self.speech_head,
+            alignment_stream_analyzer=alignment_stream_analyzer,
+        )
+
+        # Ensure backend has correct attention settings
+        patched_model.output_attentions = False
+        patched_model.use_cache = True
+        patched_model.return_dict = True
+        return patched_model
+
     @torch.inference_mode()
     def inference(
         self,
@@ -240,63 +296,16 @@ class T3(nn.Module):
         length_penalty=1.0,
         repetition_penalty=2.0,
         cfg_weight=0,
+        fast_decode=False,
     ):
         """
         Args:
             text_tokens: a 1D (unbatched) or 2D (batched) tensor.
+            fast_decode: decode with a preallocated static KV cache and, on CUDA, a torch.compile'd
+                step function (see `_fast_decode_loop`). The alignment hook is idle in this mode.
         """
-        # Validate / sanitize inputs
         assert prepend_prompt_speech_tokens is None, "not implemented"
-        _ensure_BOT_EOT(text_tokens, self.hp)
-        text_tokens = torch.atleast_2d(text_tokens).to(dtype=torch.long, device=self.device)
-
-        # Default initial speech to a single start-of-speech token
-        if initial_speech_tokens is None:
-            initial_speech_tokens = self.hp.start_speech_token * torch.ones_like(text_tokens[:, :1])
-
-        # Prepare custom input embeds
-        embeds, len_cond = self.prepare_input_embeds(
-            t3_cond=t3_cond,
-            text_tokens=text_tokens,
-            speech_tokens=initial_speech_tokens,
-        )
-
-        # In order to use the standard HF generate method, we need to extend some methods to inject our custom logic
-        # Note the llama-specific logic. Other tfmr types can be added later.
-
-        self.compiled = False
-
-        # TODO? synchronize the expensive compile function
-        # with self.compile_lock:
-        if not self.compiled:
-            # Override transformer settings for alignment
-            self.tfmr.output_attentions = False
-            self.tfmr.use_cache = True
-            self.tfmr.return_dict = True
-            
-            alignment_stream_analyzer = AlignmentStreamAnalyzer(
-                self.tfmr,
-                None,
-                text_tokens_slice=(len_cond, len_cond + text_tokens.size(-1)),
-                alignment_layer_idx=9,
-                eos_idx=self.hp.stop_speech_token,
-            )
-            
-            # Create backend with updated settings
-            patched_model = T3HuggingfaceBackend(
-                config=self.cfg,
-                llama=self.tfmr,
-                speech_enc=self.speech_emb,
-                speech_head=self.speech_head,
-                alignment_stream_analyzer=alignment_stream_analyzer,
-            )
-            
-            # Ensure backend has correct attention settings
-            patched_model.output_attentions = False
-            patched_model.use_cache = True
-            patched_model.return_dict = True
-            self.patched_model = patched_model
-            self.compiled = True
+        inputs_embeds = self._prepare_inference_embeds(t3_cond, text_tokens, initial_speech_tokens)
 
         # # Run normal generate method, which calls our custom extended methods
         # return self.patched_model.generate(
@@ -315,6 +324,80 @@ class T3(nn.Module):
         #     # cache_implementation=None if not self.compiled else "static",
         # )
 
+        if fast_decode:
+            self.alignment_stream_analyzer.active = False
+            return self._fast_decode_loop(
+                inputs_embeds,
+                max_new_tokens=max_new_tokens,
+                temperature=temperature,
+                top_p=top_p,
+                repetition_penalty=repetition_penalty,
+                cfg_weight=cfg_weight,
+            )
+
+        max_new_tokens = max_new_tokens or self.hp.max_speech_tokens
+        sampler = self._new_sampler(max_new_tokens, inputs_embeds.device, temperature, top_p, repetition_penalty)
+        for _ in self._decode_loop(inputs_embeds, sampler, max_new_tokens=max_new_tokens, cfg_weight=cfg_weight):
+            pass
+        return sampler.generated  # shape: (B, num_tokens)
+
+    @torch.inference_mode()
+    def inference_stream(
+        self,
+        *,
+        t3_cond: T3Cond,
+        text_tokens: Tensor,
+        max_new_tokens=None,
+        temperature=0.8,
+        top_p=0.8,
+        repetition_penalty=2.0,
+        cfg_weight=0,
+        chunk_size=25,
+        first_chunk_size=10,
+    ):
+        """
+        Same sampling as `inference`, but yields the new speech tokens every `chunk_size` steps
+        (`first_chunk_size` for the first window, to get audio out sooner) as (1, n) tensors.
+        The final window ends with the EOS token when one is sampled.
+        """
+        inputs_embeds = self._prepare_inference_embeds(t3_cond, text_tokens)
+        max_new_tokens = max_new_tokens or self.hp.max_speech_tokens
+        sampler = self._new_sampler(max_new_tokens, inputs_embeds.device, temperature, top_p, repetition_penalty)
+
+        emitted = 0
+        window = first_chunk_size or chunk_size
+        for _ in self._decode_loop(inputs_embeds, sampler, max_new_tokens=max_new_tokens, cfg_weight=cfg_weight):
+            if sampler.num_tokens - emitted >= window:
+                yield sampler.generated[:, emitted:]
+                emitted, window = sampler.num_tokens, chunk_size
+        if sampler.num_tokens > emitted:
+            yield sampler.generated[:, emitted:]
+
+    def _prepare_inference_embeds(self, t3_cond: T3Cond, text_tokens: Tensor, initial_speech_tokens: Optional[Tensor]=None):
+        """Build the prefill embeddings (conditioning, text, BOS) for both CFG rows and arm the alignment hook."""
+        # Validate / sanitize inputs
+        _ensure_BOT_EOT(text_tokens, self.hp)
+        text_tokens = torch.atleast_2d(text_tokens).to(dtype=torch.long, device=self.device)
+
+        # Default initial speech to a single start-of-speech token
+        if initial_speech_tokens is None:
+            initial_speech_tokens = self.hp.start_speech_token * torch.ones_like(text_tokens[:, :1])
+
+        # Prepare custom input embeds
+        embeds, len_cond = self.prepare_input_embeds(
+            t3_cond=t3_cond,
+            text_tokens=text_tokens,
+            speech_tokens=initial_speech_tokens,
+        )
+
+        # In order to use the standard HF generate method, we need to extend some methods to inject our custom logic
+        # Note the llama-specific logic. Other tfmr types can be added later.
+
+        # The backend and its alignment hook are built once and reused across calls
+        self._ensure_backend()
+        self.alignment_stream_analyzer.reset((len_cond, len_cond + text_tokens.size(-1)))
+        self.alignment_stream_analyzer.active = True
+
         device = embeds.device
 
         bos_token = torch.tensor([[self.hp.start_speech_token]], dtype=torch.long, device=device)
@@ -325,22 +408,24 @@ class T3(nn.Module):
         bos_embed = torch.cat([bos_embed, bos_embed])
 
         # Combine condition and BOS token for the initial input
-        inputs_embeds = torch.cat([embeds, bos_embed], dim=1)
-
-        # Track generated token ids; start with the BOS token.
-        generated_ids = bos_token.clone()
-        predicted = []  # To store the predicted tokens
-
-        # Instantiate the logits processors.
-        top_p_warper = TopPLogitsWarper(top_p=top_p)
-        repetition_penalty_processor = RepetitionPenaltyLogitsProcessor(penalty=repetition_penalty)
+        return torch.cat([embeds, bos_embed], dim=1)
+
+    def _new_sampler(self, max_new_tokens, device, temperature, top_p, repetition_penalty):
+        """Sampler for one CFG pair; tracks generated token ids (starting with BOS) in fixed-size buffers."""
+        return T3Sampler(
+            1, self.hp.speech_tokens_dict_size, max_new_tokens, device,
+            temperature=temperature, top_p=top_p, repetition_penalty=repetition_penalty,
+            initial_tokens=torch.tensor([[self.hp.start_speech_token]], device=device),
+        )
 
+    def _decode_loop(self, inputs_embeds, sampler: T3Sampler, *, max_new_tokens, cfg_weight):
+        """KV-cached CFG sampling loop; yields after each token is recorded in `sampler`, stops after EOS."""
         # ---- Initial Forward Pass ----
         output = self.patched_model(
             inputs_embeds=inputs_embeds,
             use_cache=True,
             output_attentions=False,  # Ensure no attention output
-            output_hidden_states=True,
+            output_hidden_states=False,  # Only the final layer output is used
             return_dict=True,
             past_key_values=None  # Start with fresh cache
         )
@@ -358,20 +443,10 @@ class T3(nn.Module):
             logits = logits_cond + cfg_weight * (logits_cond - logits_uncond)
             logits = logits.squeeze(1)
 
-            # Apply temperature scaling.
-            if temperature != 1.0:
-                logits = logits / temperature
-
-            # Apply repetition penalty and top‑p filtering.
-            logits = repetition_penalty_processor(generated_ids, logits)
-            logits = top_p_warper(None, logits)
-
-            # Convert logits to probabilities and sample the next token.
-            probs = torch.softmax(logits, dim=-1)
-            next_token = torch.multinomial(probs, num_samples=1)  # shape: (B, 1)
-
-            predicted.append(next_token)
-            generated_ids = torch.cat([generated_ids, next_token], dim=1)
+            # Temperature, repetition penalty and top‑p, then sample the next token.
+            next_token = sampler.sample(logits)  # shape: (B, 1)
+            sampler.update(next_token)
+            yield next_token
 
             # Check for EOS token.
             if next_token.view(-1) == self.hp.stop_speech_token:
@@ -391,7 +466,7 @@ class T3(nn.Module):
                 past_key_values=cache,
                 use_cache=True,
                 output_attentions=False,
-                output_hidden_states=True,
+                output_hidden_states=False,
                 return_dict=True
             )
             
@@ -399,6 +474,246 @@ class T3(nn.Module):
             if output.past_key_values:
                 cache = output.past_key_values
 
-        # Concatenate all predicted tokens along the sequence dimension.
-        predicted_tokens = torch.cat(predicted, dim=1)  # shape: (B, num_tokens)
-        return predicted_tokens
+
+    def _decode_step(self, inputs_embeds, cache, cache_position):
+        """One static-cache transformer step returning speech logits, shaped for torch.compile."""
+        tfmr_out = self.tfmr(
+            inputs_embeds=inputs_embeds,
+            past_key_values=cache,
+            cache_position=cache_position,
+            use_cache=True,
+            output_attentions=False,
+            output_hidden_states=False,
+            return_dict=True,
+        )
+        return self.speech_head(tfmr_out.last_hidden_state)
+
+    def _get_decode_step(self, device):
+        """Return the compiled decode step on CUDA, or the eager one (CPU, or if compilation is unavailable)."""
+        if torch.device(device).type != "cuda" or not hasattr(torch, "compile"):
+            return self._decode_step
+        if self._compiled_decode_step is None:
+            self._compiled_decode_step = torch.compile(self._decode_step, mode="reduce-overhead", dynamic=False)
+        return self._compiled_decode_step
+
+    def _apply(self, *args, **kwargs):
+        # Static caches are not registered buffers: drop them instead of leaving them on the old device
+        self._static_caches.clear()
+        return super()._apply(*args, **kwargs)
+
+    def _get_static_cache(self, batch_size, max_cache_len, device, dtype):
+        """
+        StaticCache for the compiled step, reused (after a reset) across calls of the same bucket.
+
+        CUDA graphs replay against fixed addresses, so the KV buffers the step writes to have to
+        stay the same tensors from one generation to the next.
+        """
+        from transformers.cache_utils import StaticCache
+
+        key = (batch_size, max_cache_len, str(device), dtype)
+        cache = self._static_caches.get(key)
+        if cache is None:
+            cache = StaticCache(
+                config=self.cfg,
+                batch_size=batch_size,
+                max_cache_len=max_cache_len,
+                device=device,
+                dtype=dtype,
+            )
+            self._static_caches[key] = cache
+        else:
+            cache.reset()
+        return cache
+
+    def _fast_decode_loop(self, inputs_embeds, *, max_new_tokens, temperature, top_p, repetition_penalty, cfg_weight):
+        """
+        Opt-in decode loop for `inference`.
+
+        Uses a StaticCache preallocated for prefix + max_new_tokens, never requests hidden-state
+        outputs, and writes sampled ids into a preallocated buffer instead of growing it with
+        torch.cat. The fixed shapes let the per-token step be captured by torch.compile (CUDA
+        graphs with mode="reduce-overhead"); on CPU the same loop runs eagerly.
+
+        For the compiled step the cache length is rounded up to a STATIC_CACHE_BUCKET multiple and
+        the cache itself is kept between calls, so texts of different lengths reuse the same
+        compiled step and CUDA graph instead of recompiling and re-capturing it.
+        """
+        from transformers.cache_utils import StaticCache
+
+        device, dtype = inputs_embeds.device, inputs_embeds.dtype
+        batch_size, prefix_len, _ = inputs_embeds.shape
+        max_new_tokens = max_new_tokens or self.hp.max_speech_tokens
+        decode_step = self._get_decode_step(device)
+        if decode_step is self._compiled_decode_step:
+            max_cache_len = -(-(prefix_len + max_new_tokens) // STATIC_CACHE_BUCKET) * STATIC_CACHE_BUCKET
+            cache = self._get_static_cache(batch_size, max_cache_len, device, dtype)
+        else:
+            # Eager: size the cache exactly, padding would only add masked positions to every step
+            cache = StaticCache(
+                config=self.cfg,
+                batch_size=batch_size,
+                max_cache_len=prefix_len + max_new_tokens,
+                device=device,
+                dtype=dtype,
+            )
+
+        # ---- Prefill (eager: its length changes with every text) ----
+        logits = self._decode_step(inputs_embeds, cache, torch.arange(prefix_len, device=device))[:, -1, :]
+
+        sampler = self._new_sampler(max_new_tokens, device, temperature, top_p, repetition_penalty)
+
+        for i in tqdm(range(max_new_tokens), desc="Sampling (fast)", dynamic_ncols=True):
+            # CFG
+            logits_cond = logits[0:1]
+            logits_uncond = logits[1:2]
+            logits = logits_cond + cfg_weight * (logits_cond - logits_uncond)
+
+            next_token = sampler.sample(logits)  # shape: (1, 1)
+            sampler.update(next_token)
+
+            if next_token.view(-1) == self.hp.stop_speech_token:
+                break
+
+            next_token_embed = self.speech_emb(next_token)
+            next_token_embed = next_token_embed + self.speech_pos_emb.get_fixed_embedding(i + 1)
+            next_token_embed = torch.cat([next_token_embed, next_token_embed])  # For CFG
+
+            cache_position = torch.tensor([prefix_len + i], device=device)
+            logits = decode_step(next_token_embed, cache, cache_position)[:, -1, :]
+
+        return sampler.generated  # shape: (1, num_tokens)
+
+    @torch.inference_mode()
+    def inference_batch(
+        self,
+        *,
+        t3_conds: Union[T3Cond, List[T3Cond]],
+        text_tokens: List[Tensor],
+        max_new_tokens=None,
+        temperature=0.8,
+        top_p=0.8,
+        repetition_penalty=2.0,
+        cfg_weight=0,
+    ) -> List[Tensor]:
+        """
+        Batched version of `inference` that samples several texts together.
+
+        Every text gets a conditional and an unconditional (CFG) row. Rows are left-padded
+        to a common length and masked, so all of them share one KV cache, and each row
+        stops at its own EOS.
+
+        Args:
+            t3_conds: one T3Cond per text, or a single T3Cond shared by all texts.
+            text_tokens: list of 1D text token tensors, each with start/stop text tokens.
+        Returns:
+            list of 1D speech token tensors (one per text), including the EOS token if reached.
+        """
+        n = len(text_tokens)
+        if isinstance(t3_conds, T3Cond):
+            t3_conds = [t3_conds] * n
+        assert len(t3_conds) == n, "need one T3Cond per text"
+        if n == 0:
+            return []
+
+        device = self.device
+        max_new_tokens = max_new_tokens or self.hp.max_speech_tokens
+        eos = self.hp.stop_speech_token
+
+        bos_token = torch.tensor([[self.hp.start_speech_token]], dtype=torch.long, device=device)
+        bos_embed = self.speech_emb(bos_token) + self.speech_pos_emb.get_fixed_embedding(0)  # (1, 1, dim)
+
+        # Build per-row embeddings exactly like `prepare_input_embeds` + the BOS step in `inference`
+        cond_rows, uncond_rows = [], []
+        for t3_cond, tokens in zip(t3_conds, text_tokens):
+            tokens = torch.atleast_2d(tokens).to(dtype=torch.long, device=device)
+            _ensure_BOT_EOT(tokens, self.hp)
+            cond_emb = self.prepare_conditioning(t3_cond)[:1]  # (1, len_cond, dim)
+            text_emb = self.text_emb(tokens)
+            uncond_text_emb = torch.zeros_like(text_emb)  # CFG uncond
+            if self.hp.input_pos_emb == "learned":
+                text_pos = self.text_pos_emb(tokens)
+                text_emb = text_emb + text_pos
+                uncond_text_emb = uncond_text_emb + text_pos
+            cond_rows.append(torch.cat([cond_emb[0], text_emb[0], bos_embed[0], bos_embed[0]]))
+            uncond_rows.append(torch.cat([cond_emb[0], uncond_text_emb[0], bos_embed[0], bos_embed[0]]))
+
+        # Left-pad so that the last position of every row is its BOS token
+        rows = cond_rows + uncond_rows
+        lengths = torch.tensor([row.size(0) for row in rows], device=device)
+        max_len = int(lengths.max())
+        inputs_embeds = torch.stack([F.pad(row, (0, 0, max_len - row.size(0), 0)) for row in rows])
+        attention_mask = (torch.arange(max_len, device=device)[None] >= (max_len - lengths)[:, None]).long()
+        position_ids = (attention_mask.cumsum(-1) - 1).clamp(min=0)
+
+        # The alignment analyzer tracks a single text slice, so keep its hook idle for batched rows
+        patched_model = self._ensure_backend()
+        self.alignment_stream_analyzer.active = False
+
+        sampler = T3Sampler(
+            n, self.hp.speech_tokens_dict_size, max_new_tokens, device,
+            temperature=temperature, top_p=top_p, repetition_penalty=repetition_penalty,
+            initial_tokens=bos_token.expand(n, 1),
+        )
+
+        # ---- Initial Forward Pass ----
+        output = patched_model(
+            inputs_embeds=inputs_embeds,
+            attention_mask=attention_mask,
+            position_ids=position_ids,
+            past_key_values=None,
+            use_cache=True,
+            output_attentions=False,
+            output_hidden_states=False,
+            return_dict=True,
+        )
+        cache = output.past_key_values
+
+        finished = torch.zeros(n, dtype=torch.bool, device=device)
+
+        # ---- Generation Loop using kv_cache ----
+        for i in tqdm(range(max_new_tokens), desc=f"Sampling x{n}", dynamic_ncols=True):
+            logits = output.logits[:, -1, :]
+
+            # CFG: first n rows are conditional, last n unconditional
+            logits_cond = logits[:n]
+            logits_uncond = logits[n:]
+            logits = logits_cond + cfg_weight * (logits_cond - logits_uncond)
+
+            next_token = sampler.sample(logits)  # (n, 1)
+            # Rows that already emitted EOS keep emitting it
+            next_token = next_token.masked_fill(finished[:, None], eos)
+            sampler.update(next_token)
+
+            finished |= next_token.view(-1) == eos
+            if finished.all():
+                break
+
+            next_token_embed = self.speech_emb(next_token)
+            next_token_embed = next_token_embed + self.speech_pos_emb.get_fixed_embedding(i + 1)
+            next_token_embed = torch.cat([next_token_embed, next_token_embed])  # For CFG
+
+            attention_mask = torch.cat([attention_mask, attention_mask.new_ones(2 * n, 1)], dim=1)
+            position_ids = (lengths + i)[:, None]
+
+            output = patched_model(
+                inputs_embeds=next_token_embed,
+                attention_mask=attention_mask,
+                position_ids=position_ids,
+                past_key_values=cache,
+                use_cache=True,
+                output_attentions=False,
+                output_hidden_states=False,
+                return_dict=True,
+            )
+            if output.past_key_values:
+                cache = output.past_key_values
+
+        # Split rows and trim each one right after its first EOS
+        predicted_tokens = sampler.generated  # (n, num_tokens)
+        results = []
+        for row in predicted_tokens:
+            eos_positions = (row == eos).nonzero()
+            if len(eos_positions) > 0:
+                row = row[:int(eos_positions[0]) + 1]
+            results.append(row)
+        return results
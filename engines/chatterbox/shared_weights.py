@@ -0,0 +1,86 @@
+"""
+Shared Component Weights for ChatterBox Models
+Language variants usually ship identical ve / s3gen / tokenizer files; these are loaded once
+per device (keyed by file content hash) and shared by every ChatterboxTTS / ChatterboxVC instance
+"""
+
+import hashlib
+import os
+import weakref
+from typing import Any, Callable, Dict, Tuple
+
+import torch
+
+# (path, size, mtime) -> content hash of checkpoint files
+_file_hash_cache: Dict[Tuple[str, int, int], str] = {}
+# (component, content hash, device) -> loaded component; freed once no model uses it any more
+_shared_components = weakref.WeakValueDictionary()
+# component -> models (ChatterboxTTS / ChatterboxVC) currently using it
+_component_owners = weakref.WeakKeyDictionary()
+
+
+def file_content_hash(path) -> str:
+    """Hash a checkpoint file's contents, memoized by (path, size, mtime)."""
+    stat = os.stat(path)
+    stat_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    content_hash = _file_hash_cache.get(stat_key)
+    if content_hash is None:
+        hasher = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                hasher.update(chunk)
+        content_hash = hasher.hexdigest()
+        _file_hash_cache[stat_key] = content_hash
+    return content_hash
+
+
+def load_shared_component(name: str, path, device, build: Callable[[], Any]) -> Any:
+    """
+    Return the already loaded component with the same file content on `device`, or build it.
+
+    Args:
+        name: Component name ("ve", "s3gen", "tokenizer"); part of the cache key
+        path: Checkpoint file the component is built from
+        device: Target device
+        build: Loads the component when no identical one is cached
+    """
+    key = (name, file_content_hash(path), str(device))
+    component = _shared_components.get(key)
+    if component is None:
+        component = build()
+        _shared_components[key] = component
+        return component
+
+    print(f"♻️ Reusing {name} weights shared with an already loaded model")
+    if isinstance(component, torch.nn.Module):
+        component.to(device)  # may have been offloaded together with its last user
+    return component
+
+
+def register_owner(component: Any, owner: Any):
+    """Record that `owner` (a model with a `.device`) uses the shared component."""
+    _component_owners.setdefault(component, weakref.WeakSet()).add(owner)
+
+
+def move_shared_component(component: torch.nn.Module, device, owner: Any):
+    """
+    Move a component for `owner`, unless that offloads it while another model still uses it.
+
+    Offloading to the CPU leaves the shared s3gen / ve where it is while another resident model
+    needs it; the last of its users takes it along. Moving toward an accelerator always moves it:
+    owners offloaded to the CPU hold the same object, so they follow and get it back on their next
+    move (or offload it when they are the last resident user).
+    """
+    current = next(component.parameters()).device
+    if _same_device(current, device):
+        return
+    if torch.device(device).type == "cpu":
+        owners = _component_owners.get(component, ())
+        if any(other is not owner and _same_device(current, other.device) for other in owners):
+            return
+    component.to(device)
+
+
+def _same_device(a, b) -> bool:
+    a, b = torch.device(a), torch.device(b)
+    return a.type == b.type and (a.index is None or b.index is None or a.index == b.index)
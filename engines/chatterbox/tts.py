@@ -1,3 +1,6 @@
+import hashlib
+import os
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -20,6 +23,7 @@ from .models.s3gen import S3GEN_SR, S3Gen
 from .models.tokenizers import EnTokenizer
 from .models.voice_encoder import VoiceEncoder
 from .models.t3.modules.cond_enc import T3Cond
+from .shared_weights import load_shared_component, register_owner, move_shared_component, file_content_hash
 
 # Import language model registry
 try:
@@ -32,6 +36,9 @@ except ImportError:
 
 REPO_ID = "ResembleAI/chatterbox"  # Default for backward compatibility
 
+# Number of reference voices whose conditionals are kept in memory per model
+CONDS_CACHE_SIZE = 32
+
 
 def punc_norm(text: str) -> str:
     """
@@ -135,6 +142,16 @@ class ChatterboxTTS:
         self.tokenizer = tokenizer
         self.device = device
         self.conds = conds
+        # Reference voice conditionals keyed by audio content hash (LRU order)
+        self._conds_cache = OrderedDict()
+        self._content_hash_cache = {}
+        self.conds_cache_size = CONDS_CACHE_SIZE
+        self.conds_cache_dir = None  # Set to persist conditionals with Conditionals.save/load
+        self.model_id = "default"
+        # Set to a VoiceLibrary to use (and precompute) sidecar conditionals next to voice files
+        self.voice_library = None
+        # Identifies the weights conditionals depend on (ve, s3gen, prompt length), see from_local
+        self.conditioning_version = None
         # Initialize watermarker silently
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
@@ -146,6 +163,16 @@ class ChatterboxTTS:
         ckpt_dir = Path(ckpt_dir)
         
         # Auto-detect model format
+        def model_file_path(base_name: str) -> Path:
+            """Checkpoint file for a component (.safetensors preferred over .pt)"""
+            safetensors_path = ckpt_dir / f"{base_name}.safetensors"
+            if safetensors_path.exists():
+                return safetensors_path
+            pt_path = ckpt_dir / f"{base_name}.pt"
+            if pt_path.exists():
+                return pt_path
+            raise FileNotFoundError(f"Neither {base_name}.safetensors nor {base_name}.pt found in {ckpt_dir}")
+        
         def load_model_file(base_name: str):
             """Load model file with auto-detection of format (.safetensors preferred over .pt)"""
             safetensors_path = ckpt_dir / f"{base_name}.safetensors"
@@ -163,11 +190,22 @@ class ChatterboxTTS:
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
             
+            # ve / s3gen / tokenizer are usually identical across language variants:
+            # reuse an already loaded instance with the same file content instead of loading a copy
+            def build_ve():
+                ve = VoiceEncoder()
+                ve.load_state_dict(load_model_file("ve"))
+                return ve.to(device).eval()
+
+            def build_s3gen():
+                s3gen = S3Gen()
+                s3gen_state = load_model_file("s3gen")
+                # Apply JaneDoe84's critical fix: strict=False to handle missing keys
+                s3gen.load_state_dict(s3gen_state, strict=False)
+                return s3gen.to(device).eval()
+
             # Load VoiceEncoder
-            ve = VoiceEncoder()
-            ve_state = load_model_file("ve")
-            ve.load_state_dict(ve_state)
-            ve.to(device).eval()
+            ve = load_shared_component("ve", model_file_path("ve"), device, build_ve)
 
             # Load T3 config
             t3_state = load_model_file("t3_cfg")
@@ -188,21 +226,23 @@ class ChatterboxTTS:
             t3.to(device).eval()
 
             # Load S3Gen
-            s3gen = S3Gen()
-            s3gen_state = load_model_file("s3gen")
-            # Apply JaneDoe84's critical fix: strict=False to handle missing keys
-            s3gen.load_state_dict(s3gen_state, strict=False)
-            s3gen.to(device).eval()
-
-            tokenizer = EnTokenizer(
-                str(ckpt_dir / "tokenizer.json")
-            )
+            s3gen = load_shared_component("s3gen", model_file_path("s3gen"), device, build_s3gen)
+
+            tokenizer_path = ckpt_dir / "tokenizer.json"
+            tokenizer = load_shared_component("tokenizer", tokenizer_path, "any", lambda: EnTokenizer(str(tokenizer_path)))
 
             conds = None
             if (builtin_voice := ckpt_dir / "conds.pt").exists():
                 conds = Conditionals.load(builtin_voice).to(device)
 
             instance = cls(t3, s3gen, ve, tokenizer, device, conds=conds)
+            register_owner(s3gen, instance)
+            register_owner(ve, instance)
+            instance.model_id = hashlib.md5(str(ckpt_dir.resolve()).encode()).hexdigest()[:16]
+            # Language variants share ve/s3gen, so they share precomputed conditionals too
+            conditioning_source = (f"{file_content_hash(model_file_path('ve'))}:{file_content_hash(model_file_path('s3gen'))}"
+                                   f":{t3.hp.speech_cond_prompt_len}")
+            instance.conditioning_version = hashlib.blake2b(conditioning_source.encode(), digest_size=8).hexdigest()
             print("✅ Successfully loaded all local ChatterBox models")
             return instance
 
@@ -262,6 +302,123 @@ class ChatterboxTTS:
         return cls.from_local(model_dir, device)
 
     def prepare_conditionals(self, wav_fpath, exaggeration=0.5):
+        """Set self.conds for a reference wav, reusing cached conditionals for known voices."""
+        self.conds = self.get_conditionals(wav_fpath, exaggeration=exaggeration)
+
+    def get_conditionals(self, wav_fpath, exaggeration=0.5) -> Conditionals:
+        """
+        Get conditionals for a reference wav.
+
+        Results are cached by audio content hash so the reference pipeline (resampling,
+        embed_ref, S3 tokenizer and VoiceEncoder) only runs once per voice. Exaggeration
+        is applied on top of the cached entry as a cheap overlay.
+        """
+        content_hash = self._get_content_hash(wav_fpath)
+        conds = self._conds_cache.get(content_hash)
+        if conds is not None:
+            self._conds_cache.move_to_end(content_hash)
+        else:
+            conds = self._load_persisted_conditionals(content_hash, wav_fpath)
+            if conds is None:
+                conds = self._compute_conditionals(wav_fpath)
+                self._persist_conditionals(content_hash, conds)
+            self._conds_cache[content_hash] = conds
+            while len(self._conds_cache) > self.conds_cache_size:
+                self._conds_cache.popitem(last=False)
+
+        return Conditionals(self._with_exaggeration(conds.t3, exaggeration), conds.gen)
+
+    def to(self, device):
+        """Move all models and cached conditionals to `device` (used for VRAM offloading)."""
+        self.t3.to(device)
+        self.t3._compiled_decode_step = None  # CUDA graphs captured the old weight addresses
+        # s3gen / ve may be shared with other language variants that are still in use
+        move_shared_component(self.s3gen, device, self)
+        move_shared_component(self.ve, device, self)
+        if self.conds is not None:
+            self.conds.to(device)
+        for conds in self._conds_cache.values():
+            conds.to(device)
+        self.device = device
+        return self
+
+    def clear_conditionals_cache(self):
+        """Drop all in-memory reference voice conditionals."""
+        self._conds_cache.clear()
+        self._content_hash_cache.clear()
+
+    def _get_content_hash(self, wav_fpath) -> str:
+        """Hash the reference file contents, memoized by (path, size, mtime)."""
+        stat = os.stat(wav_fpath)
+        stat_key = (os.path.abspath(wav_fpath), stat.st_size, stat.st_mtime_ns)
+        content_hash = self._content_hash_cache.get(stat_key)
+        if content_hash is None:
+            hasher = hashlib.blake2b(digest_size=16)
+            with open(wav_fpath, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    hasher.update(chunk)
+            content_hash = hasher.hexdigest()
+            self._content_hash_cache[stat_key] = content_hash
+        return content_hash
+
+    def _conditionals_path(self, content_hash: str):
+        if not self.conds_cache_dir:
+            return None
+        return Path(self.conds_cache_dir) / self.model_id / f"{content_hash}.pt"
+
+    def precompute_conditionals(self, wav_fpath) -> bool:
+        """
+        Store the conditionals of a voice file in the voice library, unless they are already there.
+
+        Used by the background library builder: the in-memory cache is left alone.
+
+        Returns:
+            True if the conditionals were computed
+        """
+        if self.voice_library is None or self.conditioning_version is None:
+            return False
+        content_hash = self._get_content_hash(wav_fpath)
+        if self.voice_library.load(wav_fpath, self.conditioning_version, content_hash) is not None:
+            return False
+        conds = self._compute_conditionals(wav_fpath)
+        self.voice_library.save(wav_fpath, self.conditioning_version, content_hash,
+                                dict(t3=conds.t3.__dict__, gen=conds.gen))
+        return True
+
+    def _load_persisted_conditionals(self, content_hash: str, wav_fpath=None):
+        if self.voice_library is not None and self.conditioning_version is not None and wav_fpath is not None:
+            entry = self.voice_library.load(wav_fpath, self.conditioning_version, content_hash)
+            if entry is not None:
+                return Conditionals(T3Cond(**entry['t3']), entry['gen']).to(self.device)
+        fpath = self._conditionals_path(content_hash)
+        if fpath is None or not fpath.exists():
+            return None
+        try:
+            return Conditionals.load(fpath).to(self.device)
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable cached conditionals {fpath}: {e}")
+            return None
+
+    def _persist_conditionals(self, content_hash: str, conds: Conditionals):
+        fpath = self._conditionals_path(content_hash)
+        if fpath is None:
+            return
+        try:
+            fpath.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = fpath.with_suffix(f".{os.getpid()}.tmp")
+            conds.save(tmp_path)
+            os.replace(tmp_path, fpath)
+        except OSError as e:
+            print(f"⚠️ Failed to persist conditionals to {fpath}: {e}")
+
+    def _with_exaggeration(self, t3_cond: T3Cond, exaggeration) -> T3Cond:
+        return T3Cond(
+            speaker_emb=t3_cond.speaker_emb,
+            cond_prompt_speech_tokens=t3_cond.cond_prompt_speech_tokens,
+            emotion_adv=exaggeration * torch.ones(1, 1, 1),
+        ).to(device=self.device)
+
+    def _compute_conditionals(self, wav_fpath, exaggeration=0.5) -> Conditionals:
         ## Load reference wav
         s3gen_ref_wav, _sr = librosa.load(wav_fpath, sr=S3GEN_SR)
 
@@ -271,6 +428,7 @@ class ChatterboxTTS:
         s3gen_ref_dict = self.s3gen.embed_ref(s3gen_ref_wav, S3GEN_SR, device=self.device)
 
         # Speech cond prompt tokens
+        t3_cond_prompt_tokens = None
         if plen := self.t3.hp.speech_cond_prompt_len:
             s3_tokzr = self.s3gen.tokenizer
             t3_cond_prompt_tokens, _ = s3_tokzr.forward([ref_16k_wav[:self.ENC_COND_LEN]], max_len=plen)
@@ -285,7 +443,7 @@ class ChatterboxTTS:
             cond_prompt_speech_tokens=t3_cond_prompt_tokens,
             emotion_adv=exaggeration * torch.ones(1, 1, 1),
         ).to(device=self.device)
-        self.conds = Conditionals(t3_cond, s3gen_ref_dict)
+        return Conditionals(t3_cond, s3gen_ref_dict)
 
     def generate(
         self,
@@ -294,7 +452,18 @@ class ChatterboxTTS:
         exaggeration=0.5,
         cfg_weight=0.5,
         temperature=0.8,
+        fast_decode=False,
+        flow_steps=10,
+        flow_solver="euler",
+        flow_cfg_skip_after=None,
     ):
+        """
+        Args:
+            fast_decode: sample T3 with the static-cache fast decode loop
+            flow_steps: S3Gen flow-matching steps (10 = reference quality, ~4 for draft renders)
+            flow_solver: flow-matching ODE solver, "euler", "midpoint" or "heun"
+            flow_cfg_skip_after: drop S3Gen classifier-free guidance after this many steps (None = never)
+        """
         if audio_prompt_path:
             self.prepare_conditionals(audio_prompt_path, exaggeration=exaggeration)
         else:
@@ -302,23 +471,12 @@ class ChatterboxTTS:
 
         # Update exaggeration if needed
         if exaggeration != self.conds.t3.emotion_adv[0, 0, 0]:
-            _cond: T3Cond = self.conds.t3
-            self.conds.t3 = T3Cond(
-                speaker_emb=_cond.speaker_emb,
-                cond_prompt_speech_tokens=_cond.cond_prompt_speech_tokens,
-                emotion_adv=exaggeration * torch.ones(1, 1, 1),
-            ).to(device=self.device)
+            self.conds.t3 = self._with_exaggeration(self.conds.t3, exaggeration)
 
         # Norm and tokenize text
-        text = punc_norm(text)
-        text_tokens = self.tokenizer.text_to_tokens(text).to(self.device)
+        text_tokens = self._tokenize(text)
         text_tokens = torch.cat([text_tokens, text_tokens], dim=0)  # Need two seqs for CFG
 
-        sot = self.t3.hp.start_text_token
-        eot = self.t3.hp.stop_text_token
-        text_tokens = F.pad(text_tokens, (1, 0), value=sot)
-        text_tokens = F.pad(text_tokens, (0, 1), value=eot)
-
         with torch.inference_mode():
             speech_tokens = self.t3.inference(
                 t3_cond=self.conds.t3,
@@ -326,18 +484,170 @@ class ChatterboxTTS:
                 max_new_tokens=1000,  # TODO: use the value in config
                 temperature=temperature,
                 cfg_weight=cfg_weight,
+                fast_decode=fast_decode,
             )
             # Extract only the conditional batch.
             speech_tokens = speech_tokens[0]
+            return self._speech_tokens_to_wav(
+                speech_tokens, self.conds.gen, **self._flow_kwargs(flow_steps, flow_solver, flow_cfg_skip_after)
+            )
 
-            # TODO: output becomes 1D
-            speech_tokens = drop_invalid_tokens(speech_tokens)
-            speech_tokens = speech_tokens.to(self.device)
+    @torch.inference_mode()
+    def generate_stream(
+        self,
+        text,
+        audio_prompt_path=None,
+        exaggeration=0.5,
+        cfg_weight=0.5,
+        temperature=0.8,
+        chunk_size=25,
+        first_chunk_size=10,
+        flow_steps=10,
+        flow_solver="euler",
+        flow_cfg_skip_after=None,
+    ):
+        """
+        Generate audio incrementally while T3 is still sampling.
+
+        Speech tokens are taken in windows (`first_chunk_size` tokens, then `chunk_size`), and each
+        window is vocoded with S3Gen's streaming step, which crossfades chunk seams.
+        Yields watermarked (1, T) audio tensors at `self.sr`; concatenated they form the utterance.
+        Flow-matching options are the same as in `generate`.
+        """
+        if audio_prompt_path:
+            self.prepare_conditionals(audio_prompt_path, exaggeration=exaggeration)
+        else:
+            assert self.conds is not None, "Please `prepare_conditionals` first or specify `audio_prompt_path`"
+
+        if exaggeration != self.conds.t3.emotion_adv[0, 0, 0]:
+            self.conds.t3 = self._with_exaggeration(self.conds.t3, exaggeration)
+
+        text_tokens = self._tokenize(text)
+        text_tokens = torch.cat([text_tokens, text_tokens], dim=0)  # Need two seqs for CFG
+
+        ref_dict = self.conds.gen
+        flow_kwargs = self._flow_kwargs(flow_steps, flow_solver, flow_cfg_skip_after)
+        stream_cache = {}
+        speech_tokens = []
+        token_windows = self.t3.inference_stream(
+            t3_cond=self.conds.t3,
+            text_tokens=text_tokens,
+            max_new_tokens=1000,  # TODO: use the value in config
+            temperature=temperature,
+            cfg_weight=cfg_weight,
+            chunk_size=chunk_size,
+            first_chunk_size=first_chunk_size,
+        )
+        # Vocode every window as soon as it arrives; the end of the utterance is flushed once T3 is done
+        for window in token_windows:
+            speech_tokens.append(drop_invalid_tokens(window[0]))
+            tokens_so_far = torch.cat(speech_tokens).to(self.device)
+            if tokens_so_far.numel() == 0:
+                continue
+            wav = self.s3gen.inference_stream_step(tokens_so_far, ref_dict, stream_cache, finalize=False, **flow_kwargs)
+            if wav.size(1) > 0:
+                yield self._watermark(wav)
+        
+        tokens_so_far = torch.cat(speech_tokens).to(self.device) if speech_tokens else None
+        if tokens_so_far is not None and tokens_so_far.numel() > 0:
+            wav = self.s3gen.inference_stream_step(tokens_so_far, ref_dict, stream_cache, finalize=True, **flow_kwargs)
+            if wav.size(1) > 0:
+                yield self._watermark(wav)
+
+    def generate_batch(
+        self,
+        texts,
+        audio_prompt_paths=None,
+        exaggeration=0.5,
+        cfg_weight=0.5,
+        temperature=0.8,
+        max_batch_size=8,
+        flow_steps=10,
+        flow_solver="euler",
+        flow_cfg_skip_after=None,
+    ):
+        """
+        Generate several texts with batched T3 sampling.
+
+        Args:
+            texts: list of texts to synthesize
+            audio_prompt_paths: None (use prepared conds), one path for all texts, or one path per text
+            max_batch_size: maximum number of texts sampled together
+            flow_steps, flow_solver, flow_cfg_skip_after: S3Gen flow-matching options, as in `generate`
+        Returns:
+            list of audio tensors in the same format and order as `generate`
+        """
+        if audio_prompt_paths is None or isinstance(audio_prompt_paths, (str, Path)):
+            audio_prompt_paths = [audio_prompt_paths] * len(texts)
+        assert len(audio_prompt_paths) == len(texts), "need one audio prompt per text"
+
+        conds_list = []
+        for audio_prompt_path in audio_prompt_paths:
+            if audio_prompt_path:
+                conds_list.append(self.get_conditionals(audio_prompt_path, exaggeration=exaggeration))
+            else:
+                assert self.conds is not None, "Please `prepare_conditionals` first or specify `audio_prompt_paths`"
+                conds_list.append(Conditionals(self._with_exaggeration(self.conds.t3, exaggeration), self.conds.gen))
 
-            wav, _ = self.s3gen.inference(
-                speech_tokens=speech_tokens,
-                ref_dict=self.conds.gen,
+        text_tokens = [self._tokenize(text)[0] for text in texts]
+
+        # Sort by length so each batch carries as little padding as possible
+        order = sorted(range(len(texts)), key=lambda idx: text_tokens[idx].numel())
+        flow_kwargs = self._flow_kwargs(flow_steps, flow_solver, flow_cfg_skip_after)
+        speech_tokens_list = [None] * len(texts)
+        with torch.inference_mode():
+            for start in range(0, len(order), max_batch_size):
+                batch_idx = order[start:start + max_batch_size]
+                batch_speech_tokens = self.t3.inference_batch(
+                    t3_conds=[conds_list[idx].t3 for idx in batch_idx],
+                    text_tokens=[text_tokens[idx] for idx in batch_idx],
+                    max_new_tokens=1000,  # TODO: use the value in config
+                    temperature=temperature,
+                    cfg_weight=cfg_weight,
+                )
+                for idx, speech_tokens in zip(batch_idx, batch_speech_tokens):
+                    speech_tokens_list[idx] = drop_invalid_tokens(speech_tokens)
+
+            # Vocode everything together; S3Gen regroups the sequences by speech length
+            wavs = self.s3gen.inference_batch(
+                speech_tokens_list,
+                [conds.gen for conds in conds_list],
+                max_batch_size=max_batch_size,
+                **flow_kwargs,
             )
-            wav = wav.squeeze(0).detach().cpu().numpy()
-            watermarked_wav = self.watermarker.apply_watermark(wav, sample_rate=self.sr)
+        return [self._watermark(wav) for wav in wavs]
+
+    def _tokenize(self, text):
+        """Normalize text and tokenize it with start/stop text tokens, shape (1, L)."""
+        text = punc_norm(text)
+        text_tokens = self.tokenizer.text_to_tokens(text).to(self.device)
+
+        sot = self.t3.hp.start_text_token
+        eot = self.t3.hp.stop_text_token
+        text_tokens = F.pad(text_tokens, (1, 0), value=sot)
+        text_tokens = F.pad(text_tokens, (0, 1), value=eot)
+        return text_tokens
+
+    @staticmethod
+    def _flow_kwargs(flow_steps, flow_solver, flow_cfg_skip_after):
+        """Map the public flow-matching options onto S3Gen inference arguments."""
+        return dict(n_timesteps=flow_steps, solver=flow_solver, cfg_skip_after=flow_cfg_skip_after)
+
+    def _speech_tokens_to_wav(self, speech_tokens, ref_dict, **flow_kwargs):
+        """Vocode 1D speech tokens with S3Gen and apply the watermark."""
+        # TODO: output becomes 1D
+        speech_tokens = drop_invalid_tokens(speech_tokens)
+        speech_tokens = speech_tokens.to(self.device)
+
+        wav, _ = self.s3gen.inference(
+            speech_tokens=speech_tokens,
+            ref_dict=ref_dict,
+            **flow_kwargs,
+        )
+        return self._watermark(wav)
+
+    def _watermark(self, wav):
+        """Apply the Perth watermark to a (1, T) waveform and return it as a CPU tensor."""
+        wav = wav.squeeze(0).detach().cpu().numpy()
+        watermarked_wav = self.watermarker.apply_watermark(wav, sample_rate=self.sr)
         return torch.from_numpy(watermarked_wav).unsqueeze(0)
@@ -1,3 +1,5 @@
+import hashlib
+import os
 from pathlib import Path
 
 import librosa
@@ -10,11 +12,15 @@ with warnings.catch_warnings():
     warnings.simplefilter("ignore")
     import perth
 
-from .models.s3tokenizer import S3_SR
+from .models.s3tokenizer import S3_SR, S3_TOKEN_HOP, S3_TOKEN_RATE
 from .models.s3gen import S3GEN_SR, S3Gen
+from .models.s3gen.s3gen import get_resampler
+from .shared_weights import load_shared_component, register_owner, move_shared_component
 
 
 REPO_ID = "ResembleAI/chatterbox"
+# Output samples (24 kHz) per speech token (16 kHz source, 25 tokens/sec)
+GEN_TOKEN_HOP = S3GEN_SR // S3_TOKEN_RATE
 
 
 class ChatterboxVC:
@@ -34,6 +40,8 @@ class ChatterboxVC:
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
             self.watermarker = perth.PerthImplicitWatermarker()
+        # Identity of the audio ref_dict was embedded from, so an unchanged target is not re-embedded
+        self._target_key = None
         if ref_dict is None:
             self.ref_dict = None
         else:
@@ -55,13 +63,18 @@ class ChatterboxVC:
                 states = torch.load(builtin_voice)
                 ref_dict = states['gen']
 
-            s3gen = S3Gen()
-            s3gen.load_state_dict(
-                torch.load(ckpt_dir / "s3gen.pt")
-            )
-            s3gen.to(device).eval()
+            def build_s3gen():
+                s3gen = S3Gen()
+                s3gen.load_state_dict(
+                    torch.load(ckpt_dir / "s3gen.pt")
+                )
+                return s3gen.to(device).eval()
+
+            # Shares the S3Gen instance with loaded TTS models built from the same s3gen.pt
+            s3gen = load_shared_component("s3gen", ckpt_dir / "s3gen.pt", device, build_s3gen)
 
             instance = cls(s3gen, device, ref_dict=ref_dict)
+            register_owner(s3gen, instance)
             print("✅ Successfully loaded all local ChatterBox VC models")
             return instance
 
@@ -72,32 +85,176 @@ class ChatterboxVC:
 
         return cls.from_local(Path(local_path).parent, device)
 
-    def set_target_voice(self, wav_fpath):
+    def to(self, device):
+        """Move the model and target voice to `device` (used for VRAM offloading)."""
+        move_shared_component(self.s3gen, device, self)  # may be shared with TTS models
+        if self.ref_dict is not None:
+            self.ref_dict = {
+                k: v.to(device) if torch.is_tensor(v) else v
+                for k, v in self.ref_dict.items()
+            }
+        self.device = device
+        return self
+
+    def _load_mono(self, audio, sample_rate, target_sr) -> torch.Tensor:
+        """
+        (1, samples) float tensor at target_sr on self.device, from a file path or an in-memory waveform.
+
+        Waveforms ((samples), (channels, samples) or (1, channels, samples)) are averaged to mono and
+        resampled on the device with a cached torchaudio resampler; files go through librosa as before.
+        """
+        if not torch.is_tensor(audio):
+            wav, _ = librosa.load(audio, sr=target_sr)
+            return torch.from_numpy(wav).float().to(self.device)[None, ]
+        if sample_rate is None:
+            raise ValueError("sample_rate is required when passing a waveform tensor")
+        wav = audio.detach().float().to(self.device)
+        if wav.dim() == 3:
+            wav = wav.squeeze(0)
+        if wav.dim() == 2:
+            wav = wav.mean(dim=0)
+        wav = wav[None, ]
+        if sample_rate != target_sr:
+            wav = get_resampler(sample_rate, target_sr, str(self.device))(wav)
+        return wav
+
+    @staticmethod
+    def _audio_key(audio, sample_rate):
+        """Identity of a target voice: content hash for waveforms, (path, size, mtime) for files."""
+        if torch.is_tensor(audio):
+            digest = hashlib.blake2b(audio.detach().cpu().contiguous().numpy().tobytes(), digest_size=16).hexdigest()
+            return ("tensor", digest, tuple(audio.shape), sample_rate)
+        stat = os.stat(audio)
+        return ("file", os.path.abspath(audio), stat.st_size, stat.st_mtime_ns)
+
+    def set_target_voice(self, wav_fpath, sample_rate=None):
+        """
+        Embed the target voice from a file path, or from a waveform tensor with its sample rate.
+
+        The embedding is kept until a different target is set, so repeated calls with the same
+        audio (e.g. once per refinement pass) are free.
+        """
+        target_key = self._audio_key(wav_fpath, sample_rate)
+        if target_key == self._target_key and self.ref_dict is not None:
+            return
+
         ## Load reference wav
-        s3gen_ref_wav, _sr = librosa.load(wav_fpath, sr=S3GEN_SR)
+        s3gen_ref_wav = self._load_mono(wav_fpath, sample_rate, S3GEN_SR)[0]
 
         s3gen_ref_wav = s3gen_ref_wav[:self.DEC_COND_LEN]
         self.ref_dict = self.s3gen.embed_ref(s3gen_ref_wav, S3GEN_SR, device=self.device)
+        self._target_key = target_key
 
     def generate(
         self,
         audio,
         target_voice_path=None,
+        sample_rate=None,
+        target_sample_rate=None,
+        window_seconds=None,
+        overlap_seconds=1.0,
+        batch_size=1,
     ):
-        if target_voice_path:
-            self.set_target_voice(target_voice_path)
+        """
+        Convert `audio` to the target voice.
+
+        Args:
+            audio: Source audio file path, or waveform tensor (then `sample_rate` is required)
+            target_voice_path: Target voice file path or waveform tensor (then `target_sample_rate` is
+                required); None keeps the current target
+            sample_rate: Sample rate of a source waveform tensor
+            target_sample_rate: Sample rate of a target waveform tensor
+            window_seconds: Convert sources longer than this in windows (None = whole clip at once);
+                memory then stays bounded by the window length instead of the clip length
+            overlap_seconds: Overlap between windows, crossfaded when stitching
+            batch_size: Windows converted together in one batched S3Gen pass
+        """
+        if torch.is_tensor(target_voice_path) or target_voice_path:
+            self.set_target_voice(target_voice_path, target_sample_rate)
         else:
             assert self.ref_dict is not None, "Please `prepare_conditionals` first or specify `target_voice_path`"
 
         with torch.inference_mode():
-            audio_16, _ = librosa.load(audio, sr=S3_SR)
-            audio_16 = torch.from_numpy(audio_16).float().to(self.device)[None, ]
-
-            s3_tokens, _ = self.s3gen.tokenizer(audio_16)
-            wav, _ = self.s3gen.inference(
-                speech_tokens=s3_tokens,
-                ref_dict=self.ref_dict,
-            )
+            audio_16 = self._load_mono(audio, sample_rate, S3_SR)
+
+            if window_seconds and audio_16.size(1) > window_seconds * S3_SR:
+                wav = self._generate_windowed(audio_16, window_seconds, overlap_seconds, batch_size)
+            else:
+                s3_tokens, _ = self.s3gen.tokenizer(audio_16)
+                wav, _ = self.s3gen.inference(
+                    speech_tokens=s3_tokens,
+                    ref_dict=self.ref_dict,
+                )
             wav = wav.squeeze(0).detach().cpu().numpy()
             watermarked_wav = self.watermarker.apply_watermark(wav, sample_rate=self.sr)
         return torch.from_numpy(watermarked_wav).unsqueeze(0)
+
+    @staticmethod
+    def _plan_windows(audio_16, window_seconds, overlap_seconds):
+        """
+        Split a (1, samples) 16 kHz source into overlapping windows, in speech-token units.
+
+        Each cut is placed at the quietest token frame in the last quarter of the nominal window,
+        and the overlap is centred on it, so windows are crossfaded where there is (almost) silence.
+
+        Returns:
+            [(start_token, end_token)] covering the whole source; consecutive windows overlap
+        """
+        n_tokens = -(-audio_16.size(1) // S3_TOKEN_HOP)
+        window = max(4, int(window_seconds * S3_TOKEN_RATE))
+        half_overlap = max(1, min(int(overlap_seconds * S3_TOKEN_RATE) // 2, window // 4))
+        search = max(1, window // 4)
+
+        # Energy of every token frame (the last one zero-padded)
+        padded = torch.nn.functional.pad(audio_16[0], (0, n_tokens * S3_TOKEN_HOP - audio_16.size(1)))
+        energy = padded.view(n_tokens, S3_TOKEN_HOP).pow(2).mean(dim=1)
+
+        windows = []
+        start = 0
+        while start + window < n_tokens:
+            low = max(start + 2 * half_overlap + 1, start + window - search)
+            high = start + window - half_overlap
+            cut = low + int(torch.argmin(energy[low:high + 1]))
+            windows.append((start, cut + half_overlap))
+            start = cut - half_overlap
+        windows.append((start, n_tokens))
+        return windows
+
+    def _generate_windowed(self, audio_16, window_seconds, overlap_seconds, batch_size):
+        """
+        Convert a long source window by window against the cached target and overlap-add the results.
+
+        Windows are tokenized and vocoded independently (batch_size at a time with S3Gen's batched
+        inference), then stitched into one preallocated output with raised-cosine crossfades.
+        """
+        windows = self._plan_windows(audio_16, window_seconds, overlap_seconds)
+        total = -(-audio_16.size(1) // S3_TOKEN_HOP) * GEN_TOKEN_HOP
+        output = torch.zeros(1, total, device=self.device)
+        print(f"🪟 VC: converting {audio_16.size(1) / S3_SR:.1f}s in {len(windows)} windows of ~{window_seconds:.0f}s")
+
+        previous_end = 0  # end (output samples) of the audio already written
+        for batch_start in range(0, len(windows), batch_size):
+            batch = windows[batch_start:batch_start + batch_size]
+            tokens = []
+            for start, end in batch:
+                window_tokens, token_lens = self.s3gen.tokenizer(audio_16[:, start * S3_TOKEN_HOP:end * S3_TOKEN_HOP])
+                tokens.append(window_tokens[:, :int(token_lens[0])])
+            if len(batch) == 1:
+                wavs = [self.s3gen.inference(speech_tokens=tokens[0], ref_dict=self.ref_dict)[0]]
+            else:
+                wavs = self.s3gen.inference_batch(tokens, [self.ref_dict] * len(batch), max_batch_size=batch_size)
+
+            for (start, end), wav in zip(batch, wavs):
+                offset = start * GEN_TOKEN_HOP
+                wav = wav[:, :min(wav.size(1), total - offset)].to(output.device)
+                fade = min(max(previous_end - offset, 0), wav.size(1))
+                if fade > 0:
+                    # Raised-cosine crossfade over the overlap; the fades sum to one
+                    fade_in = (1 - torch.cos(torch.linspace(0, torch.pi, fade, device=output.device))) / 2
+                    output[:, offset:offset + fade] *= 1 - fade_in
+                    output[:, offset:offset + fade] += wav[:, :fade] * fade_in
+                output[:, offset + fade:offset + wav.size(1)] = wav[:, fade:]
+                previous_end = offset + wav.size(1)
+
+        # Trim the token padding of the last window back to the source duration
+        return output[:, :int(audio_16.size(1) * S3GEN_SR / S3_SR)]
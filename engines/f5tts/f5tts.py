@@ -255,6 +255,15 @@ class ChatterBoxF5TTS:
         except Exception as e:
             raise RuntimeError(f"Failed to load F5-TTS model '{self.model_name}': {e}")
     
+    def to(self, device: str):
+        """Move the F5-TTS model and vocoder to `device` (used for VRAM offloading)"""
+        if self.f5tts_model is not None:
+            self.f5tts_model.ema_model.to(device)
+            self.f5tts_model.vocoder.to(device)
+            self.f5tts_model.device = device
+        self.device = device
+        return self
+    
     @classmethod
     def from_local(cls, ckpt_dir: str, device: str, model_name: str = "F5TTS_Base"):
         """Load from local directory following ChatterBox pattern"""
@@ -3,17 +3,25 @@ F5-TTS editing engine for speech synthesis and editing.
 Exact working implementation extracted from f5tts_edit_node.py
 """
 
+import copy
 import torch
 import torchaudio
 import tempfile
 import os
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Dict, Any
 from .audio_compositing import AudioCompositor, EditMaskGenerator
+from utils.models.residency import model_residency
 
 
 class F5TTSEditEngine:
     """Core engine for F5-TTS speech editing operations."""
     
+    # Lazily loaded edit models, vocoders, vocabularies and configs shared by all edit engines
+    _edit_model_cache: Dict[str, Any] = {}
+    _vocoder_cache: Dict[str, Any] = {}
+    _vocab_cache: Dict[Tuple[str, str], Tuple[dict, int]] = {}
+    _config_cache: Dict[str, dict] = {}
+    
     def __init__(self, device: str, f5tts_sample_rate: int = 24000):
         """Initialize the F5-TTS edit engine."""
         self.device = self._resolve_device(device)
@@ -41,143 +49,14 @@ class F5TTSEditEngine:
         target_rms = 0.1
         
         try:
-            # Import F5-TTS modules
-            from f5_tts.model import CFM
-            from f5_tts.infer.utils_infer import load_checkpoint, load_vocoder
-            from f5_tts.model.utils import convert_char_to_pinyin, get_tokenizer
-            from omegaconf import OmegaConf
-            from hydra.utils import get_class
-            from importlib.resources import files
-            from cached_path import cached_path
-            import torch.nn.functional as F
-            
-            # Model configuration - get model name from current model or default
-            model_name = current_model_name
-            exp_name = model_name if model_name in ["F5TTS_Base", "F5TTS_v1_Base", "E2TTS_Base"] else "F5TTS_v1_Base"
-            ckpt_step = 1250000 if exp_name == "F5TTS_v1_Base" else 1200000
-            
-            # Load model config
-            model_cfg = OmegaConf.load(str(files("f5_tts").joinpath(f"configs/{exp_name}.yaml")))
-            model_cls = get_class(f"f5_tts.model.{model_cfg.model.backbone}")
-            model_arc = model_cfg.model.arch
-            
-            dataset_name = model_cfg.datasets.name
-            tokenizer = model_cfg.model.tokenizer
-            
-            mel_spec_type = model_cfg.model.mel_spec.mel_spec_type
-            target_sample_rate = model_cfg.model.mel_spec.target_sample_rate
-            n_mel_channels = model_cfg.model.mel_spec.n_mel_channels
-            hop_length = model_cfg.model.mel_spec.hop_length
-            win_length = model_cfg.model.mel_spec.win_length
-            n_fft = model_cfg.model.mel_spec.n_fft
-            
-            # Load checkpoint
-            ckpt_path = str(cached_path(f"hf://SWivid/F5-TTS/{exp_name}/model_{ckpt_step}.safetensors"))
+            from f5_tts.model.utils import convert_char_to_pinyin
             
-            # Load vocoder
-            vocoder = load_vocoder(vocoder_name=mel_spec_type, is_local=False)
-            
-            # Get tokenizer with proper error handling for missing vocab file
-            try:
-                vocab_char_map, vocab_size = get_tokenizer(dataset_name, tokenizer)
-            except FileNotFoundError as e:
-                print(f"⚠️ Global vocab file not found: {e}")
-                print("📦 Attempting to use local vocab file from F5-TTS model...")
-                
-                # Try to use the local vocab file that we already have
-                try:
-                    import folder_paths
-                    local_vocab_path = os.path.join(folder_paths.models_dir, "F5-TTS", "F5TTS_Base", "vocab.txt")
-                    
-                    if os.path.exists(local_vocab_path):
-                        print(f"✅ Found local vocab file: {local_vocab_path}")
-                        
-                        # Load vocab manually from local file
-                        with open(local_vocab_path, "r", encoding="utf-8") as f:
-                            vocab_char_map = {}
-                            for i, char in enumerate(f.read().strip().split('\n')):
-                                vocab_char_map[char] = i
-                        
-                        # Check if we need to add missing tokens (model expects 2546, we have 2544)
-                        vocab_size = len(vocab_char_map)
-                        expected_size = 2546  # Based on the error message
-                        
-                        if vocab_size < expected_size:
-                            print(f"⚠️ Vocab size mismatch: loaded {vocab_size}, model expects {expected_size}")
-                            print("🔧 Adding missing tokens...")
-                            
-                            # Add common missing tokens
-                            missing_tokens = ["<pad>", "<unk>"]
-                            for token in missing_tokens:
-                                if token not in vocab_char_map:
-                                    vocab_char_map[token] = vocab_size
-                                    vocab_size += 1
-                                    if vocab_size >= expected_size:
-                                        break
-                            
-                            # If still not enough, add placeholder tokens
-                            while vocab_size < expected_size:
-                                placeholder_token = f"<placeholder_{vocab_size}>"
-                                vocab_char_map[placeholder_token] = vocab_size
-                                vocab_size += 1
-                        
-                        print(f"✅ Final vocab size: {vocab_size} tokens")
-                        
-                        # Try to copy to expected location for future use (optional)
-                        try:
-                            import shutil
-                            import site
-                            
-                            # Find the site-packages directory
-                            site_packages = None
-                            for path in site.getsitepackages():
-                                if 'site-packages' in path:
-                                    site_packages = path
-                                    break
-                            
-                            if site_packages:
-                                target_vocab_dir = os.path.join(site_packages, "f5_tts", "..", "..", "data", "Emilia_ZH_EN_pinyin")
-                                target_vocab_dir = os.path.normpath(target_vocab_dir)
-                                os.makedirs(target_vocab_dir, exist_ok=True)
-                                target_vocab_path = os.path.join(target_vocab_dir, "vocab.txt")
-                                
-                                shutil.copy2(local_vocab_path, target_vocab_path)
-                                print(f"✅ Copied local vocab to expected location: {target_vocab_path}")
-                            else:
-                                print("⚠️ Could not find site-packages directory, skipping vocab copy")
-                        
-                        except Exception as copy_error:
-                            print(f"⚠️ Failed to copy vocab file (continuing anyway): {copy_error}")
-                            # Don't raise error - we already have the vocab loaded successfully
-                        
-                    else:
-                        print(f"❌ Local vocab file not found at: {local_vocab_path}")
-                        raise FileNotFoundError(f"Cannot find local vocab file: {local_vocab_path}")
-                        
-                except Exception as local_error:
-                    print(f"❌ Failed to use local vocab file: {local_error}")
-                    raise FileNotFoundError(f"Cannot find or use vocab file: {e}")
-            
-            # Create model
-            model = CFM(
-                transformer=model_cls(**model_arc, text_num_embeds=vocab_size, mel_dim=n_mel_channels),
-                mel_spec_kwargs=dict(
-                    n_fft=n_fft,
-                    hop_length=hop_length,
-                    win_length=win_length,
-                    n_mel_channels=n_mel_channels,
-                    target_sample_rate=target_sample_rate,
-                    mel_spec_type=mel_spec_type,
-                ),
-                odeint_kwargs=dict(
-                    method=ode_method,
-                ),
-                vocab_char_map=vocab_char_map,
-            ).to(self.device)
-            
-            # Load checkpoint
-            dtype = torch.float32 if mel_spec_type == "bigvgan" else None
-            model = load_checkpoint(model, ckpt_path, self.device, dtype=dtype, use_ema=True)
+            # Cached model/vocoder: only the first edit per model pays the load cost
+            model, vocoder, settings = self._get_edit_model(current_model_name)
+            tokenizer = settings["tokenizer"]
+            mel_spec_type = settings["mel_spec_type"]
+            target_sample_rate = settings["target_sample_rate"]
+            hop_length = settings["hop_length"]
             
             # Prepare audio - ensure consistent dimensions
             audio = audio_tensor.to(self.device)
@@ -232,9 +111,15 @@ class F5TTSEditEngine:
             if safe_nfe_step != nfe_step:
                 print(f"⚠️ F5-TTS Edit: Clamped nfe_step from {nfe_step} to {safe_nfe_step} to prevent ODE solver issues")
             
+            # CFM.sample reads the solver from odeint_kwargs and takes no per-call override, so
+            # sample through a shallow copy (same modules and weights) instead of changing the
+            # shared cached model under other edits
+            sampler = copy.copy(model)
+            sampler.odeint_kwargs = dict(method=ode_method)
+            
             # Perform inference
             with torch.inference_mode():
-                generated, trajectory = model.sample(
+                generated, trajectory = sampler.sample(
                     cond=edited_audio,
                     text=final_text_list,
                     duration=duration,
@@ -310,6 +195,186 @@ class F5TTSEditEngine:
         except Exception as e:
             raise RuntimeError(f"F5-TTS speech editing failed: {e}")
     
+    def _get_edit_model(self, model_name: str):
+        """
+        Return (model, vocoder, settings) for an F5-TTS model, loading it on first use.
+        
+        Models are cached per (model, device, dtype) and vocoders per (type, device) across all
+        edit engines, and registered with the residency manager so they follow the VRAM budget.
+        The ODE method is a sampling option chosen per edit, so it is not part of the key and
+        the cached model keeps the default solver.
+        """
+        from f5_tts.model import CFM
+        from f5_tts.infer.utils_infer import load_checkpoint
+        from omegaconf import OmegaConf
+        from hydra.utils import get_class
+        from importlib.resources import files
+        from cached_path import cached_path
+        
+        # Model configuration - get model name from current model or default
+        exp_name = model_name if model_name in ["F5TTS_Base", "F5TTS_v1_Base", "E2TTS_Base"] else "F5TTS_v1_Base"
+        
+        settings = self._config_cache.get(exp_name)
+        if settings is None:
+            # Load model config
+            model_cfg = OmegaConf.load(str(files("f5_tts").joinpath(f"configs/{exp_name}.yaml")))
+            mel_spec_type = model_cfg.model.mel_spec.mel_spec_type
+            settings = {
+                "model_cls": get_class(f"f5_tts.model.{model_cfg.model.backbone}"),
+                "model_arc": model_cfg.model.arch,
+                "dataset_name": model_cfg.datasets.name,
+                "tokenizer": model_cfg.model.tokenizer,
+                "mel_spec_type": mel_spec_type,
+                "target_sample_rate": model_cfg.model.mel_spec.target_sample_rate,
+                "n_mel_channels": model_cfg.model.mel_spec.n_mel_channels,
+                "hop_length": model_cfg.model.mel_spec.hop_length,
+                "win_length": model_cfg.model.mel_spec.win_length,
+                "n_fft": model_cfg.model.mel_spec.n_fft,
+                "dtype": torch.float32 if mel_spec_type == "bigvgan" else None,
+            }
+            self._config_cache[exp_name] = settings
+        
+        vocoder = self._get_vocoder(settings["mel_spec_type"])
+        
+        cache_key = f"f5tts_edit_{exp_name}_{self.device}_{settings['dtype']}"
+        model = model_residency.acquire(cache_key) if cache_key in self._edit_model_cache else None
+        if model is None:
+            print(f"📦 Loading F5-TTS edit model '{exp_name}' on {self.device}")
+            ckpt_step = 1250000 if exp_name == "F5TTS_v1_Base" else 1200000
+            ckpt_path = str(cached_path(f"hf://SWivid/F5-TTS/{exp_name}/model_{ckpt_step}.safetensors"))
+            vocab_char_map, vocab_size = self._get_vocab(settings["dataset_name"], settings["tokenizer"])
+            
+            # Create model
+            model = CFM(
+                transformer=settings["model_cls"](**settings["model_arc"], text_num_embeds=vocab_size,
+                                                  mel_dim=settings["n_mel_channels"]),
+                mel_spec_kwargs=dict(
+                    n_fft=settings["n_fft"],
+                    hop_length=settings["hop_length"],
+                    win_length=settings["win_length"],
+                    n_mel_channels=settings["n_mel_channels"],
+                    target_sample_rate=settings["target_sample_rate"],
+                    mel_spec_type=settings["mel_spec_type"],
+                ),
+                odeint_kwargs=dict(
+                    method="euler",
+                ),
+                vocab_char_map=vocab_char_map,
+            ).to(self.device)
+            
+            # Load checkpoint
+            model = load_checkpoint(model, ckpt_path, self.device, dtype=settings["dtype"], use_ema=True)
+            self._edit_model_cache[cache_key] = model
+            model_residency.register(cache_key, model, self.device,
+                                     on_drop=lambda: self._edit_model_cache.pop(cache_key, None))
+        
+        return model, vocoder, settings
+    
+    def _get_vocoder(self, mel_spec_type: str):
+        """Return the vocoder for a mel spectrogram type, loading it on first use."""
+        from f5_tts.infer.utils_infer import load_vocoder
+        
+        cache_key = f"f5tts_vocoder_{mel_spec_type}_{self.device}"
+        vocoder = model_residency.acquire(cache_key) if cache_key in self._vocoder_cache else None
+        if vocoder is None:
+            vocoder = load_vocoder(vocoder_name=mel_spec_type, is_local=False, device=self.device)
+            self._vocoder_cache[cache_key] = vocoder
+            model_residency.register(cache_key, vocoder, self.device,
+                                     on_drop=lambda: self._vocoder_cache.pop(cache_key, None))
+        return vocoder
+    
+    def _get_vocab(self, dataset_name: str, tokenizer: str):
+        """Return (vocab_char_map, vocab_size), falling back to the local F5TTS_Base vocab file."""
+        cached = self._vocab_cache.get((dataset_name, tokenizer))
+        if cached is not None:
+            return cached
+        
+        from f5_tts.model.utils import get_tokenizer
+        
+        # Get tokenizer with proper error handling for missing vocab file
+        try:
+            vocab_char_map, vocab_size = get_tokenizer(dataset_name, tokenizer)
+        except FileNotFoundError as e:
+            print(f"⚠️ Global vocab file not found: {e}")
+            print("📦 Attempting to use local vocab file from F5-TTS model...")
+            
+            # Try to use the local vocab file that we already have
+            try:
+                import folder_paths
+                local_vocab_path = os.path.join(folder_paths.models_dir, "F5-TTS", "F5TTS_Base", "vocab.txt")
+                
+                if os.path.exists(local_vocab_path):
+                    print(f"✅ Found local vocab file: {local_vocab_path}")
+                    
+                    # Load vocab manually from local file
+                    with open(local_vocab_path, "r", encoding="utf-8") as f:
+                        vocab_char_map = {}
+                        for i, char in enumerate(f.read().strip().split('\n')):
+                            vocab_char_map[char] = i
+                    
+                    # Check if we need to add missing tokens (model expects 2546, we have 2544)
+                    vocab_size = len(vocab_char_map)
+                    expected_size = 2546  # Based on the error message
+                    
+                    if vocab_size < expected_size:
+                        print(f"⚠️ Vocab size mismatch: loaded {vocab_size}, model expects {expected_size}")
+                        print("🔧 Adding missing tokens...")
+                        
+                        # Add common missing tokens
+                        missing_tokens = ["<pad>", "<unk>"]
+                        for token in missing_tokens:
+                            if token not in vocab_char_map:
+                                vocab_char_map[token] = vocab_size
+                                vocab_size += 1
+                                if vocab_size >= expected_size:
+                                    break
+                        
+                        # If still not enough, add placeholder tokens
+                        while vocab_size < expected_size:
+                            placeholder_token = f"<placeholder_{vocab_size}>"
+                            vocab_char_map[placeholder_token] = vocab_size
+                            vocab_size += 1
+                    
+                    print(f"✅ Final vocab size: {vocab_size} tokens")
+                    
+                    # Try to copy to expected location for future use (optional)
+                    try:
+                        import shutil
+                        import site
+                        
+                        # Find the site-packages directory
+                        site_packages = None
+                        for path in site.getsitepackages():
+                            if 'site-packages' in path:
+                                site_packages = path
+                                break
+                        
+                        if site_packages:
+                            target_vocab_dir = os.path.join(site_packages, "f5_tts", "..", "..", "data", "Emilia_ZH_EN_pinyin")
+                            target_vocab_dir = os.path.normpath(target_vocab_dir)
+                            os.makedirs(target_vocab_dir, exist_ok=True)
+                            target_vocab_path = os.path.join(target_vocab_dir, "vocab.txt")
+                            
+                            shutil.copy2(local_vocab_path, target_vocab_path)
+                            print(f"✅ Copied local vocab to expected location: {target_vocab_path}")
+                        else:
+                            print("⚠️ Could not find site-packages directory, skipping vocab copy")
+                    
+                    except Exception as copy_error:
+                        print(f"⚠️ Failed to copy vocab file (continuing anyway): {copy_error}")
+                        # Don't raise error - we already have the vocab loaded successfully
+                    
+                else:
+                    print(f"❌ Local vocab file not found at: {local_vocab_path}")
+                    raise FileNotFoundError(f"Cannot find local vocab file: {local_vocab_path}")
+                    
+            except Exception as local_error:
+                print(f"❌ Failed to use local vocab file: {local_error}")
+                raise FileNotFoundError(f"Cannot find or use vocab file: {e}")
+        
+        self._vocab_cache[(dataset_name, tokenizer)] = (vocab_char_map, vocab_size)
+        return vocab_char_map, vocab_size
+    
     def _build_composite_audio(self, original_audio: torch.Tensor, generated_audio: torch.Tensor,
                               original_edit_regions: List[Tuple[float, float]], 
                               actual_edit_regions: List[Tuple[float, float]],
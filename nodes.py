@@ -178,9 +178,10 @@ except (ImportError, FileNotFoundError, AttributeError):
 
 # Import foundation components for compatibility
 from utils.system.import_manager import import_manager
+# Legacy name for the bounded audio cache (only AudioCache should modify it)
+from utils.audio.cache import GLOBAL_AUDIO_CACHE
 
 # Legacy compatibility - keep these for existing workflows
-GLOBAL_AUDIO_CACHE = {}
 NODE_DIR = os.path.dirname(__file__)
 BUNDLED_CHATTERBOX_DIR = os.path.join(NODE_DIR, "chatterbox")
 BUNDLED_MODELS_DIR = os.path.join(NODE_DIR, "models", "chatterbox")
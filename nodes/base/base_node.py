@@ -7,7 +7,7 @@ import torch
 import numpy as np
 import tempfile
 import os
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple, List
 import comfy.model_management as model_management
 
 # Use absolute imports that work when loaded via importlib
@@ -19,6 +19,7 @@ import sys
 # So we'll use a more aggressive approach to find the project root
 try:
     from utils.models.manager import model_manager
+    from utils.models.residency import model_residency, WeakModelAttribute
 except ImportError:
     # Find project root by going up from this file location
     current_file = os.path.abspath(__file__)
@@ -45,6 +46,7 @@ except ImportError:
     
     # Try import again
     from utils.models.manager import model_manager
+    from utils.models.residency import model_residency, WeakModelAttribute
 
 
 class BaseChatterBoxNode:
@@ -230,6 +232,18 @@ class BaseChatterBoxNode:
             "available": self.model_manager.is_available[model_type],
         }
     
+    def get_model_residency_info(self) -> str:
+        """
+        Describe model loads and VRAM offloads since the last report.
+        
+        Returns:
+            Info string suffix, empty if no model was loaded, offloaded or reloaded
+        """
+        events = model_residency.consume_events()
+        if not events:
+            return ""
+        return f"\nModels: {'; '.join(events)}"
+    
     @classmethod
     def get_input_types_base(cls) -> Dict[str, Dict[str, Any]]:
         """
@@ -293,9 +307,37 @@ class BaseTTSNode(BaseChatterBoxNode):
     Base class specifically for TTS nodes with common TTS functionality.
     """
     
+    # S3Gen flow-matching defaults (reference quality)
+    DEFAULT_FLOW_SETTINGS = {"flow_steps": 10, "flow_solver": "euler", "flow_cfg_skip_after": None}
+
+    # Held weakly so a model dropped by the residency manager is freed (reloaded on next use)
+    tts_model = WeakModelAttribute()
+
     def __init__(self):
         super().__init__()
         self.tts_model = None
+        self.flow_settings = dict(self.DEFAULT_FLOW_SETTINGS)
+    
+    def set_flow_settings(self, flow_steps: int = 10, flow_solver: str = "euler", flow_cfg_skip_after: int = -1):
+        """
+        Set the S3Gen flow-matching options used by every generation of this run.
+        
+        Args:
+            flow_steps: Number of flow-matching steps (10 = reference quality, ~4 for drafts)
+            flow_solver: ODE solver - "euler", "midpoint" or "heun"
+            flow_cfg_skip_after: Drop classifier-free guidance after this step (-1 = keep it on every step)
+        """
+        self.flow_settings = {
+            "flow_steps": flow_steps,
+            "flow_solver": flow_solver,
+            "flow_cfg_skip_after": flow_cfg_skip_after if flow_cfg_skip_after >= 0 else None,
+        }
+    
+    def get_flow_cache_component(self) -> str:
+        """Cache key component for non-default flow settings ("" keeps existing cache keys valid)."""
+        if self.flow_settings == self.DEFAULT_FLOW_SETTINGS:
+            return ""
+        return str(sorted(self.flow_settings.items()))
     
     def load_tts_model(self, device: str = "auto", language: str = "English", force_reload: bool = False):
         """
@@ -339,7 +381,38 @@ class BaseTTSNode(BaseChatterBoxNode):
             audio_prompt_path=audio_prompt,
             exaggeration=exaggeration,
             temperature=temperature,
-            cfg_weight=cfg_weight
+            cfg_weight=cfg_weight,
+            **self.flow_settings
+        )
+    
+    def generate_tts_audio_batch(self, texts: List[str], audio_prompts=None,
+                                 exaggeration: float = 0.5, temperature: float = 0.8,
+                                 cfg_weight: float = 0.5, batch_size: int = 8) -> List[torch.Tensor]:
+        """
+        Generate TTS audio for several texts with batched T3 sampling.
+        
+        Args:
+            texts: Texts to synthesize
+            audio_prompts: None, a single audio prompt path, or one path per text
+            exaggeration: Exaggeration parameter
+            temperature: Temperature parameter
+            cfg_weight: CFG weight parameter
+            batch_size: Maximum number of texts sampled together
+            
+        Returns:
+            List of generated audio tensors in input order
+        """
+        if self.tts_model is None:
+            raise RuntimeError("TTS model not loaded. Call load_tts_model() first.")
+        
+        return self.tts_model.generate_batch(
+            texts,
+            audio_prompt_paths=audio_prompts,
+            exaggeration=exaggeration,
+            temperature=temperature,
+            cfg_weight=cfg_weight,
+            max_batch_size=batch_size,
+            **self.flow_settings
         )
 
 
@@ -348,6 +421,9 @@ class BaseVCNode(BaseChatterBoxNode):
     Base class specifically for Voice Conversion nodes.
     """
     
+    # Held weakly so a model dropped by the residency manager is freed (reloaded on next use)
+    vc_model = WeakModelAttribute()
+    
     def __init__(self):
         super().__init__()
         self.vc_model = None
@@ -43,6 +43,7 @@ BaseChatterBoxNode = base_module.BaseChatterBoxNode
 from utils.text.chunking import ImprovedChatterBoxChunker
 from utils.audio.processing import AudioProcessingUtils
 from utils.text.pause_processor import PauseTagProcessor
+from utils.models.residency import WeakModelAttribute
 import comfy.model_management as model_management
 
 # F5-TTS specific constants
@@ -65,6 +66,9 @@ class BaseF5TTSNode(BaseChatterBoxNode):
     # Node metadata
     CATEGORY = "F5-TTS Voice"
     
+    # Held weakly so a model dropped by the residency manager is freed (reloaded on next use)
+    f5tts_model = WeakModelAttribute()
+    
     def __init__(self):
         super().__init__()
         self.f5tts_model = None
@@ -96,26 +100,28 @@ class BaseF5TTSNode(BaseChatterBoxNode):
         # Normalize model name for caching consistency
         normalized_model_name = model_name.replace("local:", "") if model_name.startswith("local:") else model_name
         
-        # Check if we need to reload (use normalized name for cache consistency)
-        if not force_reload and self.f5tts_model is not None and getattr(self, 'current_model_name', None) == normalized_model_name:
-            return self.f5tts_model
-        
         try:
             from engines.f5tts import ChatterBoxF5TTS
+            from utils.models.f5tts_manager import f5tts_model_manager
             
             # Try to find local models first
             model_paths = self._find_f5tts_models(model_name)
             
-            model_loaded = False
+            model = None
             last_error = None
             
             for source, path in model_paths:
+                # Models are kept in the shared F5-TTS model manager cache, so they are reused
+                # across nodes and counted against the VRAM budget of the residency manager
+                cache_key = f5tts_model_manager.get_f5tts_model_cache_key(normalized_model_name, device, source, path)
+                if not force_reload:
+                    model = f5tts_model_manager.get_cached_f5tts_model(cache_key)
+                    if model is not None:
+                        break
                 try:
                     if source == "comfyui" and path:
                         # Load from local ComfyUI models directory
-                        # Normalize model name (remove local: prefix if present)
-                        normalized_name = model_name.replace("local:", "") if model_name.startswith("local:") else model_name
-                        self.f5tts_model = ChatterBoxF5TTS.from_local(path, device, normalized_name)
+                        model = ChatterBoxF5TTS.from_local(path, device, normalized_model_name)
                     else:
                         # Load from HuggingFace - but check if we have local files first
                         local_path = None
@@ -127,28 +133,30 @@ class BaseF5TTSNode(BaseChatterBoxNode):
                         
                         if local_path:
                             # Use local files even for non-local model names for consistency
-                            self.f5tts_model = ChatterBoxF5TTS.from_local(local_path, device, model_name)
+                            model = ChatterBoxF5TTS.from_local(local_path, device, model_name)
                         else:
                             # True HuggingFace download
-                            self.f5tts_model = ChatterBoxF5TTS.from_pretrained(device, model_name)
+                            model = ChatterBoxF5TTS.from_pretrained(device, model_name)
                     
-                    model_loaded = True
+                    f5tts_model_manager.cache_f5tts_model(cache_key, model, source, device)
                     break
                     
                 except Exception as e:
                     print(f"⚠️ Failed to load F5-TTS model from {source}: {str(e)}")
+                    model = None
                     last_error = e
                     continue
             
-            if not model_loaded:
+            if model is None:
                 error_msg = f"Failed to load F5-TTS model '{model_name}' from any source"
                 if last_error:
                     error_msg += f". Last error: {last_error}"
                 raise RuntimeError(error_msg)
             
+            self.f5tts_model = model
             # Store normalized model name for cache validation
             self.current_model_name = normalized_model_name
-            return self.f5tts_model
+            return model
             
         except ImportError:
             raise ImportError(F5TTS_ERROR_MESSAGES["import_error"])
@@ -35,14 +35,15 @@ BaseTTSNode = base_module.BaseTTSNode
 
 from utils.system.import_manager import import_manager
 from utils.audio.processing import AudioProcessingUtils
+from utils.audio.cache import get_audio_cache
 from utils.voice.discovery import get_available_voices, load_voice_reference, get_available_characters, get_character_mapping
 from utils.text.character_parser import parse_character_text, character_parser
 from utils.text.pause_processor import PauseTagProcessor
+from utils.timing.incremental import SRTRenderManifest, render_settings_key
+from utils.timing.streaming import create_streaming_writer
 # Lazy imports for modular components (loaded when needed to avoid torch import issues during node registration)
 import comfy.model_management as model_management
 
-# Global audio cache - SAME AS ORIGINAL
-GLOBAL_AUDIO_CACHE = {}
 
 
 class ChatterboxSRTTTSNode(BaseTTSNode):
@@ -57,6 +58,7 @@ class ChatterboxSRTTTSNode(BaseTTSNode):
         self.srt_modules = {}
         self._load_srt_modules()
         self.multilingual_engine = None  # Lazy loaded
+        self._srt_render_manifest = None  # Previous render, kept for incremental_render
     
     def _load_srt_modules(self):
         """Load SRT modules using the import manager."""
@@ -75,6 +77,8 @@ class ChatterboxSRTTTSNode(BaseTTSNode):
             self.AudioTimingError = modules.get("AudioTimingError")
             self.FFmpegTimeStretcher = modules.get("FFmpegTimeStretcher")
             self.PhaseVocoderTimeStretcher = modules.get("PhaseVocoderTimeStretcher")
+            self.WSOLATimeStretcher = modules.get("WSOLATimeStretcher")
+            self.create_time_stretcher = modules.get("create_time_stretcher")
     
     @classmethod
     def INPUT_TYPES(cls):
@@ -173,6 +177,39 @@ The audio will match these exact timings.""",
                     "default": "hmm ,, {seg} hmm ,,",
                     "tooltip": "Custom padding template for short text segments to prevent ChatterBox crashes. ChatterBox has a bug where text shorter than ~21 characters causes CUDA tensor errors in sequential generation. Use {seg} as placeholder for the original text. Examples: '...ummmmm {seg}' (default hesitation), '{seg}... yes... {seg}' (repetition), 'Well, {seg}' (natural prefix), or empty string to disable padding. This only affects ChatterBox nodes, not F5-TTS nodes."
                 }),
+                "batch_size": ("INT", {
+                    "default": 1,
+                    "min": 1,
+                    "max": 32,
+                    "step": 1,
+                    "tooltip": "Number of subtitles sampled together in one batched T3 pass. 1 keeps the original one-by-one generation. Higher values speed up long SRTs on GPUs with spare VRAM but need more memory, and sampling results differ from one-by-one generation."
+                }),
+                "flow_steps": ("INT", {
+                    "default": 10,
+                    "min": 1,
+                    "max": 50,
+                    "step": 1,
+                    "tooltip": "Flow-matching steps in the S3Gen vocoder stage. 10 is the reference quality; 4-6 gives much faster draft renders."
+                }),
+                "flow_solver": (["euler", "midpoint", "heun"], {
+                    "default": "euler",
+                    "tooltip": "ODE solver for flow matching. midpoint/heun cost two model calls per step but stay closer to the reference at low step counts (e.g. 3 heun steps vs 6 euler steps)."
+                }),
+                "flow_cfg_skip_after": ("INT", {
+                    "default": -1,
+                    "min": -1,
+                    "max": 50,
+                    "step": 1,
+                    "tooltip": "Stop applying classifier-free guidance in the vocoder after this many flow steps; the remaining steps run at half the cost. -1 keeps guidance on every step (original behavior)."
+                }),
+                "incremental_render": ("BOOLEAN", {
+                    "default": False,
+                    "tooltip": "Diff the SRT against this node's previous run: only added or edited subtitle lines are generated, unchanged stretches are reused and, in smart_natural mode, the previous waveform is patched instead of rebuilt. Keeps the last render in memory. Changing any generation setting renders everything again; disable it after replacing character voice files."
+                }),
+                "output_file": ("STRING", {
+                    "default": "",
+                    "tooltip": "Stream the assembled audio to this .wav or .flac file (relative paths go to the ComfyUI output folder) instead of building the output in memory. Meant for feature-length SRTs: the assembled output is written out as it becomes final, while the generated subtitle segments are still held in memory. If the render fails or is cancelled, an existing file at that path is left untouched. A .wav output is returned memory-mapped from disk; a .flac output is smaller but is decoded back into memory for the audio output. Empty keeps the in-memory assembly."
+                }),
             }
         }
 
@@ -319,6 +356,58 @@ The audio will match these exact timings.""",
             pause_segments, tts_generate_func, self.tts_model.sr if hasattr(self, 'tts_model') and self.tts_model else 22050
         )
 
+    def _generate_simple_subtitles_batch(self, lang_subtitles: List, audio_prompt, exaggeration: float,
+                                         temperature: float, cfg_weight: float, seed: int, enable_cache: bool,
+                                         crash_protection_template: str, stable_audio_component: str,
+                                         batch_size: int) -> Dict[int, torch.Tensor]:
+        """
+        Generate the single-voice subtitles of one language group with batched T3 sampling.
+        
+        Cached subtitles are returned from the cache, uncached ones are generated together.
+        Subtitles with pause tags are skipped and left to the per-subtitle path.
+        
+        Returns:
+            Dict mapping subtitle index to its generated audio tensor
+        """
+        audio_component = stable_audio_component if stable_audio_component else (getattr(audio_prompt, 'name', str(audio_prompt)) if audio_prompt else "")
+        model_source = self.model_manager.get_model_source("tts")
+        
+        results = {}
+        pending = []  # (subtitle index, text, cache key)
+        for i, subtitle, subtitle_type, character_segments_with_lang in lang_subtitles:
+            if subtitle_type != 'simple':
+                continue
+            text = self._pad_short_text_for_chatterbox(character_segments_with_lang[0][1], crash_protection_template)
+            if PauseTagProcessor.has_pause_tags(text):
+                continue
+            
+            cache_key = None
+            if enable_cache:
+                cache_key = self._generate_segment_cache_key(
+                    f"narrator:{text}", exaggeration, temperature, cfg_weight, seed,
+                    audio_component, model_source, self.device, self.current_language
+                )
+                cached_data = self._get_cached_segment_audio(cache_key)
+                if cached_data:
+                    results[i] = cached_data[0]
+                    continue
+            pending.append((i, text, cache_key))
+        
+        if not pending:
+            return results
+        
+        self.check_interruption(f"SRT batched generation of {len(pending)} subtitle(s)")
+        print(f"⚡ SRT: Batch generating {len(pending)} subtitle(s) with batch size {batch_size}")
+        wavs = self.generate_tts_audio_batch(
+            [text for _, text, _ in pending], audio_prompt, exaggeration, temperature, cfg_weight, batch_size
+        )
+        for (i, _, cache_key), wav in zip(pending, wavs):
+            if cache_key:
+                duration = self.AudioTimingUtils.get_audio_duration(wav, self.tts_model.sr)
+                self._cache_segment_audio(cache_key, wav, duration)
+            results[i] = wav
+        return results
+
     def _generate_segment_cache_key(self, subtitle_text: str, exaggeration: float, temperature: float, 
                                    cfg_weight: float, seed: int, audio_prompt_component: str, 
                                    model_source: str, device: str, language: str = "English") -> str:
@@ -335,17 +424,20 @@ The audio will match these exact timings.""",
             'language': language,
             'engine': 'chatterbox_srt'
         }
+        flow_component = self.get_flow_cache_component()
+        if flow_component:
+            cache_data['flow'] = flow_component
         cache_string = str(sorted(cache_data.items()))
         cache_key = hashlib.md5(cache_string.encode()).hexdigest()
         return cache_key
 
     def _get_cached_segment_audio(self, segment_cache_key: str) -> Optional[Tuple[torch.Tensor, float]]:
-        """Retrieve cached audio for a single segment if available from global cache - ORIGINAL BEHAVIOR"""
-        return GLOBAL_AUDIO_CACHE.get(segment_cache_key)
+        """Retrieve cached audio for a single segment from the shared bounded audio cache."""
+        return get_audio_cache().get_cached_audio(segment_cache_key)
 
     def _cache_segment_audio(self, segment_cache_key: str, audio_tensor: torch.Tensor, natural_duration: float):
-        """Cache generated audio for a single segment in global cache - ORIGINAL BEHAVIOR"""
-        GLOBAL_AUDIO_CACHE[segment_cache_key] = (audio_tensor.clone(), natural_duration)
+        """Cache generated audio for a single segment in the shared bounded audio cache."""
+        get_audio_cache().cache_audio(segment_cache_key, audio_tensor, natural_duration)
     
     def _detect_overlaps(self, subtitles: List) -> bool:
         """Detect if subtitles have overlapping time ranges."""
@@ -360,7 +452,9 @@ The audio will match these exact timings.""",
                             timing_mode, reference_audio=None, audio_prompt_path="",
                             enable_audio_cache=True, fade_for_StretchToFit=0.01, 
                             max_stretch_ratio=2.0, min_stretch_ratio=0.5, timing_tolerance=2.0,
-                            crash_protection_template="hmm ,, {seg} hmm ,,"):
+                            crash_protection_template="hmm ,, {seg} hmm ,,", batch_size=1,
+                            flow_steps=10, flow_solver="euler", flow_cfg_skip_after=-1,
+                            incremental_render=False, output_file=""):
         
         def _process():
             # Check if SRT support is available
@@ -370,6 +464,9 @@ The audio will match these exact timings.""",
             # Set seed for reproducibility (do this before model loading)
             self.set_seed(seed)
             
+            # Flow-matching options apply to every segment generated in this run
+            self.set_flow_settings(flow_steps, flow_solver, flow_cfg_skip_after)
+            
             # Determine audio prompt component for cache key generation (stable identifier)
             # This must be done BEFORE handle_reference_audio to avoid using temporary file paths
             stable_audio_prompt_component = ""
@@ -402,6 +499,25 @@ The audio will match these exact timings.""",
                 current_timing_mode = "pad_with_silence"
                 mode_switched = True
             
+            # Incremental render: reuse the audio of subtitle lines unchanged since the previous run
+            manifest = None
+            reused_audio = {}
+            self._incremental_assembly_info = ""
+            if incremental_render:
+                generation_key = render_settings_key(
+                    language, device, exaggeration, temperature, cfg_weight, seed, stable_audio_prompt_component,
+                    crash_protection_template, batch_size, flow_steps, flow_solver, flow_cfg_skip_after
+                )
+                assembly_key = render_settings_key(
+                    current_timing_mode, fade_for_StretchToFit, max_stretch_ratio, min_stretch_ratio, timing_tolerance
+                )
+                manifest = SRTRenderManifest(generation_key, assembly_key, subtitles, [])
+                if self._srt_render_manifest is not None:
+                    reused_audio = self._srt_render_manifest.match_segments(generation_key, subtitles)
+                    manifest.carry_over(self._srt_render_manifest)
+                print(f"♻️ SRT incremental render: reusing {len(reused_audio)}/{len(subtitles)} subtitle(s) from the previous run")
+            self._srt_render_manifest = None  # Release the previous render's audio
+            
             # Set up character parser with available characters BEFORE processing subtitles
             available_chars = get_available_characters()
             character_parser.set_available_characters(list(available_chars))
@@ -416,6 +532,10 @@ The audio will match these exact timings.""",
                     # Empty subtitle - will be handled separately
                     all_subtitle_segments.append((i, subtitle, 'empty', None, None))
                     continue
+                if i in reused_audio:
+                    # Unchanged since the previous run (incremental render)
+                    all_subtitle_segments.append((i, subtitle, 'reused', None, None))
+                    continue
                 
                 # Parse character segments with language awareness
                 character_segments_with_lang = character_parser.split_by_character_with_language(subtitle.text)
@@ -457,6 +577,9 @@ The audio will match these exact timings.""",
             audio_segments = [None] * len(subtitles)  # Pre-allocate in correct order
             natural_durations = [0.0] * len(subtitles)
             any_segment_cached = False
+            for i, wav in reused_audio.items():
+                audio_segments[i] = wav
+                natural_durations[i] = self.AudioTimingUtils.get_audio_duration(wav, self.tts_model.sr)
             
             # Process each language group
             for lang_code in sorted(subtitle_language_groups.keys()):
@@ -473,6 +596,14 @@ The audio will match these exact timings.""",
                 else:
                     print(f"✅ SRT: Using {required_language} model for {len(lang_subtitles)} subtitle(s) in '{lang_code}' (already loaded)")
                 
+                # Submit the whole language group's single-voice subtitles as batched T3 calls
+                batched_audio = {}
+                if batch_size > 1:
+                    batched_audio = self._generate_simple_subtitles_batch(
+                        lang_subtitles, audio_prompt, exaggeration, temperature, cfg_weight, seed,
+                        enable_audio_cache, crash_protection_template, stable_audio_prompt_component, batch_size
+                    )
+                
                 # Process each subtitle in this language group
                 for i, subtitle, subtitle_type, character_segments_with_lang in lang_subtitles:
                     print(f"📺 Generating SRT segment {i+1}/{len(subtitles)} (Seq {subtitle.sequence}) in {lang_code}...")
@@ -513,12 +644,17 @@ The audio will match these exact timings.""",
                             cfg_weight=cfg_weight,
                             seed=seed,
                             enable_audio_cache=enable_audio_cache,
-                            crash_protection_template=crash_protection_template
+                            crash_protection_template=crash_protection_template,
+                            batch_size=batch_size
                         )
                         
                         wav = result.audio
                         natural_duration = self.AudioTimingUtils.get_audio_duration(wav, self.tts_model.sr)
                         
+                    elif i in batched_audio:
+                        wav = batched_audio[i]
+                        natural_duration = self.AudioTimingUtils.get_audio_duration(wav, self.tts_model.sr)
+                        
                     else:  # subtitle_type == 'simple'
                         # Single character mode - model already loaded for this language group
                         single_char, single_text, single_lang = character_segments_with_lang[0]
@@ -566,36 +702,54 @@ The audio will match these exact timings.""",
             for i, (adj, subtitle) in enumerate(zip(adjustments, subtitles)):
                 adj['sequence'] = subtitle.sequence
             
+            # Stream the assembled audio to output_file instead of assembling it in memory
+            writer = create_streaming_writer(output_file, self.tts_model.sr, audio_segments)
+            
             # Assemble final audio based on timing mode - ORIGINAL LOGIC
-            if current_timing_mode == "stretch_to_fit":
-                # Use time stretching to match exact timing - ORIGINAL IMPLEMENTATION
-                assembler = self.TimedAudioAssembler(self.tts_model.sr)
-                final_audio = assembler.assemble_timed_audio(
-                    audio_segments, target_timings, fade_duration=fade_for_StretchToFit
-                )
-            elif current_timing_mode == "pad_with_silence":
-                # Add silence to match timing without stretching - ORIGINAL IMPLEMENTATION
-                final_audio = self._assemble_audio_with_overlaps(audio_segments, subtitles, self.tts_model.sr)
-            elif current_timing_mode == "concatenate":
-                # Concatenate audio naturally and recalculate SRT timings using modular approach
-                from utils.timing.engine import TimingEngine
-                from utils.timing.assembly import AudioAssemblyEngine
-                
-                timing_engine = TimingEngine(self.tts_model.sr)
-                assembler = AudioAssemblyEngine(self.tts_model.sr)
-                
-                # Calculate new timings for concatenation
-                adjustments = timing_engine.calculate_concatenation_adjustments(audio_segments, subtitles)
-                
-                # Assemble audio with optional crossfading
-                final_audio = assembler.assemble_concatenation(audio_segments, fade_for_StretchToFit)
-            else:  # smart_natural
-                # Smart balanced timing: use natural audio but add minimal adjustments within tolerance - ORIGINAL IMPLEMENTATION
-                final_audio, smart_adjustments = self._assemble_with_smart_timing(
-                    audio_segments, subtitles, self.tts_model.sr, timing_tolerance,
-                    max_stretch_ratio, min_stretch_ratio
-                )
-                adjustments = smart_adjustments
+            try:
+                if current_timing_mode == "stretch_to_fit":
+                    # Use time stretching to match exact timing - ORIGINAL IMPLEMENTATION
+                    assembler = self.TimedAudioAssembler(self.tts_model.sr)
+                    final_audio = assembler.assemble_timed_audio(
+                        audio_segments, target_timings, fade_duration=fade_for_StretchToFit, writer=writer
+                    )
+                elif current_timing_mode == "pad_with_silence":
+                    # Add silence to match timing without stretching - ORIGINAL IMPLEMENTATION
+                    final_audio = self._assemble_audio_with_overlaps(audio_segments, subtitles, self.tts_model.sr, writer)
+                elif current_timing_mode == "concatenate":
+                    # Concatenate audio naturally and recalculate SRT timings using modular approach
+                    from utils.timing.engine import TimingEngine
+                    from utils.timing.assembly import AudioAssemblyEngine
+                    
+                    timing_engine = TimingEngine(self.tts_model.sr)
+                    assembler = AudioAssemblyEngine(self.tts_model.sr)
+                    
+                    # Calculate new timings for concatenation
+                    adjustments = timing_engine.calculate_concatenation_adjustments(audio_segments, subtitles)
+                    
+                    # Assemble audio with optional crossfading
+                    final_audio = assembler.assemble_concatenation(audio_segments, fade_for_StretchToFit, writer=writer)
+                else:  # smart_natural
+                    # Smart balanced timing: use natural audio but add minimal adjustments within tolerance - ORIGINAL IMPLEMENTATION
+                    final_audio, smart_adjustments = self._assemble_with_smart_timing(
+                        audio_segments, subtitles, self.tts_model.sr, timing_tolerance,
+                        max_stretch_ratio, min_stretch_ratio, manifest, writer
+                    )
+                    adjustments = smart_adjustments
+            except Exception:
+                if writer is not None:
+                    writer.abort()
+                raise
+            
+            # A streamed render is returned memory-mapped from the written file
+            streamed_output = None
+            if writer is not None:
+                streamed_output = final_audio
+                final_audio = streamed_output.load()
+            
+            if manifest is not None:
+                manifest.audio_segments = audio_segments
+                self._srt_render_manifest = manifest
             
             # Generate reports
             timing_report = self._generate_timing_report(subtitles, adjustments, current_timing_mode, has_overlaps, mode_switched, timing_mode if mode_switched else None)
@@ -613,7 +767,9 @@ The audio will match these exact timings.""",
             elif current_timing_mode == "smart_natural":
                 # Use the stored stretcher type for smart_natural mode
                 if hasattr(self, '_smart_natural_stretcher'):
-                    if self._smart_natural_stretcher == "ffmpeg":
+                    if self._smart_natural_stretcher == "wsola":
+                        stretch_info = ", Stretching method: WSOLA"
+                    elif self._smart_natural_stretcher == "ffmpeg":
                         stretch_info = ", Stretching method: FFmpeg"
                     else:
                         stretch_info = ", Stretching method: Phase Vocoder"
@@ -622,7 +778,9 @@ The audio will match these exact timings.""",
             
             # For stretch_to_fit mode, examine the actual stretcher - ORIGINAL LOGIC
             if current_timing_mode == "stretch_to_fit" and 'current_stretcher' in locals():
-                if isinstance(current_stretcher, self.FFmpegTimeStretcher):
+                if self.WSOLATimeStretcher is not None and isinstance(current_stretcher, self.WSOLATimeStretcher):
+                    stretch_info = ", Stretching method: WSOLA"
+                elif self.FFmpegTimeStretcher is not None and isinstance(current_stretcher, self.FFmpegTimeStretcher):
                     stretch_info = ", Stretching method: FFmpeg"
                 elif isinstance(current_stretcher, self.PhaseVocoderTimeStretcher):
                     stretch_info = ", Stretching method: Phase Vocoder"
@@ -635,6 +793,13 @@ The audio will match these exact timings.""",
             
             info = (f"Generated {total_duration:.1f}s SRT-timed audio from {len(subtitles)} subtitles "
                    f"using {mode_info} mode ({cache_status} segments, {model_source} models{stretch_info})")
+            if manifest is not None:
+                info += f"\nIncremental render: {len(subtitles) - len(reused_audio)}/{len(subtitles)} subtitle(s) generated"
+                if self._incremental_assembly_info:
+                    info += f", {self._incremental_assembly_info}"
+            if streamed_output is not None:
+                info += f"\nStreamed to {streamed_output.path}"
+            info += self.get_model_residency_info()
             
             # Format final audio for ComfyUI
             if final_audio.dim() == 1:
@@ -650,30 +815,41 @@ The audio will match these exact timings.""",
         return self.process_with_error_handling(_process)
     
     def _assemble_audio_with_overlaps(self, audio_segments: List[torch.Tensor],
-                                     subtitles: List, sample_rate: int) -> torch.Tensor:
+                                     subtitles: List, sample_rate: int, writer=None):
         """Assemble audio by placing segments at their SRT start times, allowing overlaps."""
         # Delegate to audio assembly engine with EXACT original logic
         from utils.timing.assembly import AudioAssemblyEngine
         assembler = AudioAssemblyEngine(sample_rate)
-        return assembler.assemble_with_overlaps(audio_segments, subtitles, self.device)
+        return assembler.assemble_with_overlaps(audio_segments, subtitles, self.device, writer=writer)
     
     def _assemble_with_smart_timing(self, audio_segments: List[torch.Tensor],
                                    subtitles: List, sample_rate: int, tolerance: float,
-                                   max_stretch_ratio: float, min_stretch_ratio: float) -> Tuple[torch.Tensor, List[Dict]]:
-        """Smart timing assembly with intelligent adjustments - ORIGINAL SMART NATURAL LOGIC"""
+                                   max_stretch_ratio: float, min_stretch_ratio: float,
+                                   manifest: Optional[SRTRenderManifest] = None, writer=None) -> Tuple[Any, List[Dict]]:
+        """
+        Smart timing assembly with intelligent adjustments - ORIGINAL SMART NATURAL LOGIC
+        
+        With an incremental render manifest, stretches of unchanged segments are reused and the
+        previous waveform is patched where only some segments moved or changed. With a streaming
+        writer the audio goes to its file (no waveform is kept for patching).
+        """
         # Initialize stretcher for smart_natural mode - ORIGINAL LOGIC FROM LINES 1524-1535
-        try:
-            # Try FFmpeg first
-            print("Smart natural mode: Trying FFmpeg stretcher...")
-            time_stretcher = self.FFmpegTimeStretcher()
-            self._smart_natural_stretcher = "ffmpeg"
-            print("Smart natural mode: Using FFmpeg stretcher")
-        except self.AudioTimingError as e:
-            # Fall back to Phase Vocoder
-            print(f"Smart natural mode: FFmpeg initialization failed ({str(e)}), falling back to Phase Vocoder")
-            time_stretcher = self.PhaseVocoderTimeStretcher()
-            self._smart_natural_stretcher = "phase_vocoder"
-            print("Smart natural mode: Using Phase Vocoder stretcher")
+        if self.create_time_stretcher is not None:
+            # WSOLA by default; CHATTERBOX_TIME_STRETCHER=ffmpeg selects the pooled FFmpeg stretcher
+            time_stretcher, self._smart_natural_stretcher = self.create_time_stretcher()
+        else:
+            try:
+                # Try FFmpeg first
+                print("Smart natural mode: Trying FFmpeg stretcher...")
+                time_stretcher = self.FFmpegTimeStretcher()
+                self._smart_natural_stretcher = "ffmpeg"
+                print("Smart natural mode: Using FFmpeg stretcher")
+            except self.AudioTimingError as e:
+                # Fall back to Phase Vocoder
+                print(f"Smart natural mode: FFmpeg initialization failed ({str(e)}), falling back to Phase Vocoder")
+                time_stretcher = self.PhaseVocoderTimeStretcher()
+                self._smart_natural_stretcher = "phase_vocoder"
+                print("Smart natural mode: Using Phase Vocoder stretcher")
         
         # Delegate to timing engine for complex calculations
         from utils.timing.engine import TimingEngine
@@ -684,11 +860,24 @@ The audio will match these exact timings.""",
         
         # Calculate smart adjustments and process segments
         adjustments, processed_segments = timing_engine.calculate_smart_timing_adjustments(
-            audio_segments, subtitles, tolerance, max_stretch_ratio, min_stretch_ratio, self.device
+            audio_segments, subtitles, tolerance, max_stretch_ratio, min_stretch_ratio, self.device,
+            stretch_cache=manifest.stretch_cache if manifest is not None else None
         )
         
         # Assemble the final audio
-        final_audio = assembler.assemble_smart_natural(audio_segments, processed_segments, adjustments, subtitles, self.device)
+        previous = (manifest.final_audio, manifest.layout) if manifest is not None and writer is None else None
+        final_audio = assembler.assemble_smart_natural(audio_segments, processed_segments, adjustments, subtitles,
+                                                       self.device, previous=previous, writer=writer)
+        
+        self._incremental_assembly_info = ""
+        if manifest is not None:
+            if writer is None:
+                manifest.final_audio, manifest.layout = final_audio, assembler.last_layout
+            else:
+                manifest.final_audio, manifest.layout = None, None
+            self._incremental_assembly_info = f"{timing_engine.restretched_count} stretched"
+            if assembler.patched_segments is not None:
+                self._incremental_assembly_info += f", waveform patched ({assembler.patched_segments} segment(s) rewritten)"
         
         return final_audio, adjustments
     
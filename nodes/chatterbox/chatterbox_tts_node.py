@@ -39,13 +39,12 @@ BaseTTSNode = base_module.BaseTTSNode
 
 from utils.text.chunking import ImprovedChatterBoxChunker
 from utils.audio.processing import AudioProcessingUtils
+from utils.audio.cache import get_audio_cache
 from utils.voice.discovery import get_available_characters, get_character_mapping
 from utils.text.pause_processor import PauseTagProcessor
 from utils.text.character_parser import parse_character_text, character_parser
 import comfy.model_management as model_management
 
-# Global audio cache for ChatterBox TTS segments
-GLOBAL_AUDIO_CACHE = {}
 
 
 class ChatterboxTTSNode(BaseTTSNode):
@@ -119,6 +118,24 @@ Back to the main narrator voice for the conclusion.""",
                     "default": True,
                     "tooltip": "If enabled, generated audio segments will be cached in memory to speed up subsequent runs with identical parameters."
                 }),
+                "flow_steps": ("INT", {
+                    "default": 10,
+                    "min": 1,
+                    "max": 50,
+                    "step": 1,
+                    "tooltip": "Flow-matching steps in the S3Gen vocoder stage. 10 is the reference quality; 4-6 gives much faster draft renders."
+                }),
+                "flow_solver": (["euler", "midpoint", "heun"], {
+                    "default": "euler",
+                    "tooltip": "ODE solver for flow matching. midpoint/heun cost two model calls per step but stay closer to the reference at low step counts (e.g. 3 heun steps vs 6 euler steps)."
+                }),
+                "flow_cfg_skip_after": ("INT", {
+                    "default": -1,
+                    "min": -1,
+                    "max": 50,
+                    "step": 1,
+                    "tooltip": "Stop applying classifier-free guidance in the vocoder after this many flow steps; the remaining steps run at half the cost. -1 keeps guidance on every step (original behavior)."
+                }),
             }
         }
 
@@ -404,17 +421,20 @@ Back to the main narrator voice for the conclusion.""",
             'character': character,
             'engine': 'chatterbox'
         }
+        flow_component = self.get_flow_cache_component()
+        if flow_component:
+            cache_data['flow'] = flow_component
         cache_string = str(sorted(cache_data.items()))
         cache_key = hashlib.md5(cache_string.encode()).hexdigest()
         return cache_key
 
     def _get_cached_segment_audio(self, segment_cache_key: str) -> Optional[Tuple[torch.Tensor, float]]:
-        """Retrieve cached audio for a single segment if available from global cache."""
-        return GLOBAL_AUDIO_CACHE.get(segment_cache_key)
+        """Retrieve cached audio for a single segment from the shared bounded audio cache."""
+        return get_audio_cache().get_cached_audio(segment_cache_key)
 
     def _cache_segment_audio(self, segment_cache_key: str, audio_tensor: torch.Tensor, natural_duration: float):
-        """Cache generated audio for a single segment in global cache."""
-        GLOBAL_AUDIO_CACHE[segment_cache_key] = (audio_tensor.clone(), natural_duration)
+        """Cache generated audio for a single segment in the shared bounded audio cache."""
+        get_audio_cache().cache_audio(segment_cache_key, audio_tensor, natural_duration)
 
     def _generate_tts_with_pause_tags(self, text: str, audio_prompt, exaggeration: float, 
                                     temperature: float, cfg_weight: float, language: str = "English",
@@ -536,7 +556,8 @@ Back to the main narrator voice for the conclusion.""",
                        reference_audio=None, audio_prompt_path="", 
                        enable_chunking=True, max_chars_per_chunk=400, 
                        chunk_combination_method="auto", silence_between_chunks_ms=100,
-                       crash_protection_template="hmm ,, {seg} hmm ,,", enable_audio_cache=True):
+                       crash_protection_template="hmm ,, {seg} hmm ,,", enable_audio_cache=True,
+                       flow_steps=10, flow_solver="euler", flow_cfg_skip_after=-1):
         
         def _process():
             # Import PauseTagProcessor at the top to avoid scoping issues
@@ -557,6 +578,9 @@ Back to the main narrator voice for the conclusion.""",
             # Set seed for reproducibility (can be done without loading model)
             self.set_seed(inputs["seed"])
             
+            # Flow-matching options apply to every segment generated in this run
+            self.set_flow_settings(flow_steps, flow_solver, flow_cfg_skip_after)
+            
             # Handle main reference audio
             main_audio_prompt = self.handle_reference_audio(
                 inputs.get("reference_audio"), inputs.get("audio_prompt_path", "")
@@ -936,6 +960,8 @@ Back to the main narrator voice for the conclusion.""",
                     model_source = self.model_manager.get_model_source("tts")
                     info = f"Generated {total_duration:.1f}s audio from {text_length} characters using {len(chunks)} chunks (avg {avg_chunk_size} chars/chunk, {model_source} models)"
             
+            info += self.get_model_residency_info()
+            
             # Return audio in ComfyUI format
             return (
                 self.format_audio_output(wav, self.tts_model.sr),
@@ -7,7 +7,7 @@ import torch
 import tempfile
 import os
 import hashlib
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 
 # Use direct file imports that work when loaded via importlib
 import os
@@ -33,8 +33,7 @@ BaseVCNode = base_module.BaseVCNode
 
 import torchaudio
 
-# Global cache for VC iterations (max 5 to avoid memory issues)
-GLOBAL_VC_ITERATION_CACHE = {}
+from utils.audio.vc_cache import fingerprint_waveform, get_vc_iteration_cache
 
 class ChatterboxVCNode(BaseVCNode):
     """
@@ -54,6 +53,11 @@ class ChatterboxVCNode(BaseVCNode):
                 "target_audio": ("AUDIO", {"tooltip": "The reference voice audio whose characteristics will be applied to the source audio"}),
                 "refinement_passes": ("INT", {"default": 1, "min": 1, "max": 30, "step": 1, "tooltip": "Number of conversion iterations. Each pass refines the output to sound more like the target. Recommended: Max 5 passes - more can cause distortions. Each iteration is deterministic to reduce degradation."}),
                 "device": (["auto", "cuda", "cpu"], {"default": "auto", "tooltip": "Processing device: 'auto' selects best available, 'cuda' for GPU acceleration, 'cpu' for compatibility"}),
+            },
+            "optional": {
+                "window_seconds": ("FLOAT", {"default": 0.0, "min": 0.0, "max": 300.0, "step": 5.0, "tooltip": "Convert sources longer than this in windows, cut at the quietest point near each boundary and crossfaded back together. Keeps memory bounded for long recordings (podcasts, audiobooks). 0 converts the whole clip in one pass (original behavior); 20-40s is a good range."}),
+                "window_overlap": ("FLOAT", {"default": 1.0, "min": 0.1, "max": 5.0, "step": 0.1, "tooltip": "Overlap in seconds between consecutive windows, crossfaded when stitching. Only used when window_seconds is set."}),
+                "window_batch_size": ("INT", {"default": 1, "min": 1, "max": 8, "step": 1, "tooltip": "Number of windows converted together in one batched pass. Faster on GPUs with spare VRAM; 1 converts windows one after another with the least memory."}),
             }
         }
 
@@ -65,11 +69,12 @@ class ChatterboxVCNode(BaseVCNode):
     def __init__(self):
         super().__init__()
 
-    def _generate_vc_cache_key(self, source_audio: Dict[str, Any], target_audio: Dict[str, Any], device: str) -> str:
+    def _generate_vc_cache_key(self, source_audio: Dict[str, Any], target_audio: Dict[str, Any], device: str,
+                               window_seconds: float = 0.0, window_overlap: float = 1.0) -> str:
         """Generate cache key for voice conversion iterations"""
-        # Create hash from source and target audio characteristics
-        source_hash = hashlib.md5(source_audio["waveform"].cpu().numpy().tobytes()).hexdigest()[:16]
-        target_hash = hashlib.md5(target_audio["waveform"].cpu().numpy().tobytes()).hexdigest()[:16]
+        # Strided content fingerprints: cheap even for hour-long clips, no full copy to the CPU
+        source_hash = fingerprint_waveform(source_audio["waveform"], source_audio["sample_rate"])
+        target_hash = fingerprint_waveform(target_audio["waveform"], target_audio["sample_rate"])
         
         cache_data = {
             'source_hash': source_hash,
@@ -79,26 +84,25 @@ class ChatterboxVCNode(BaseVCNode):
             'device': device,
             'seed_base': 42  # Include seed base in cache key for deterministic results
         }
+        if window_seconds > 0:
+            # Windowed conversion is stitched differently; batch size does not change the result
+            cache_data['window'] = (window_seconds, window_overlap)
         
         cache_string = str(sorted(cache_data.items()))
         return hashlib.md5(cache_string.encode()).hexdigest()
     
-    def _get_cached_iterations(self, cache_key: str, max_iteration: int) -> Dict[int, Dict[str, Any]]:
-        """Get cached iterations up to max_iteration"""
-        if cache_key not in GLOBAL_VC_ITERATION_CACHE:
-            return {}
-        
-        cached_data = GLOBAL_VC_ITERATION_CACHE[cache_key]
-        return {i: cached_data[i] for i in cached_data if i <= max_iteration}
+    def _get_latest_cached_iteration(self, cache_key: str, max_iteration: int) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Highest cached iteration up to max_iteration and its audio, or (0, None)"""
+        vc_cache = get_vc_iteration_cache()
+        for iteration in range(max_iteration, 0, -1):
+            cached_audio = vc_cache.get(cache_key, iteration)
+            if cached_audio is not None:
+                return iteration, cached_audio
+        return 0, None
     
     def _cache_iteration(self, cache_key: str, iteration: int, audio_result: Dict[str, Any]):
-        """Cache a single iteration result (limit to 5 iterations max)"""
-        if cache_key not in GLOBAL_VC_ITERATION_CACHE:
-            GLOBAL_VC_ITERATION_CACHE[cache_key] = {}
-        
-        # Only cache up to 5 iterations to prevent memory issues
-        if iteration <= 5:
-            GLOBAL_VC_ITERATION_CACHE[cache_key][iteration] = audio_result
+        """Cache a single iteration result (float16, under the global VC cache byte budget)"""
+        get_vc_iteration_cache().put(cache_key, iteration, audio_result)
 
     def prepare_audio_files(self, source_audio: Dict[str, Any], target_audio: Dict[str, Any]) -> tuple[str, str]:
         """
@@ -135,7 +139,8 @@ class ChatterboxVCNode(BaseVCNode):
         
         return source_temp.name, target_temp.name
 
-    def convert_voice(self, source_audio, target_audio, refinement_passes, device):
+    def convert_voice(self, source_audio, target_audio, refinement_passes, device,
+                      window_seconds=0.0, window_overlap=1.0, window_batch_size=1):
         """
         Perform iterative voice conversion using the loaded model.
         
@@ -144,6 +149,9 @@ class ChatterboxVCNode(BaseVCNode):
             target_audio: Target voice audio from ComfyUI
             refinement_passes: Number of conversion iterations
             device: Target device
+            window_seconds: Window length for long sources (0 = convert the whole clip at once)
+            window_overlap: Crossfaded overlap between windows in seconds
+            window_batch_size: Windows converted together per batched pass
             
         Returns:
             Converted audio in ComfyUI format
@@ -153,38 +161,28 @@ class ChatterboxVCNode(BaseVCNode):
             self.load_vc_model(device)
             
             # Generate cache key for this conversion
-            cache_key = self._generate_vc_cache_key(source_audio, target_audio, device)
+            cache_key = self._generate_vc_cache_key(source_audio, target_audio, device, window_seconds, window_overlap)
             
             # Check for cached iterations
-            cached_iterations = self._get_cached_iterations(cache_key, refinement_passes)
+            start_iteration, cached_audio = self._get_latest_cached_iteration(cache_key, refinement_passes)
             
             # If we have the exact number of passes cached, return it immediately
-            if refinement_passes in cached_iterations:
+            if start_iteration == refinement_passes:
                 print(f"💾 CACHE HIT: Using cached voice conversion result for {refinement_passes} passes")
-                return (cached_iterations[refinement_passes],)
-            
-            # Prepare target audio file (constant across all iterations)
-            target_temp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-            target_temp.close()
+                return (cached_audio,)
             
+            # Embed the target voice once (constant across all iterations, and kept by the model
+            # across runs with the same target); audio stays in memory, no temp files are written
             target_waveform = target_audio["waveform"]
             if target_waveform.dim() == 3:
                 target_waveform = target_waveform.squeeze(0)
-            
-            torchaudio.save(target_temp.name, target_waveform.cpu(), target_audio["sample_rate"])
-            self._temp_files.append(target_temp.name)
+            self.vc_model.set_target_voice(target_waveform, target_audio["sample_rate"])
             
             # Start from the highest cached iteration or from beginning
-            start_iteration = 0
             current_audio = source_audio
-            
-            # Find the highest cached iteration we can start from
-            for i in range(refinement_passes, 0, -1):
-                if i in cached_iterations:
-                    start_iteration = i
-                    current_audio = cached_iterations[i]
-                    print(f"💾 CACHE: Resuming from cached iteration {i}/{refinement_passes}")
-                    break
+            if cached_audio is not None:
+                current_audio = cached_audio
+                print(f"💾 CACHE: Resuming from cached iteration {start_iteration}/{refinement_passes}")
             
             try:
                 # Perform remaining voice conversion iterations
@@ -198,21 +196,17 @@ class ChatterboxVCNode(BaseVCNode):
                     
                     print(f"🔄 Voice conversion pass {iteration_num}/{refinement_passes}...")
                     
-                    # Prepare current source audio file
-                    source_temp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-                    source_temp.close()
-                    
                     source_waveform = current_audio["waveform"]
                     if source_waveform.dim() == 3:
                         source_waveform = source_waveform.squeeze(0)
                     
-                    torchaudio.save(source_temp.name, source_waveform.cpu(), current_audio["sample_rate"])
-                    self._temp_files.append(source_temp.name)
-                    
-                    # Perform voice conversion
+                    # Perform voice conversion (resampled on the model device)
                     wav = self.vc_model.generate(
-                        source_temp.name,
-                        target_voice_path=target_temp.name
+                        source_waveform,
+                        sample_rate=current_audio["sample_rate"],
+                        window_seconds=window_seconds or None,
+                        overlap_seconds=window_overlap,
+                        batch_size=window_batch_size
                     )
                     
                     # Update current_audio for next iteration
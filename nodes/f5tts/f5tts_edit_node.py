@@ -157,7 +157,8 @@ class F5TTSEditNode(BaseF5TTSNode):
     
     def _get_edit_engine(self, device: str) -> F5TTSEditEngine:
         """Get or create the F5-TTS edit engine"""
-        if self.edit_engine is None:
+        # Engines are cheap: loaded models are cached per device inside F5TTSEditEngine
+        if self.edit_engine is None or self.edit_engine.device != self.resolve_device(device):
             self.edit_engine = F5TTSEditEngine(device, self.f5tts_sample_rate)
         return self.edit_engine
     
@@ -239,6 +240,7 @@ class F5TTSEditNode(BaseF5TTSNode):
                         f"Original: '{inputs['original_text'][:80]}{'...' if len(inputs['original_text']) > 80 else ''}'\n"
                         f"Target: '{inputs['target_text'][:80]}{'...' if len(inputs['target_text']) > 80 else ''}'\n"
                         f"Audio Compositing: Enabled (preserves original quality outside edit regions)")
+            edit_info += self.get_model_residency_info()
             
             # Return audio in ComfyUI format
             return (
@@ -33,12 +33,11 @@ BaseF5TTSNode = f5tts_base_module.BaseF5TTSNode
 
 from utils.text.chunking import ImprovedChatterBoxChunker
 from utils.audio.processing import AudioProcessingUtils
+from utils.audio.cache import get_audio_cache
 from utils.voice.discovery import get_available_voices, load_voice_reference, get_available_characters, get_character_mapping
 from utils.text.character_parser import parse_character_text, character_parser
 import comfy.model_management as model_management
 
-# Global audio cache for F5-TTS segments
-GLOBAL_AUDIO_CACHE = {}
 
 
 class F5TTSNode(BaseF5TTSNode):
@@ -294,12 +293,12 @@ Back to the main narrator voice for the conclusion.""",
         return cache_key
 
     def _get_cached_segment_audio(self, segment_cache_key: str) -> Optional[Tuple[torch.Tensor, float]]:
-        """Retrieve cached audio for a single segment if available from global cache."""
-        return GLOBAL_AUDIO_CACHE.get(segment_cache_key)
+        """Retrieve cached audio for a single segment from the shared bounded audio cache."""
+        return get_audio_cache().get_cached_audio(segment_cache_key)
 
     def _cache_segment_audio(self, segment_cache_key: str, audio_tensor: torch.Tensor, natural_duration: float):
-        """Cache generated audio for a single segment in global cache."""
-        GLOBAL_AUDIO_CACHE[segment_cache_key] = (audio_tensor.clone(), natural_duration)
+        """Cache generated audio for a single segment in the shared bounded audio cache."""
+        get_audio_cache().cache_audio(segment_cache_key, audio_tensor, natural_duration)
     
     def generate_speech(self, reference_audio_file, text, device, model, seed,
                        opt_reference_audio=None, opt_reference_text="",
@@ -754,6 +753,8 @@ Back to the main narrator voice for the conclusion.""",
                     model_info = self.get_f5tts_model_info()
                     info = f"Generated {total_duration:.1f}s audio from {text_length} characters using {len(chunks)} chunks (avg {avg_chunk_size} chars/chunk, F5-TTS {model_info.get('model_name', 'unknown')})"
             
+            info += self.get_model_residency_info()
+            
             # Return audio in ComfyUI format
             return (
                 self.format_f5tts_audio_output(wav),
@@ -34,13 +34,13 @@ BaseF5TTSNode = f5tts_base_module.BaseF5TTSNode
 
 from utils.system.import_manager import import_manager
 from utils.audio.processing import AudioProcessingUtils
+from utils.audio.cache import get_audio_cache
 from utils.voice.discovery import get_available_voices, load_voice_reference, get_available_characters, get_character_mapping
 from utils.text.character_parser import parse_character_text, character_parser
+from utils.timing.streaming import create_streaming_writer
 # Lazy imports for modular components (loaded when needed to avoid torch import issues during node registration)
 import comfy.model_management as model_management
 
-# Global audio cache - SAME AS ORIGINAL
-GLOBAL_AUDIO_CACHE = {}
 
 
 class F5TTSSRTNode(BaseF5TTSNode):
@@ -73,6 +73,8 @@ class F5TTSSRTNode(BaseF5TTSNode):
             self.AudioTimingError = modules.get("AudioTimingError")
             self.FFmpegTimeStretcher = modules.get("FFmpegTimeStretcher")
             self.PhaseVocoderTimeStretcher = modules.get("PhaseVocoderTimeStretcher")
+            self.WSOLATimeStretcher = modules.get("WSOLATimeStretcher")
+            self.create_time_stretcher = modules.get("create_time_stretcher")
     
     @classmethod
     def NAME(cls):
@@ -186,6 +188,10 @@ Hello! This is F5-TTS SRT with character switching.
                     "step": 0.5,
                     "tooltip": "Maximum allowed deviation (in seconds) for timing adjustments in 'smart_natural' mode. Higher values allow more flexibility."
                 }),
+                "output_file": ("STRING", {
+                    "default": "",
+                    "tooltip": "Stream the assembled audio to this .wav or .flac file (relative paths go to the ComfyUI output folder) instead of building the output in memory. Meant for feature-length SRTs: the assembled output is written out as it becomes final, while the generated subtitle segments are still held in memory. If the render fails or is cancelled, an existing file at that path is left untouched. A .wav output is returned memory-mapped from disk; a .flac output is smaller but is decoded back into memory for the audio output. Empty keeps the in-memory assembly."
+                }),
             }
         }
 
@@ -282,12 +288,12 @@ Hello! This is F5-TTS SRT with character switching.
         return cache_key
 
     def _get_cached_segment_audio(self, segment_cache_key: str) -> Optional[Tuple[torch.Tensor, float]]:
-        """Retrieve cached audio for a single segment if available from global cache"""
-        return GLOBAL_AUDIO_CACHE.get(segment_cache_key)
+        """Retrieve cached audio for a single segment from the shared bounded audio cache."""
+        return get_audio_cache().get_cached_audio(segment_cache_key)
 
     def _cache_segment_audio(self, segment_cache_key: str, audio_tensor: torch.Tensor, natural_duration: float):
-        """Cache generated audio for a single segment in global cache"""
-        GLOBAL_AUDIO_CACHE[segment_cache_key] = (audio_tensor.clone(), natural_duration)
+        """Cache generated audio for a single segment in the shared bounded audio cache."""
+        get_audio_cache().cache_audio(segment_cache_key, audio_tensor, natural_duration)
     
     def _detect_overlaps(self, subtitles: List) -> bool:
         """Detect if subtitles have overlapping time ranges."""
@@ -302,7 +308,7 @@ Hello! This is F5-TTS SRT with character switching.
                            timing_mode, opt_reference_audio=None, temperature=0.8, speed=1.0, target_rms=0.1,
                            cross_fade_duration=0.15, nfe_step=32, cfg_strength=2.0, enable_audio_cache=True,
                            fade_for_StretchToFit=0.01, max_stretch_ratio=1.0, min_stretch_ratio=0.5,
-                           timing_tolerance=2.0):
+                           timing_tolerance=2.0, output_file=""):
         
         def _process():
             # Check if SRT support is available
@@ -426,7 +432,7 @@ Hello! This is F5-TTS SRT with character switching.
                 # Check if we need to switch models for this language group
                 required_model = get_model_for_language("f5tts", lang_code, model)
                 current_model = getattr(self, 'current_model_name', None)
-                if current_model != required_model:
+                if current_model != required_model or self.f5tts_model is None:
                     print(f"🎯 SRT: Switching to {required_model} model for {len(lang_subtitles)} subtitle(s) in '{lang_code}'")
                     self.load_f5tts_model(required_model, device)
                 else:
@@ -564,36 +570,50 @@ Hello! This is F5-TTS SRT with character switching.
             for i, (adj, subtitle) in enumerate(zip(adjustments, subtitles)):
                 adj['sequence'] = subtitle.sequence
             
+            # Stream the assembled audio to output_file instead of assembling it in memory
+            writer = create_streaming_writer(output_file, self.f5tts_sample_rate, audio_segments)
+            
             # Assemble final audio based on timing mode
-            if current_timing_mode == "stretch_to_fit":
-                # Use time stretching to match exact timing
-                assembler = self.TimedAudioAssembler(self.f5tts_sample_rate)
-                final_audio = assembler.assemble_timed_audio(
-                    audio_segments, target_timings, fade_duration=fade_for_StretchToFit
-                )
-            elif current_timing_mode == "pad_with_silence":
-                # Add silence to match timing without stretching
-                final_audio = self._assemble_audio_with_overlaps(audio_segments, subtitles, self.f5tts_sample_rate)
-            elif current_timing_mode == "concatenate":
-                # Concatenate audio naturally and recalculate SRT timings using modular approach
-                from utils.timing.engine import TimingEngine
-                from utils.timing.assembly import AudioAssemblyEngine
-                
-                timing_engine = TimingEngine(self.f5tts_sample_rate)
-                assembler = AudioAssemblyEngine(self.f5tts_sample_rate)
-                
-                # Calculate new timings for concatenation
-                adjustments = timing_engine.calculate_concatenation_adjustments(audio_segments, subtitles)
-                
-                # Assemble audio with optional crossfading
-                final_audio = assembler.assemble_concatenation(audio_segments, fade_for_StretchToFit)
-            else:  # smart_natural
-                # Smart balanced timing: use natural audio but add minimal adjustments within tolerance
-                final_audio, smart_adjustments = self._assemble_with_smart_timing(
-                    audio_segments, subtitles, self.f5tts_sample_rate, timing_tolerance,
-                    max_stretch_ratio, min_stretch_ratio
-                )
-                adjustments = smart_adjustments
+            try:
+                if current_timing_mode == "stretch_to_fit":
+                    # Use time stretching to match exact timing
+                    assembler = self.TimedAudioAssembler(self.f5tts_sample_rate)
+                    final_audio = assembler.assemble_timed_audio(
+                        audio_segments, target_timings, fade_duration=fade_for_StretchToFit, writer=writer
+                    )
+                elif current_timing_mode == "pad_with_silence":
+                    # Add silence to match timing without stretching
+                    final_audio = self._assemble_audio_with_overlaps(audio_segments, subtitles, self.f5tts_sample_rate, writer)
+                elif current_timing_mode == "concatenate":
+                    # Concatenate audio naturally and recalculate SRT timings using modular approach
+                    from utils.timing.engine import TimingEngine
+                    from utils.timing.assembly import AudioAssemblyEngine
+                    
+                    timing_engine = TimingEngine(self.f5tts_sample_rate)
+                    assembler = AudioAssemblyEngine(self.f5tts_sample_rate)
+                    
+                    # Calculate new timings for concatenation
+                    adjustments = timing_engine.calculate_concatenation_adjustments(audio_segments, subtitles)
+                    
+                    # Assemble audio with optional crossfading
+                    final_audio = assembler.assemble_concatenation(audio_segments, fade_for_StretchToFit, writer=writer)
+                else:  # smart_natural
+                    # Smart balanced timing: use natural audio but add minimal adjustments within tolerance
+                    final_audio, smart_adjustments = self._assemble_with_smart_timing(
+                        audio_segments, subtitles, self.f5tts_sample_rate, timing_tolerance,
+                        max_stretch_ratio, min_stretch_ratio, writer
+                    )
+                    adjustments = smart_adjustments
+            except Exception:
+                if writer is not None:
+                    writer.abort()
+                raise
+            
+            # A streamed render is returned memory-mapped from the written file
+            streamed_output = None
+            if writer is not None:
+                streamed_output = final_audio
+                final_audio = streamed_output.load()
             
             # Generate reports
             timing_report = self._generate_timing_report(subtitles, adjustments, current_timing_mode, has_overlaps, mode_switched, timing_mode if mode_switched else None)
@@ -610,7 +630,9 @@ Hello! This is F5-TTS SRT with character switching.
             elif current_timing_mode == "smart_natural":
                 # Use the stored stretcher type for smart_natural mode
                 if hasattr(self, '_smart_natural_stretcher'):
-                    if self._smart_natural_stretcher == "ffmpeg":
+                    if self._smart_natural_stretcher == "wsola":
+                        stretch_info = ", Stretching method: WSOLA"
+                    elif self._smart_natural_stretcher == "ffmpeg":
                         stretch_info = ", Stretching method: FFmpeg"
                     else:
                         stretch_info = ", Stretching method: Phase Vocoder"
@@ -619,7 +641,9 @@ Hello! This is F5-TTS SRT with character switching.
             
             # For stretch_to_fit mode, examine the actual stretcher
             if current_timing_mode == "stretch_to_fit" and 'current_stretcher' in locals():
-                if isinstance(current_stretcher, self.FFmpegTimeStretcher):
+                if self.WSOLATimeStretcher is not None and isinstance(current_stretcher, self.WSOLATimeStretcher):
+                    stretch_info = ", Stretching method: WSOLA"
+                elif self.FFmpegTimeStretcher is not None and isinstance(current_stretcher, self.FFmpegTimeStretcher):
                     stretch_info = ", Stretching method: FFmpeg"
                 elif isinstance(current_stretcher, self.PhaseVocoderTimeStretcher):
                     stretch_info = ", Stretching method: Phase Vocoder"
@@ -632,6 +656,9 @@ Hello! This is F5-TTS SRT with character switching.
             
             info = (f"Generated {total_duration:.1f}s F5-TTS SRT-timed audio from {len(subtitles)} subtitles "
                    f"using {mode_info} mode ({cache_status} segments, F5-TTS {model}{stretch_info})")
+            if streamed_output is not None:
+                info += f"\nStreamed to {streamed_output.path}"
+            info += self.get_model_residency_info()
             
             # Format final audio for ComfyUI
             if final_audio.dim() == 1:
@@ -647,30 +674,34 @@ Hello! This is F5-TTS SRT with character switching.
         return self.process_with_error_handling(_process)
     
     def _assemble_audio_with_overlaps(self, audio_segments: List[torch.Tensor],
-                                     subtitles: List, sample_rate: int) -> torch.Tensor:
+                                     subtitles: List, sample_rate: int, writer=None):
         """Assemble audio by placing segments at their SRT start times, allowing overlaps."""
         # Delegate to audio assembly engine with EXACT original logic
         from utils.timing.assembly import AudioAssemblyEngine
         assembler = AudioAssemblyEngine(sample_rate)
-        return assembler.assemble_with_overlaps(audio_segments, subtitles, self.device)
+        return assembler.assemble_with_overlaps(audio_segments, subtitles, self.device, writer=writer)
     
     def _assemble_with_smart_timing(self, audio_segments: List[torch.Tensor],
                                    subtitles: List, sample_rate: int, tolerance: float,
-                                   max_stretch_ratio: float, min_stretch_ratio: float) -> Tuple[torch.Tensor, List[Dict]]:
-        """Smart timing assembly with intelligent adjustments"""
+                                   max_stretch_ratio: float, min_stretch_ratio: float, writer=None) -> Tuple[Any, List[Dict]]:
+        """Smart timing assembly with intelligent adjustments (streamed to writer's file when given)"""
         # Initialize stretcher for smart_natural mode
-        try:
-            # Try FFmpeg first
-            print("F5-TTS SRT Smart natural mode: Trying FFmpeg stretcher...")
-            time_stretcher = self.FFmpegTimeStretcher()
-            self._smart_natural_stretcher = "ffmpeg"
-            print("F5-TTS SRT Smart natural mode: Using FFmpeg stretcher")
-        except self.AudioTimingError as e:
-            # Fall back to Phase Vocoder
-            print(f"F5-TTS SRT Smart natural mode: FFmpeg initialization failed ({str(e)}), falling back to Phase Vocoder")
-            time_stretcher = self.PhaseVocoderTimeStretcher()
-            self._smart_natural_stretcher = "phase_vocoder"
-            print("F5-TTS SRT Smart natural mode: Using Phase Vocoder stretcher")
+        if self.create_time_stretcher is not None:
+            # WSOLA by default; CHATTERBOX_TIME_STRETCHER=ffmpeg selects the pooled FFmpeg stretcher
+            time_stretcher, self._smart_natural_stretcher = self.create_time_stretcher()
+        else:
+            try:
+                # Try FFmpeg first
+                print("F5-TTS SRT Smart natural mode: Trying FFmpeg stretcher...")
+                time_stretcher = self.FFmpegTimeStretcher()
+                self._smart_natural_stretcher = "ffmpeg"
+                print("F5-TTS SRT Smart natural mode: Using FFmpeg stretcher")
+            except self.AudioTimingError as e:
+                # Fall back to Phase Vocoder
+                print(f"F5-TTS SRT Smart natural mode: FFmpeg initialization failed ({str(e)}), falling back to Phase Vocoder")
+                time_stretcher = self.PhaseVocoderTimeStretcher()
+                self._smart_natural_stretcher = "phase_vocoder"
+                print("F5-TTS SRT Smart natural mode: Using Phase Vocoder stretcher")
         
         # Delegate to timing engine for complex calculations
         from utils.timing.engine import TimingEngine
@@ -685,7 +716,8 @@ Hello! This is F5-TTS SRT with character switching.
         )
         
         # Assemble the final audio
-        final_audio = assembler.assemble_smart_natural(audio_segments, processed_segments, adjustments, subtitles, self.device)
+        final_audio = assembler.assemble_smart_natural(audio_segments, processed_segments, adjustments, subtitles, self.device,
+                                                       writer=writer)
         
         return final_audio, adjustments
     
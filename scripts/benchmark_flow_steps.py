@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+S3Gen Flow-Matching Quality/Speed Benchmark for ComfyUI ChatterBox Voice
+Vocodes one fixed set of T3 speech tokens with different flow-matching step counts, solvers and
+CFG-skip settings, and reports the real-time factor (vocoder time / audio duration) together with
+the mean absolute log-mel distance to the 10-step Euler reference.
+
+Usage:
+    python scripts/benchmark_flow_steps.py --ckpt-dir models/chatterbox --reference voice.wav
+    python scripts/benchmark_flow_steps.py --steps 10 6 4 --solvers euler heun --cfg-skip-after -1 2
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+
+import torch
+
+# Add project root directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.chatterbox.tts import ChatterboxTTS
+from engines.chatterbox.models.s3tokenizer import drop_invalid_tokens
+from engines.chatterbox.models.s3gen import S3GEN_SR
+
+DEFAULT_TEXT = ("Flow matching turns speech tokens into a mel spectrogram, and this sentence is long "
+                "enough to give the vocoder a few seconds of audio to chew on.")
+
+
+def synchronize(device: str):
+    if device == "cuda":
+        torch.cuda.synchronize()
+
+
+def sample_speech_tokens(model: ChatterboxTTS, text: str, seed: int) -> torch.Tensor:
+    """Run T3 once so every flow configuration vocodes identical tokens."""
+    torch.manual_seed(seed)
+    text_tokens = model._tokenize(text)
+    text_tokens = torch.cat([text_tokens, text_tokens], dim=0)
+    speech_tokens = model.t3.inference(
+        t3_cond=model.conds.t3, text_tokens=text_tokens, max_new_tokens=1000, cfg_weight=0.5,
+    )
+    return drop_invalid_tokens(speech_tokens[0]).to(model.device)
+
+
+def benchmark_config(model, speech_tokens, flow_kwargs, reference_mels, runs: int, device: str):
+    """Return (real-time factor, mel L1 distance to the reference) for one flow configuration."""
+    ref_dict = model.conds.gen
+    mels = model.s3gen.flow_inference(speech_tokens, ref_dict=ref_dict, finalize=True, **flow_kwargs)
+    mel_distance = (mels - reference_mels).abs().mean().item()
+
+    model.s3gen.inference(speech_tokens=speech_tokens, ref_dict=ref_dict, **flow_kwargs)  # warm-up
+    synchronize(device)
+    start = time.perf_counter()
+    for _ in range(runs):
+        wav, _ = model.s3gen.inference(speech_tokens=speech_tokens, ref_dict=ref_dict, **flow_kwargs)
+    synchronize(device)
+    elapsed = (time.perf_counter() - start) / runs
+    return elapsed / (wav.shape[-1] / S3GEN_SR), mel_distance
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark S3Gen flow-matching steps, solvers and CFG skipping")
+    parser.add_argument("--ckpt-dir", default=None, help="local ChatterBox model folder (default: download from the Hub)")
+    parser.add_argument("--device", default="cuda" if torch.cuda.is_available() else "cpu")
+    parser.add_argument("--reference", default=None, help="reference voice wav (default: built-in voice)")
+    parser.add_argument("--text", default=DEFAULT_TEXT)
+    parser.add_argument("--steps", type=int, nargs="+", default=[10, 8, 6, 4])
+    parser.add_argument("--solvers", nargs="+", default=["euler", "midpoint", "heun"])
+    parser.add_argument("--cfg-skip-after", type=int, nargs="+", default=[-1],
+                        help="drop CFG after this step (-1 = never)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.ckpt_dir:
+        model = ChatterboxTTS.from_local(args.ckpt_dir, args.device)
+    else:
+        model = ChatterboxTTS.from_pretrained(args.device)
+    if args.reference:
+        model.prepare_conditionals(args.reference)
+
+    with torch.inference_mode():
+        speech_tokens = sample_speech_tokens(model, args.text, args.seed)
+        reference_mels = model.s3gen.flow_inference(speech_tokens, ref_dict=model.conds.gen, finalize=True)
+        print(f"\n{speech_tokens.numel()} speech tokens, device: {args.device}, {args.runs} runs per config")
+        print(f"{'steps':>5} {'solver':>9} {'cfg skip':>8} {'RTF':>8} {'mel L1':>8}")
+
+        for steps, solver, cfg_skip_after in itertools.product(args.steps, args.solvers, args.cfg_skip_after):
+            flow_kwargs = dict(
+                n_timesteps=steps, solver=solver,
+                cfg_skip_after=cfg_skip_after if cfg_skip_after >= 0 else None,
+            )
+            rtf, mel_distance = benchmark_config(model, speech_tokens, flow_kwargs, reference_mels, args.runs, args.device)
+            skip_label = "never" if cfg_skip_after < 0 else str(cfg_skip_after)
+            print(f"{steps:>5} {solver:>9} {skip_label:>8} {rtf:>8.3f} {mel_distance:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+T3 Decode Benchmark for ComfyUI ChatterBox Voice
+Measures speech-token throughput of the standard T3 decode loop against the opt-in fast decode
+mode (static KV cache, compiled step on CUDA). Uses randomly initialized weights, so only speed
+is meaningful - run with --tiny for a quick CPU check.
+
+Usage:
+    python scripts/benchmark_t3_decode.py --device cuda --tokens 500
+    python scripts/benchmark_t3_decode.py --device cpu --tiny --tokens 200
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import torch
+
+# Add project root directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.chatterbox.models.t3 import llama_configs
+from engines.chatterbox.models.t3.t3 import T3
+from engines.chatterbox.models.t3.modules.t3_config import T3Config
+from engines.chatterbox.models.t3.modules.cond_enc import T3Cond
+
+
+def build_model(tiny: bool, device: str) -> T3:
+    """Build a randomly initialized T3 (full 520M config, or a tiny one for CPU runs)."""
+    if tiny:
+        llama_configs.LLAMA_CONFIGS["Llama_tiny_benchmark"] = dict(
+            llama_configs.LLAMA_CONFIGS["Llama_520M"],
+            hidden_size=256, intermediate_size=1024, num_hidden_layers=12,
+            num_attention_heads=4, num_key_value_heads=4, head_dim=64,
+        )
+        hp = T3Config(llama_config_name="Llama_tiny_benchmark", use_perceiver_resampler=False)
+    else:
+        hp = T3Config()
+    return T3(hp).to(device).eval()
+
+
+def make_inputs(model: T3, text_len: int, device: str):
+    """Random conditioning and text tokens shaped like ChatterboxTTS.generate inputs."""
+    hp = model.hp
+    t3_cond = T3Cond(
+        speaker_emb=torch.randn(1, hp.speaker_embed_size, device=device),
+        cond_prompt_speech_tokens=torch.randint(0, 6561, (1, hp.speech_cond_prompt_len), device=device),
+        emotion_adv=0.5 * torch.ones(1, 1, 1, device=device),
+    )
+    text = torch.randint(1, hp.start_text_token, (text_len,), device=device)
+    text = torch.cat([torch.tensor([hp.start_text_token], device=device), text,
+                      torch.tensor([hp.stop_text_token], device=device)])
+    return t3_cond, torch.stack([text, text])
+
+
+def run(model: T3, t3_cond, text_tokens, max_new_tokens: int, fast_decode: bool, device: str) -> float:
+    """Decode once and return tokens per second."""
+    torch.manual_seed(0)
+    if device == "cuda":
+        torch.cuda.synchronize()
+    start = time.perf_counter()
+    tokens = model.inference(
+        t3_cond=t3_cond, text_tokens=text_tokens, max_new_tokens=max_new_tokens,
+        cfg_weight=0.5, fast_decode=fast_decode,
+    )
+    if device == "cuda":
+        torch.cuda.synchronize()
+    elapsed = time.perf_counter() - start
+    return tokens.size(-1) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark T3 standard vs fast decode")
+    parser.add_argument("--device", default="cuda" if torch.cuda.is_available() else "cpu")
+    parser.add_argument("--tokens", type=int, default=300, help="max new speech tokens per run")
+    parser.add_argument("--text-len", type=int, default=60, help="number of text tokens")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--tiny", action="store_true", help="use a small random model (CPU friendly)")
+    args = parser.parse_args()
+
+    model = build_model(args.tiny, args.device)
+    t3_cond, text_tokens = make_inputs(model, args.text_len, args.device)
+
+    results = {}
+    for fast_decode in (False, True):
+        # Warm-up (includes torch.compile / CUDA graph capture for the fast mode)
+        run(model, t3_cond, text_tokens, min(args.tokens, 32), fast_decode, args.device)
+        speeds = [run(model, t3_cond, text_tokens, args.tokens, fast_decode, args.device) for _ in range(args.runs)]
+        results[fast_decode] = sum(speeds) / len(speeds)
+
+    print(f"\nDevice: {args.device}, model: {'tiny' if args.tiny else 'Llama_520M'}, {args.tokens} tokens x {args.runs} runs")
+    print(f"  standard decode: {results[False]:8.1f} tokens/sec")
+    print(f"  fast decode:     {results[True]:8.1f} tokens/sec ({results[True] / results[False]:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Time-Stretch Quality/Speed Benchmark for ComfyUI ChatterBox Voice
+Stretches a set of speech-like segments with the in-process WSOLA stretcher (fast and quality modes)
+and, when FFmpeg is installed, with the atempo-based FFmpegTimeStretcher (temp files, one process per
+channel) and PooledFFmpegTimeStretcher (pipes, concurrent processes). Reports wall time, output
+duration error and the mean absolute STFT log-magnitude distance of each WSOLA mode to atempo.
+
+Usage:
+    python scripts/benchmark_time_stretch.py
+    python scripts/benchmark_time_stretch.py --audio voice.wav --factors 0.8 1.25 --segments 16
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import torch
+
+# Add project root directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.chatterbox.audio_timing import (
+    WSOLATimeStretcher, FFmpegTimeStretcher, PooledFFmpegTimeStretcher, AudioTimingError
+)
+
+
+def synthetic_speech(duration: float, sample_rate: int, seed: int) -> torch.Tensor:
+    """Harmonic tone with a wandering pitch and syllable-rate amplitude envelope."""
+    generator = torch.Generator().manual_seed(seed)
+    t = torch.arange(int(duration * sample_rate)) / sample_rate
+    f0 = 140 + 40 * torch.sin(2 * torch.pi * 0.7 * t + torch.rand(1, generator=generator).item() * 6.28)
+    phase = 2 * torch.pi * torch.cumsum(f0, 0) / sample_rate
+    audio = sum(torch.sin(k * phase) / k for k in range(1, 8))
+    envelope = 0.5 * (1 + torch.sin(2 * torch.pi * 4 * t)).clamp(min=0.05)
+    return (0.3 * audio * envelope).float()
+
+
+def log_magnitude(audio: torch.Tensor, n_fft: int = 1024) -> torch.Tensor:
+    window = torch.hann_window(n_fft)
+    spec = torch.stft(audio.reshape(-1, audio.shape[-1]), n_fft, n_fft // 4, window=window, return_complex=True)
+    return torch.log(spec.abs() + 1e-5)
+
+
+def spectral_distance(a: torch.Tensor, b: torch.Tensor) -> float:
+    length = min(a.shape[-1], b.shape[-1])
+    return (log_magnitude(a[..., :length]) - log_magnitude(b[..., :length])).abs().mean().item()
+
+
+def run_stretcher(stretcher, segments, factors, sample_rate):
+    start = time.perf_counter()
+    if hasattr(stretcher, "time_stretch_batch"):
+        outputs = stretcher.time_stretch_batch(segments, factors, sample_rate)
+    else:
+        outputs = [stretcher.time_stretch(s, f, sample_rate) for s, f in zip(segments, factors)]
+    return outputs, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WSOLA time stretching against FFmpeg atempo")
+    parser.add_argument("--audio", default=None, help="wav file to stretch (default: synthetic speech)")
+    parser.add_argument("--sample-rate", type=int, default=24000)
+    parser.add_argument("--segments", type=int, default=8, help="number of segments per factor")
+    parser.add_argument("--duration", type=float, default=4.0, help="segment duration in seconds")
+    parser.add_argument("--factors", type=float, nargs="+", default=[0.7, 0.9, 1.1, 1.5])
+    args = parser.parse_args()
+
+    sample_rate = args.sample_rate
+    if args.audio:
+        import torchaudio
+        audio, sample_rate = torchaudio.load(args.audio)
+        seg_len = int(args.duration * sample_rate)
+        segments = [audio[:, i * seg_len:(i + 1) * seg_len] for i in range(args.segments)]
+        segments = [s for s in segments if s.shape[-1] > 0]
+    else:
+        segments = [synthetic_speech(args.duration, sample_rate, seed) for seed in range(args.segments)]
+
+    stretchers = {
+        "wsola-fast": WSOLATimeStretcher(quality="fast"),
+        "wsola-quality": WSOLATimeStretcher(quality="quality"),
+    }
+    try:
+        stretchers["ffmpeg-atempo"] = FFmpegTimeStretcher()
+        stretchers["ffmpeg-pooled"] = PooledFFmpegTimeStretcher()
+    except AudioTimingError as e:
+        print(f"⚠️ FFmpeg not available ({e}), skipping the atempo reference")
+
+    print(f"\n{len(segments)} segments x {args.duration:.1f}s at {sample_rate} Hz")
+    print(f"{'factor':>6} {'stretcher':>14} {'time (s)':>9} {'len err':>8} {'dist to atempo':>15}")
+    for factor in args.factors:
+        factors = [factor] * len(segments)
+        results = {name: run_stretcher(s, segments, factors, sample_rate) for name, s in stretchers.items()}
+        reference = results.get("ffmpeg-atempo", (None, None))[0]
+        for name, (outputs, elapsed) in results.items():
+            length_error = max(abs(o.shape[-1] - round(s.shape[-1] * factor)) for o, s in zip(outputs, segments))
+            if reference is not None and not name.startswith("ffmpeg"):
+                distance = sum(spectral_distance(o, r) for o, r in zip(outputs, reference)) / len(outputs)
+                distance_label = f"{distance:.4f}"
+            else:
+                distance_label = "-"
+            print(f"{factor:>6.2f} {name:>14} {elapsed:>9.3f} {length_error:>8d} {distance_label:>15}")
+
+
+if __name__ == "__main__":
+    main()
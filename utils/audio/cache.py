@@ -4,13 +4,21 @@ Provides centralized cache management with engine-specific cache key generation
 """
 
 import hashlib
+import threading
 import torch
+from collections import OrderedDict
 from typing import Dict, Any, Optional, Tuple, Callable
 from abc import ABC, abstractmethod
 
+from utils.audio.disk_cache import DiskAudioCache, disk_cache_enabled
 
-# Global audio cache shared across all engines
-GLOBAL_AUDIO_CACHE = {}
+
+# Default memory budget for cached audio segments (bytes)
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+# Global audio cache shared across all engines, ordered from least to most recently used.
+# Only AudioCache should touch this dict directly.
+GLOBAL_AUDIO_CACHE = OrderedDict()
 
 
 class CacheKeyGenerator(ABC):
@@ -65,18 +73,36 @@ class ChatterBoxCacheKeyGenerator(CacheKeyGenerator):
             'character': params.get('character', 'narrator'),
             'engine': 'chatterbox'
         }
+        # Non-default flow solver settings (BaseTTSNode.get_flow_cache_component); "" keeps old keys valid
+        if params.get('flow'):
+            cache_data['flow'] = params['flow']
         cache_string = str(sorted(cache_data.items()))
         return hashlib.md5(cache_string.encode()).hexdigest()
 
 
 class AudioCache:
-    """Unified audio cache manager for all TTS engines."""
+    """
+    Unified audio cache manager for all TTS engines.
+    
+    Entries are kept in least-recently-used order and evicted once the total
+    size of the cached tensors exceeds the configured byte budget. When a disk
+    tier is attached, memory misses fall back to it and new segments are
+    persisted so they survive restarts and are shared between workers.
+    """
     
-    def __init__(self):
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
         self.cache_key_generators = {
             'f5tts': F5TTSCacheKeyGenerator(),
             'chatterbox': ChatterBoxCacheKeyGenerator()
         }
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._entry_sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_cache: Optional[DiskAudioCache] = None
     
     def register_cache_key_generator(self, engine_type: str, generator: CacheKeyGenerator):
         """Register a cache key generator for a specific engine."""
@@ -91,12 +117,83 @@ class AudioCache:
         return generator.generate_cache_key(**params)
     
     def get_cached_audio(self, cache_key: str) -> Optional[Tuple[torch.Tensor, float]]:
-        """Retrieve cached audio by cache key."""
-        return GLOBAL_AUDIO_CACHE.get(cache_key)
+        """Retrieve cached audio by cache key and mark it as most recently used."""
+        with self._lock:
+            cached_data = GLOBAL_AUDIO_CACHE.get(cache_key)
+            if cached_data is not None:
+                GLOBAL_AUDIO_CACHE.move_to_end(cache_key)
+                self.hits += 1
+                return cached_data
+        
+        if self.disk_cache is not None:
+            cached_data = self.disk_cache.get_cached_audio(cache_key)
+            if cached_data is not None:
+                # Promote to memory without writing it back to disk
+                self._store_in_memory(cache_key, cached_data[0], cached_data[1])
+                with self._lock:
+                    self.hits += 1
+                return cached_data
+        
+        with self._lock:
+            self.misses += 1
+        return None
     
     def cache_audio(self, cache_key: str, audio_tensor: torch.Tensor, duration: float):
-        """Cache audio tensor with duration."""
-        GLOBAL_AUDIO_CACHE[cache_key] = (audio_tensor.clone(), duration)
+        """Cache audio tensor with duration, evicting old entries to stay within budget."""
+        self._store_in_memory(cache_key, audio_tensor, duration)
+        if self.disk_cache is not None:
+            self.disk_cache.cache_audio(cache_key, audio_tensor, duration)
+    
+    def _store_in_memory(self, cache_key: str, audio_tensor: torch.Tensor, duration: float):
+        """Insert an entry into the in-memory LRU tier."""
+        entry_size = self._entry_size(audio_tensor)
+        if self.max_bytes is not None and entry_size > self.max_bytes:
+            # Larger than the whole budget - caching it would just flush everything else
+            return
+        
+        with self._lock:
+            self._remove_entry(cache_key)
+            GLOBAL_AUDIO_CACHE[cache_key] = (audio_tensor.clone(), duration)
+            self._entry_sizes[cache_key] = entry_size
+            self._total_bytes += entry_size
+            self._evict_to_budget()
+    
+    def set_max_bytes(self, max_bytes: Optional[int]):
+        """Change the memory budget (None disables the limit) and evict if needed."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict_to_budget()
+    
+    def enable_disk_cache(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        """Attach a persistent disk tier (default location under ComfyUI models/TTS/audio_cache)."""
+        kwargs = {} if max_bytes is None else {'max_bytes': max_bytes}
+        with self._lock:
+            self.disk_cache = DiskAudioCache(cache_dir, **kwargs)
+    
+    def disable_disk_cache(self):
+        """Detach the disk tier. Persisted entries are left in place."""
+        with self._lock:
+            self.disk_cache = None
+    
+    @staticmethod
+    def _entry_size(audio_tensor: torch.Tensor) -> int:
+        """Size accounting for one entry: tensor storage plus the duration float."""
+        return audio_tensor.numel() * audio_tensor.element_size() + 8
+    
+    def _remove_entry(self, cache_key: str):
+        """Drop an entry and its size accounting. Caller must hold the lock."""
+        if cache_key in GLOBAL_AUDIO_CACHE:
+            del GLOBAL_AUDIO_CACHE[cache_key]
+            self._total_bytes -= self._entry_sizes.pop(cache_key, 0)
+    
+    def _evict_to_budget(self):
+        """Evict least recently used entries until under budget. Caller must hold the lock."""
+        if self.max_bytes is None:
+            return
+        while self._total_bytes > self.max_bytes and GLOBAL_AUDIO_CACHE:
+            oldest_key = next(iter(GLOBAL_AUDIO_CACHE))
+            self._remove_entry(oldest_key)
+            self.evictions += 1
     
     def create_cache_function(self, engine_type: str, **static_params) -> Callable:
         """
@@ -149,28 +246,45 @@ class AudioCache:
         sample_rate = 24000 if engine_type == 'f5tts' else 44100
         return num_samples / sample_rate
     
-    def clear_cache(self):
-        """Clear all cached audio."""
-        global GLOBAL_AUDIO_CACHE
-        GLOBAL_AUDIO_CACHE.clear()
+    def clear_cache(self, include_disk: bool = False):
+        """Clear all cached audio, optionally including the persistent disk tier."""
+        if include_disk and self.disk_cache is not None:
+            self.disk_cache.clear_cache()
+        with self._lock:
+            GLOBAL_AUDIO_CACHE.clear()
+            self._entry_sizes.clear()
+            self._total_bytes = 0
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        total_items = len(GLOBAL_AUDIO_CACHE)
-        total_memory = sum(
-            audio.numel() * audio.element_size() + 8  # 8 bytes for duration float
-            for audio, _ in GLOBAL_AUDIO_CACHE.values()
-        )
+        with self._lock:
+            total_items = len(GLOBAL_AUDIO_CACHE)
+            total_memory = self._total_bytes
+            lookups = self.hits + self.misses
+            
+            stats = {
+                'total_items': total_items,
+                'total_memory_bytes': total_memory,
+                'total_memory_mb': total_memory / (1024 * 1024),
+                'max_memory_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
         
-        return {
-            'total_items': total_items,
-            'total_memory_bytes': total_memory,
-            'total_memory_mb': total_memory / (1024 * 1024)
-        }
+        if self.disk_cache is not None:
+            stats['disk'] = self.disk_cache.get_cache_stats()
+        return stats
 
 
-# Global cache instance
+# Global cache instance (the disk tier is opt-in, see CHATTERBOX_DISK_CACHE)
 audio_cache = AudioCache()
+if disk_cache_enabled():
+    try:
+        audio_cache.enable_disk_cache()
+    except OSError as e:
+        print(f"⚠️ Disk audio cache unavailable, using memory cache only: {e}")
 
 
 def get_audio_cache() -> AudioCache:
@@ -0,0 +1,292 @@
+"""
+Disk Audio Cache Module - Persistent segment cache shared across restarts and workers
+Stores generated segments as float16 entry files keyed by the engine cache key digests
+"""
+
+import os
+import mmap
+import struct
+import tempfile
+import threading
+import numpy as np
+import torch
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import folder_paths
+except ImportError:
+    folder_paths = None
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# Set to 1 to persist cached segments on disk (under ComfyUI models/TTS); off by default
+DISK_CACHE_ENV = "CHATTERBOX_DISK_CACHE"
+# Default on-disk budget for persisted audio segments (bytes)
+DEFAULT_DISK_CACHE_MAX_BYTES = 8 * 1024 * 1024 * 1024
+
+# Entry file layout: header, int64 shape, float16 samples
+ENTRY_MAGIC = b"TTSA"
+ENTRY_VERSION = 1
+ENTRY_HEADER = struct.Struct("<4sBBxxd")  # magic, version, ndim, padding, duration
+
+# Index file layout: fixed-width append-only records so it can be scanned through mmap
+INDEX_RECORD = struct.Struct("<32sdQ")  # key digest, duration, entry bytes
+
+
+def disk_cache_enabled() -> bool:
+    """Whether the global caches attach their disk tiers at import (CHATTERBOX_DISK_CACHE)."""
+    return os.environ.get(DISK_CACHE_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class DiskAudioCache:
+    """
+    Persistent audio segment cache.
+
+    Each segment lives in its own entry file named after the cache key, written to a
+    temporary file and atomically renamed into place. An append-only index of
+    fixed-width records tracks durations and sizes for budgeting; every index
+    mutation is serialized with a lock file so several worker processes can share
+    the same directory. Records superseded by a later one for the same key are
+    compacted away when the cache is opened and after writes.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_DISK_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir or self._get_default_cache_dir()
+        self.max_bytes = max_bytes
+        self.entries_dir = os.path.join(self.cache_dir, "entries")
+        self.index_path = os.path.join(self.cache_dir, "index.bin")
+        self.lock_path = os.path.join(self.cache_dir, "index.lock")
+        self._thread_lock = threading.RLock()
+        self._index: Dict[str, Tuple[float, int]] = {}
+        self._index_offset = 0
+        self._index_records = 0  # records in the index file, duplicates included
+        self._index_id = None
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        os.makedirs(self.entries_dir, exist_ok=True)
+        with self._process_lock():
+            self._sync_index()
+            self._compact_locked()
+
+    @staticmethod
+    def _get_default_cache_dir() -> str:
+        """Get the persistent cache directory (ComfyUI temp is wiped on startup, so use models/)."""
+        if folder_paths is not None:
+            return os.path.join(folder_paths.models_dir, "TTS", "audio_cache")
+        return os.path.join(tempfile.gettempdir(), "chatterbox_srt_voice", "audio_cache")
+
+    def _entry_path(self, cache_key: str) -> str:
+        """Entry files are sharded by the first two hex digits to keep directories small."""
+        return os.path.join(self.entries_dir, cache_key[:2], f"{cache_key}.tts")
+
+    @contextmanager
+    def _process_lock(self):
+        """Exclusive cross-process lock guarding index mutations."""
+        with self._thread_lock:
+            with open(self.lock_path, "a+b") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                    else:
+                        lock_file.seek(0)
+                        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _sync_index(self):
+        """Read index records appended since the last sync (by this or other processes)."""
+        try:
+            index_stat = os.stat(self.index_path)
+            index_size, index_id = index_stat.st_size, index_stat.st_ino
+        except OSError:
+            index_size, index_id = 0, None
+
+        if index_id != self._index_id or index_size < self._index_offset:
+            # Index was compacted (replaced) by another process - reload from scratch
+            self._index_id = index_id
+            self._index.clear()
+            self._index_offset = 0
+            self._index_records = 0
+            self._total_bytes = 0
+
+        usable_size = index_size - (index_size % INDEX_RECORD.size)
+        if usable_size <= self._index_offset:
+            return
+
+        with open(self.index_path, "rb") as index_file:
+            with mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ) as index_map:
+                for offset in range(self._index_offset, usable_size, INDEX_RECORD.size):
+                    raw_key, duration, nbytes = INDEX_RECORD.unpack_from(index_map, offset)
+                    cache_key = raw_key.decode("ascii")
+                    previous = self._index.get(cache_key)
+                    if previous is not None:
+                        self._total_bytes -= previous[1]
+                    self._index[cache_key] = (duration, nbytes)
+                    self._total_bytes += nbytes
+        self._index_records += (usable_size - self._index_offset) // INDEX_RECORD.size
+        self._index_offset = usable_size
+
+    def contains(self, cache_key: str) -> bool:
+        """Whether an entry is on disk (it may since have been pruned to stay within budget)."""
+        return os.path.exists(self._entry_path(cache_key))
+
+    def get_cached_audio(self, cache_key: str) -> Optional[Tuple[torch.Tensor, float]]:
+        """Load a cached segment from disk as a float32 CPU tensor."""
+        entry_path = self._entry_path(cache_key)
+        try:
+            with open(entry_path, "rb") as entry_file:
+                header = entry_file.read(ENTRY_HEADER.size)
+                magic, version, ndim, duration = ENTRY_HEADER.unpack(header)
+                if magic != ENTRY_MAGIC or version != ENTRY_VERSION:
+                    raise ValueError(f"unsupported cache entry format in {entry_path}")
+                shape = tuple(np.frombuffer(entry_file.read(8 * ndim), dtype="<i8"))
+            data_offset = ENTRY_HEADER.size + 8 * ndim
+            samples = np.memmap(entry_path, dtype="<f2", mode="r", offset=data_offset, shape=shape)
+            audio = torch.from_numpy(samples.astype(np.float32))
+            del samples  # Release the mapping so the file can be replaced or pruned
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, struct.error) as e:
+            print(f"⚠️ Disk audio cache: ignoring unreadable entry {cache_key}: {e}")
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(entry_path)  # Mark as recently used for pruning
+        except OSError:
+            pass
+        self.hits += 1
+        return audio, duration
+
+    def cache_audio(self, cache_key: str, audio_tensor: torch.Tensor, duration: float):
+        """Persist a segment atomically and record it in the index."""
+        if len(cache_key) != 32:
+            return  # Index records hold MD5 hex digests only
+        samples = audio_tensor.detach().to("cpu", torch.float16).contiguous().numpy()
+        header = ENTRY_HEADER.pack(ENTRY_MAGIC, ENTRY_VERSION, samples.ndim, float(duration))
+        shape = np.asarray(samples.shape, dtype="<i8").tobytes()
+        nbytes = len(header) + len(shape) + samples.nbytes
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return
+
+        entry_path = self._entry_path(cache_key)
+        entry_dir = os.path.dirname(entry_path)
+        try:
+            os.makedirs(entry_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=entry_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as tmp_file:
+                    tmp_file.write(header)
+                    tmp_file.write(shape)
+                    tmp_file.write(samples.astype("<f2", copy=False).tobytes())
+                os.replace(tmp_path, entry_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+            with self._process_lock():
+                self._sync_index()
+                if self._index.get(cache_key) != (float(duration), nbytes):
+                    # Re-storing an unchanged entry only replaces its file, the record stays valid
+                    with open(self.index_path, "ab") as index_file:
+                        index_file.write(INDEX_RECORD.pack(cache_key.encode("ascii"), float(duration), nbytes))
+                    self._sync_index()
+                self.writes += 1
+                if self.max_bytes is not None and self._total_bytes > self.max_bytes:
+                    self._prune_locked()
+                else:
+                    self._compact_locked()
+        except OSError as e:
+            print(f"⚠️ Disk audio cache: failed to persist segment {cache_key}: {e}")
+
+    def prune(self):
+        """Evict least recently used entries until the cache fits its budget."""
+        with self._process_lock():
+            self._sync_index()
+            self._prune_locked()
+
+    def _prune_locked(self):
+        """Prune and compact the index. Caller must hold the process lock."""
+        target_bytes = self.max_bytes if self.max_bytes is not None else float("inf")
+        live_entries = []
+        for cache_key, (duration, nbytes) in self._index.items():
+            try:
+                last_used = os.path.getmtime(self._entry_path(cache_key))
+            except OSError:
+                continue  # Entry already removed
+            live_entries.append((last_used, cache_key, duration, nbytes))
+
+        live_entries.sort()
+        total_bytes = sum(entry[3] for entry in live_entries)
+        while live_entries and total_bytes > target_bytes:
+            _, cache_key, _, nbytes = live_entries.pop(0)
+            try:
+                os.remove(self._entry_path(cache_key))
+            except OSError:
+                pass
+            total_bytes -= nbytes
+            self.evictions += 1
+
+        self._rewrite_index([(key, duration, nbytes) for _, key, duration, nbytes in live_entries])
+
+    def _compact_locked(self):
+        """Rewrite the index without superseded records, if it has any. Caller must hold the process lock."""
+        if self._index_records > len(self._index):
+            self._rewrite_index([(key, duration, nbytes) for key, (duration, nbytes) in self._index.items()])
+
+    def _rewrite_index(self, records):
+        """Atomically replace the index with the given records. Caller must hold the process lock."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as tmp_file:
+            for cache_key, duration, nbytes in records:
+                tmp_file.write(INDEX_RECORD.pack(cache_key.encode("ascii"), duration, nbytes))
+        os.replace(tmp_path, self.index_path)
+
+        self._index_id = os.stat(self.index_path).st_ino
+        self._index = {cache_key: (duration, nbytes) for cache_key, duration, nbytes in records}
+        self._total_bytes = sum(nbytes for _, _, nbytes in records)
+        self._index_offset = len(records) * INDEX_RECORD.size
+        self._index_records = len(records)
+
+    def clear_cache(self):
+        """Delete every persisted segment."""
+        with self._process_lock():
+            self._sync_index()
+            for cache_key in list(self._index):
+                try:
+                    os.remove(self._entry_path(cache_key))
+                except OSError:
+                    pass
+            self._rewrite_index([])
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get disk cache statistics."""
+        with self._thread_lock:
+            self._sync_index()
+            return {
+                'cache_dir': self.cache_dir,
+                'total_items': len(self._index),
+                'total_disk_bytes': self._total_bytes,
+                'total_disk_mb': self._total_bytes / (1024 * 1024),
+                'max_disk_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'writes': self.writes,
+                'evictions': self.evictions
+            }
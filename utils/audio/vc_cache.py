@@ -0,0 +1,211 @@
+"""
+Voice Conversion Cache Module - Bounded cache for multi-pass voice conversion results
+Pass outputs are stored as float16 under a global byte budget and spill to a disk tier when evicted
+"""
+
+import hashlib
+import os
+import threading
+import torch
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+from utils.audio.disk_cache import DiskAudioCache, disk_cache_enabled
+
+
+# Default memory budget for cached VC pass outputs (bytes, float16 storage)
+DEFAULT_VC_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+# Default on-disk budget for spilled VC pass outputs (bytes)
+DEFAULT_VC_DISK_CACHE_MAX_BYTES = 4 * 1024 * 1024 * 1024
+
+# Strided fingerprint: this many chunks of this many samples, spread evenly over the waveform
+FINGERPRINT_CHUNKS = 64
+FINGERPRINT_CHUNK_SAMPLES = 2048
+
+
+def fingerprint_waveform(waveform: torch.Tensor, sample_rate: int) -> str:
+    """
+    Fast content hash of a waveform for cache keys.
+
+    Hashes (blake2b) the shape, dtype and sample rate, a float64 sum of all samples computed
+    where the tensor lives, and FINGERPRINT_CHUNKS evenly strided chunks of raw samples. Only
+    the chunks are copied to the CPU, so hour-long clips cost about as much as short ones.
+    """
+    flat = waveform.detach().reshape(-1)
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(repr((tuple(waveform.shape), str(waveform.dtype), int(sample_rate))).encode())
+    sum_dtype = torch.float32 if flat.device.type == "mps" else torch.float64  # MPS has no float64
+    hasher.update(repr(torch.sum(flat, dtype=sum_dtype).item()).encode())
+
+    chunk = FINGERPRINT_CHUNK_SAMPLES
+    if flat.numel() <= FINGERPRINT_CHUNKS * chunk:
+        sampled = flat
+    else:
+        starts = torch.linspace(0, flat.numel() - chunk, FINGERPRINT_CHUNKS, device=flat.device).long()
+        sampled = flat[(starts[:, None] + torch.arange(chunk, device=flat.device)).reshape(-1)]
+    hasher.update(sampled.cpu().contiguous().numpy().tobytes())
+    return hasher.hexdigest()
+
+
+class VCIterationCache:
+    """
+    LRU cache of voice conversion pass outputs, keyed by (conversion key, pass number).
+
+    Waveforms are kept as float16 CPU tensors and counted against a byte budget shared by
+    all conversions. Entries evicted from memory spill to an optional disk tier (float16
+    entry files with their own budget, see DiskAudioCache), from which later lookups reload them.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = DEFAULT_VC_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[torch.Tensor, int]]" = OrderedDict()  # LRU first
+        self._entry_sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self.disk_cache: Optional[DiskAudioCache] = None
+        self.hits = 0
+        self.misses = 0
+        self.spills = 0
+
+    @staticmethod
+    def entry_key(conversion_key: str, iteration: int) -> str:
+        """32-hex-digit key of one pass output (the disk tier expects MD5-sized digests)."""
+        return hashlib.blake2b(f"{conversion_key}:{iteration}".encode(), digest_size=16).hexdigest()
+
+    def get(self, conversion_key: str, iteration: int) -> Optional[Dict[str, Any]]:
+        """Cached pass output as a ComfyUI AUDIO dict (float32 waveform), or None."""
+        key = self.entry_key(conversion_key, iteration)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._to_audio(*entry)
+
+        if self.disk_cache is not None:
+            cached = self.disk_cache.get_cached_audio(key)
+            if cached is not None and cached[1] > 0:
+                waveform, duration = cached
+                sample_rate = int(round(waveform.shape[-1] / duration))
+                with self._lock:
+                    self.hits += 1
+                self._store_in_memory(key, waveform, sample_rate)
+                return self._to_audio(waveform, sample_rate)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, conversion_key: str, iteration: int, audio: Dict[str, Any]):
+        """Cache a pass output (ComfyUI AUDIO dict)."""
+        waveform = audio["waveform"]
+        if waveform.numel() == 0:
+            return
+        self._store_in_memory(self.entry_key(conversion_key, iteration), waveform, int(audio["sample_rate"]))
+
+    @staticmethod
+    def _to_audio(waveform: torch.Tensor, sample_rate: int) -> Dict[str, Any]:
+        waveform = waveform.float()
+        while waveform.dim() < 3:
+            waveform = waveform.unsqueeze(0)
+        return {"waveform": waveform, "sample_rate": sample_rate}
+
+    def _store_in_memory(self, key: str, waveform: torch.Tensor, sample_rate: int):
+        compact = waveform.detach().to("cpu", torch.float16).contiguous()
+        entry_size = compact.numel() * compact.element_size()
+        if self.max_bytes is not None and entry_size > self.max_bytes:
+            # Larger than the whole memory budget: keep it on disk only
+            self._spill(key, compact, sample_rate)
+            return
+
+        spilled = []
+        with self._lock:
+            self._remove_entry(key)
+            self._entries[key] = (compact, sample_rate)
+            self._entry_sizes[key] = entry_size
+            self._total_bytes += entry_size
+            while self.max_bytes is not None and self._total_bytes > self.max_bytes and self._entries:
+                oldest_key = next(iter(self._entries))
+                spilled.append((oldest_key, *self._entries[oldest_key]))
+                self._remove_entry(oldest_key)
+        for spilled_key, spilled_waveform, spilled_rate in spilled:
+            self._spill(spilled_key, spilled_waveform, spilled_rate)
+
+    def _spill(self, key: str, waveform: torch.Tensor, sample_rate: int):
+        """Move an entry to the disk tier (dropped if there is none)."""
+        disk_cache = self.disk_cache
+        # Entries already on disk are not written again; the disk tier may have pruned
+        # earlier spills to stay within its budget, so ask it rather than remembering
+        if disk_cache is None or disk_cache.contains(key):
+            return
+        disk_cache.cache_audio(key, waveform, waveform.shape[-1] / sample_rate)
+        with self._lock:
+            self.spills += 1
+
+    def _remove_entry(self, key: str):
+        """Drop an entry and its size accounting. Caller must hold the lock."""
+        if key in self._entries:
+            del self._entries[key]
+            self._total_bytes -= self._entry_sizes.pop(key, 0)
+
+    def set_max_bytes(self, max_bytes: Optional[int]):
+        """Change the memory budget (None disables the limit); entries over budget spill to disk."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            entries = list(self._entries.items())
+            self._entries.clear()
+            self._entry_sizes.clear()
+            self._total_bytes = 0
+        for key, (waveform, sample_rate) in entries:
+            self._store_in_memory(key, waveform, sample_rate)
+
+    def enable_disk_cache(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_VC_DISK_CACHE_MAX_BYTES):
+        """Attach a disk tier for evicted entries (default: vc_cache next to the audio segment cache)."""
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(DiskAudioCache._get_default_cache_dir()), "vc_cache")
+        with self._lock:
+            self.disk_cache = DiskAudioCache(cache_dir, max_bytes=max_bytes)
+
+    def disable_disk_cache(self):
+        """Detach the disk tier. Spilled entries are left in place."""
+        with self._lock:
+            self.disk_cache = None
+
+    def clear_cache(self, include_disk: bool = False):
+        """Clear all cached pass outputs, optionally including the disk tier."""
+        if include_disk and self.disk_cache is not None:
+            self.disk_cache.clear_cache()
+        with self._lock:
+            self._entries.clear()
+            self._entry_sizes.clear()
+            self._total_bytes = 0
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            stats = {
+                'total_items': len(self._entries),
+                'total_memory_bytes': self._total_bytes,
+                'total_memory_mb': self._total_bytes / (1024 * 1024),
+                'max_memory_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'spills': self.spills,
+            }
+        if self.disk_cache is not None:
+            stats['disk'] = self.disk_cache.get_cache_stats()
+        return stats
+
+
+# Global VC iteration cache instance (the disk tier is opt-in, see CHATTERBOX_DISK_CACHE)
+vc_iteration_cache = VCIterationCache()
+if disk_cache_enabled():
+    try:
+        vc_iteration_cache.enable_disk_cache()
+    except OSError as e:
+        print(f"⚠️ VC disk cache unavailable, using memory cache only: {e}")
+
+
+def get_vc_iteration_cache() -> VCIterationCache:
+    """Get the global VC iteration cache instance."""
+    return vc_iteration_cache
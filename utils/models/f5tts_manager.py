@@ -8,6 +8,7 @@ import warnings
 import torch
 import folder_paths
 from typing import Optional, List, Tuple, Dict, Any
+from utils.models.residency import model_residency
 
 
 class F5TTSModelManager:
@@ -139,7 +140,7 @@ class F5TTSModelManager:
                 
                 # Check class-level cache first
                 if not force_reload and cache_key in self._f5tts_model_cache:
-                    model = self._f5tts_model_cache[cache_key]
+                    model = self.get_cached_f5tts_model(cache_key)
                     self._f5tts_model_sources[cache_key] = source
                     model_loaded = True
                     break
@@ -167,8 +168,7 @@ class F5TTSModelManager:
                     continue
                 
                 # Cache the loaded model
-                self._f5tts_model_cache[cache_key] = model
-                self._f5tts_model_sources[cache_key] = source
+                self.cache_f5tts_model(cache_key, model, source, device)
                 model_loaded = True
                 break
                 
@@ -183,7 +183,24 @@ class F5TTSModelManager:
                 error_msg += f". Last error: {last_error}"
             raise RuntimeError(error_msg)
         
-        return self._f5tts_model_cache[cache_key]
+        return model
+    
+    def get_cached_f5tts_model(self, cache_key: str) -> Optional[Any]:
+        """Return a cached model (moved back to its device if it was offloaded), or None."""
+        if cache_key not in self._f5tts_model_cache:
+            return None
+        return model_residency.acquire(cache_key) or self._f5tts_model_cache.get(cache_key)
+    
+    def cache_f5tts_model(self, cache_key: str, model: Any, source: str, device: str):
+        """Store a loaded model in the class-level cache and register it for VRAM budgeting."""
+        self._f5tts_model_cache[cache_key] = model
+        self._f5tts_model_sources[cache_key] = source
+        model_residency.register(cache_key, model, device, on_drop=lambda key=cache_key: self._drop_f5tts_model(key))
+    
+    def _drop_f5tts_model(self, cache_key: str):
+        """Remove a model evicted by the residency manager so it is reloaded on next use."""
+        self._f5tts_model_cache.pop(cache_key, None)
+        self._f5tts_model_sources.pop(cache_key, None)
     
     def get_f5tts_model_source(self, model_name: str, device: str) -> Optional[str]:
         """
@@ -208,6 +225,8 @@ class F5TTSModelManager:
     
     def clear_f5tts_cache(self):
         """Clear F5-TTS model cache."""
+        for key in self._f5tts_model_cache:
+            model_residency.forget(key)
         self._f5tts_model_cache.clear()
         self._f5tts_model_sources.clear()
     
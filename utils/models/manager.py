@@ -9,6 +9,8 @@ import torch
 import folder_paths
 from typing import Optional, List, Tuple, Dict, Any
 from utils.system.import_manager import import_manager
+from utils.models.residency import model_residency
+from utils.voice.voice_library import get_voice_library
 
 # Use ImportManager for robust dependency checking
 # Try imports first to populate availability status
@@ -149,6 +151,39 @@ class ModelManager:
         path_component = path or "default"
         return f"{model_type}_{device}_{source}_{path_component}"
     
+    def _cache_model(self, cache_key: str, model: Any, source: str, device: str):
+        """Store a loaded model in the class-level cache and register it for VRAM budgeting."""
+        self._model_cache[cache_key] = model
+        self._model_sources[cache_key] = source
+        model_residency.register(cache_key, model, device, on_drop=lambda: self._drop_cached_model(cache_key))
+        self._attach_voice_library(model)
+    
+    def _attach_voice_library(self, model: Any):
+        """Let models that support it use precomputed voice conditionals, and build them if enabled."""
+        if not hasattr(model, "voice_library") or getattr(model, "conditioning_version", None) is None:
+            return
+        voice_library = get_voice_library()
+        model.voice_library = voice_library
+        if voice_library.enabled():
+            try:
+                voice_library.build_in_background(model)
+            except Exception as e:
+                print(f"⚠️ Voice Library: Could not start background build: {e}")
+    
+    def _get_cached_model(self, cache_key: str) -> Any:
+        """Return a cached model, moving it back to its device if it was offloaded."""
+        model = model_residency.acquire(cache_key)
+        return model if model is not None else self._model_cache[cache_key]
+    
+    def _drop_cached_model(self, cache_key: str):
+        """Remove a model evicted by the residency manager so it is reloaded on next use."""
+        model = self._model_cache.pop(cache_key, None)
+        self._model_sources.pop(cache_key, None)
+        if model is not None and self.tts_model is model:
+            self.tts_model = None
+        if model is not None and self.vc_model is model:
+            self.vc_model = None
+    
     def load_tts_model(self, device: str = "auto", language: str = "English", force_reload: bool = False) -> Any:
         """
         Load ChatterboxTTS model with caching and language support.
@@ -180,6 +215,7 @@ class ModelManager:
             # Also check if the current model matches the requested language
             current_cache_key = getattr(self, '_current_tts_cache_key', None)
             if current_cache_key and language in current_cache_key:
+                model_residency.acquire(current_cache_key)  # move back to the device if it was offloaded
                 return self.tts_model
         
         # For English, also check the original model discovery paths
@@ -193,7 +229,7 @@ class ModelManager:
                         
                         # Check class-level cache first
                         if not force_reload and cache_key in self._model_cache:
-                            self.tts_model = self._model_cache[cache_key]
+                            self.tts_model = self._get_cached_model(cache_key)
                             self.current_device = device
                             self._current_tts_cache_key = cache_key
                             return self.tts_model
@@ -204,8 +240,7 @@ class ModelManager:
                             model = ChatterboxTTS.from_local(path, device)
                         
                         # Cache the loaded model
-                        self._model_cache[cache_key] = model
-                        self._model_sources[cache_key] = source
+                        self._cache_model(cache_key, model, source, device)
                         self.tts_model = model
                         self.current_device = device
                         self._current_tts_cache_key = cache_key
@@ -227,7 +262,7 @@ class ModelManager:
                 
                 # Check class-level cache first
                 if not force_reload and cache_key in self._model_cache:
-                    self.tts_model = self._model_cache[cache_key]
+                    self.tts_model = self._get_cached_model(cache_key)
                     self.current_device = device
                     self._current_tts_cache_key = cache_key
                     return self.tts_model
@@ -238,8 +273,7 @@ class ModelManager:
                     model = ChatterboxTTS.from_local(local_language_path, device)
                 
                 # Cache the loaded model
-                self._model_cache[cache_key] = model
-                self._model_sources[cache_key] = "local"
+                self._cache_model(cache_key, model, "local", device)
                 self.tts_model = model
                 self.current_device = device
                 self._current_tts_cache_key = cache_key
@@ -256,7 +290,7 @@ class ModelManager:
                 
                 # Check class-level cache first
                 if not force_reload and cache_key in self._model_cache:
-                    self.tts_model = self._model_cache[cache_key]
+                    self.tts_model = self._get_cached_model(cache_key)
                     self.current_device = device
                     self._current_tts_cache_key = cache_key
                     return self.tts_model
@@ -265,8 +299,7 @@ class ModelManager:
                 model = ChatterboxTTS.from_pretrained(device, language=language)
                 
                 # Cache the loaded model
-                self._model_cache[cache_key] = model
-                self._model_sources[cache_key] = "huggingface"
+                self._cache_model(cache_key, model, "huggingface", device)
                 self.tts_model = model
                 self.current_device = device
                 self._current_tts_cache_key = cache_key
@@ -283,7 +316,7 @@ class ModelManager:
                 cache_key = f"tts_{device}_English_fallback"
                 
                 if not force_reload and cache_key in self._model_cache:
-                    self.tts_model = self._model_cache[cache_key]
+                    self.tts_model = self._get_cached_model(cache_key)
                     self.current_device = device
                     self._current_tts_cache_key = cache_key
                     return self.tts_model
@@ -291,8 +324,7 @@ class ModelManager:
                 model = ChatterboxTTS.from_pretrained(device, language="English")
                 
                 # Cache the loaded model
-                self._model_cache[cache_key] = model
-                self._model_sources[cache_key] = "huggingface"
+                self._cache_model(cache_key, model, "huggingface", device)
                 self.tts_model = model
                 self.current_device = device
                 self._current_tts_cache_key = cache_key
@@ -334,6 +366,7 @@ class ModelManager:
         
         # Check if we need to load/reload
         if not force_reload and self.vc_model is not None and self.current_device == device:
+            model_residency.acquire(getattr(self, '_current_vc_cache_key', None))
             return self.vc_model
         
         # Get available model paths
@@ -348,8 +381,9 @@ class ModelManager:
                 
                 # Check class-level cache first
                 if not force_reload and cache_key in self._model_cache:
-                    self.vc_model = self._model_cache[cache_key]
+                    self.vc_model = self._get_cached_model(cache_key)
                     self.current_device = device
+                    self._current_vc_cache_key = cache_key
                     self._model_sources[cache_key] = source
                     model_loaded = True
                     break
@@ -365,10 +399,10 @@ class ModelManager:
                     continue
                 
                 # Cache the loaded model
-                self._model_cache[cache_key] = model
-                self._model_sources[cache_key] = source
+                self._cache_model(cache_key, model, source, device)
                 self.vc_model = model
                 self.current_device = device
+                self._current_vc_cache_key = cache_key
                 model_loaded = True
                 break
                 
@@ -436,6 +470,8 @@ class ModelManager:
         """
         if model_type is None:
             # Clear all
+            for key in self._model_cache:
+                model_residency.forget(key)
             self._model_cache.clear()
             self._model_sources.clear()
             self.tts_model = None
@@ -447,6 +483,7 @@ class ModelManager:
             for key in keys_to_remove:
                 self._model_cache.pop(key, None)
                 self._model_sources.pop(key, None)
+                model_residency.forget(key)
             self.tts_model = None
         elif model_type == "vc":
             # Clear VC models
@@ -454,6 +491,7 @@ class ModelManager:
             for key in keys_to_remove:
                 self._model_cache.pop(key, None)
                 self._model_sources.pop(key, None)
+                model_residency.forget(key)
             self.vc_model = None
     
     @property
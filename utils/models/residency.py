@@ -0,0 +1,273 @@
+"""
+Model Residency Manager - VRAM budget for the cached ChatterBox Voice models
+Tracks the parameter bytes of every cached model and offloads least-recently-used models
+(to CPU, or drops them) when a device goes over its memory budget
+"""
+
+import gc
+import os
+import threading
+import weakref
+import torch
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Callable
+
+# Device memory budget in GB for cached models (unset = unlimited, i.e. keep everything resident)
+VRAM_BUDGET_ENV = "CHATTERBOX_VRAM_BUDGET_GB"
+# What to do with an evicted model: "cpu" keeps it in system RAM, "drop" frees it completely
+OFFLOAD_POLICY_ENV = "CHATTERBOX_OFFLOAD_POLICY"
+OFFLOAD_POLICIES = ("cpu", "drop")
+
+
+def model_nbytes(model: Any) -> int:
+    """
+    Count the parameter and buffer bytes held by a model.
+
+    Works on plain nn.Modules and on the wrapper classes (ChatterboxTTS, ChatterboxVC,
+    ChatterBoxF5TTS) that keep their modules as attributes. Shared tensors count once.
+    """
+    return sum(_module_sizes(model).values())
+
+
+def _module_sizes(model: Any) -> Dict[int, int]:
+    """Map id() of each top-level module of a model to its parameter and buffer bytes."""
+    sizes = {}
+    for module in _iter_modules(model):
+        seen = set()
+        total = 0
+        for tensor in list(module.parameters()) + list(module.buffers()):
+            key = tensor.data_ptr()
+            if key in seen:
+                continue
+            seen.add(key)
+            total += tensor.numel() * tensor.element_size()
+        sizes[id(module)] = total
+    return sizes
+
+
+def _iter_modules(obj: Any, depth: int = 2):
+    """Yield the top-level nn.Modules reachable from obj through at most `depth` attribute hops."""
+    if isinstance(obj, torch.nn.Module):
+        yield obj
+        return
+    if depth == 0 or not hasattr(obj, "__dict__"):
+        return
+    for value in vars(obj).values():
+        yield from _iter_modules(value, depth - 1)
+
+
+def _format_bytes(nbytes: int) -> str:
+    return f"{nbytes / 1024 ** 3:.2f}GB"
+
+
+class WeakModelAttribute:
+    """
+    Instance attribute that holds a cached model through a weak reference.
+
+    Nodes keep the model they loaded on an attribute between runs. A strong reference there
+    would keep a model alive after the residency manager dropped it from its cache, so its
+    memory would never be freed. With this descriptor the attribute reads as None once the
+    model is gone, and the node loads it again through its model manager.
+    """
+
+    def __set_name__(self, owner, name):
+        self._ref_name = f"_{name}_ref"
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        ref = instance.__dict__.get(self._ref_name)
+        return ref() if ref is not None else None
+
+    def __set__(self, instance, model):
+        instance.__dict__[self._ref_name] = weakref.ref(model) if model is not None else None
+
+
+class _ResidentModel:
+    """Bookkeeping for one cached model."""
+
+    def __init__(self, key: str, model: Any, device: str, on_drop: Optional[Callable[[], None]]):
+        self.key = key
+        self.model = model
+        self.device = device  # device the owner asked for
+        # Modules shared between models (see engines/chatterbox/shared_weights.py) count once per device
+        self.module_bytes = _module_sizes(model)
+        self.nbytes = sum(self.module_bytes.values())
+        self.on_drop = on_drop
+        self.resident = True  # False while offloaded to CPU
+
+
+class ModelResidencyManager:
+    """
+    LRU residency manager for cached models.
+
+    Model managers register every model they load and acquire it again on each cache hit.
+    When the models resident on a device exceed the budget, the least recently used ones
+    are moved to CPU (policy "cpu") or removed from their cache (policy "drop"). An
+    offloaded model is moved back to its device the next time it is acquired.
+    Models loaded on CPU are tracked but never count against a device budget.
+    """
+
+    def __init__(self, budget_gb: Optional[float] = None, offload_policy: str = "cpu"):
+        self._models: "OrderedDict[str, _ResidentModel]" = OrderedDict()  # LRU first
+        self._events: List[str] = []
+        # Held while models move between devices; background work on a cached model (the voice
+        # library build) holds it too, so a model is never offloaded halfway through that work
+        self.lock = threading.RLock()
+        self.budget_bytes: Optional[int] = None
+        self.offload_policy = "cpu"
+
+        env_budget = os.environ.get(VRAM_BUDGET_ENV)
+        if budget_gb is None and env_budget:
+            try:
+                budget_gb = float(env_budget)
+            except ValueError:
+                print(f"⚠️ Ignoring invalid {VRAM_BUDGET_ENV}={env_budget!r}")
+        self.configure(budget_gb, os.environ.get(OFFLOAD_POLICY_ENV, offload_policy))
+
+    def configure(self, budget_gb: Optional[float] = None, offload_policy: Optional[str] = None):
+        """
+        Set the per-device memory budget and eviction policy.
+
+        Args:
+            budget_gb: Budget in GB for models resident on each accelerator (<= 0 = unlimited, None = unchanged)
+            offload_policy: "cpu" to move evicted models to system RAM, "drop" to free them (None = unchanged)
+        """
+        if budget_gb is not None:
+            self.budget_bytes = int(budget_gb * 1024 ** 3) if budget_gb > 0 else None
+        if offload_policy is not None:
+            if offload_policy not in OFFLOAD_POLICIES:
+                raise ValueError(f"Unknown offload policy '{offload_policy}', expected one of {OFFLOAD_POLICIES}")
+            self.offload_policy = offload_policy
+        self.enforce_budget()
+
+    def register(self, key: str, model: Any, device: str, on_drop: Optional[Callable[[], None]] = None) -> Any:
+        """
+        Track a freshly loaded model and make room for it on its device.
+
+        Args:
+            key: Cache key of the model in its owner's cache
+            model: The loaded model (must support .to(device) for CPU offload)
+            device: Device the model was loaded on
+            on_drop: Callback removing the model from its owner's cache when it is dropped
+
+        Returns:
+            The model
+        """
+        self.forget(key)
+        entry = _ResidentModel(key, model, device, on_drop)
+        self._models[key] = entry
+        self._events.append(f"loaded {key} ({_format_bytes(entry.nbytes)})")
+        self.enforce_budget(device, keep=key)
+        return model
+
+    def acquire(self, key: str) -> Optional[Any]:
+        """
+        Mark a cached model as most recently used, moving it back to its device if it was offloaded.
+
+        Returns:
+            The model, or None if the key is not tracked (never registered, or dropped)
+        """
+        with self.lock:
+            entry = self._models.get(key)
+            if entry is None:
+                return None
+            self._models.move_to_end(key)
+            if not entry.resident:
+                # Make room first so the reload does not overshoot the budget
+                self.enforce_budget(entry.device, keep=key, incoming=entry)
+                entry.model.to(entry.device)
+                entry.resident = True
+                self._events.append(f"reloaded {key} to {entry.device}")
+            return entry.model
+
+    def forget(self, key: str):
+        """Stop tracking a model (its owner removed it from the cache)."""
+        self._models.pop(key, None)
+
+    def is_registered(self, key: str) -> bool:
+        return key in self._models
+
+    def is_resident(self, model: Any) -> bool:
+        """Whether a model is tracked and currently on its device (not offloaded or dropped)."""
+        return any(entry.model is model and entry.resident for entry in list(self._models.values()))
+
+    def resident_bytes(self, device: str) -> int:
+        """Bytes of tracked models currently resident on a device (shared modules count once)."""
+        return self._device_usage(device)
+
+    def _device_usage(self, device: str, incoming: Optional[_ResidentModel] = None) -> int:
+        module_bytes = {}
+        for entry in self._models.values():
+            if entry.device == device and (entry.resident or entry is incoming):
+                module_bytes.update(entry.module_bytes)
+        return sum(module_bytes.values())
+
+    def enforce_budget(self, device: Optional[str] = None, keep: Optional[str] = None,
+                       incoming: Optional[_ResidentModel] = None):
+        """
+        Evict least-recently-used models until the device fits in the budget.
+
+        Args:
+            device: Device to check (None = every device with tracked models)
+            keep: Key that must not be evicted (the model being loaded or reloaded)
+            incoming: Offloaded model about to be moved back onto the device
+        """
+        if self.budget_bytes is None:
+            return
+        with self.lock:
+            self._enforce_budget(device, keep, incoming)
+
+    def _enforce_budget(self, device: Optional[str], keep: Optional[str], incoming: Optional[_ResidentModel]):
+        devices = [device] if device is not None else {e.device for e in self._models.values()}
+        evicted = False
+        for dev in devices:
+            if torch.device(dev).type == "cpu":
+                continue
+            used = self._device_usage(dev, incoming)
+            for entry in list(self._models.values()):
+                if used <= self.budget_bytes:
+                    break
+                if entry.key == keep or not entry.resident or entry.device != dev:
+                    continue
+                self._evict(entry)
+                evicted = True
+                used = self._device_usage(dev, incoming)
+            if used > self.budget_bytes:
+                print(f"⚠️ Models on {dev} need {_format_bytes(used)}, over the {_format_bytes(self.budget_bytes)} budget")
+        if evicted:
+            gc.collect()
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+
+    def _evict(self, entry: _ResidentModel):
+        if self.offload_policy == "cpu":
+            entry.model.to("cpu")
+            entry.resident = False
+            self._events.append(f"offloaded {entry.key} to CPU ({_format_bytes(entry.nbytes)})")
+        else:
+            self._models.pop(entry.key, None)
+            if entry.on_drop is not None:
+                entry.on_drop()
+            entry.model = None
+            self._events.append(f"dropped {entry.key} ({_format_bytes(entry.nbytes)})")
+
+    def consume_events(self) -> List[str]:
+        """Return and clear the load/offload events recorded since the last call."""
+        events, self._events = self._events, []
+        return events
+
+    def get_status(self) -> Dict[str, Any]:
+        """Summary of tracked models for debugging and info output."""
+        return {
+            "budget_bytes": self.budget_bytes,
+            "offload_policy": self.offload_policy,
+            "models": [
+                {"key": e.key, "device": e.device, "bytes": e.nbytes, "resident": e.resident}
+                for e in self._models.values()
+            ],
+        }
+
+
+# Global residency manager shared by the ChatterBox and F5-TTS model managers
+model_residency = ModelResidencyManager()
@@ -233,6 +233,9 @@ class ImportManager:
                         "calculate_timing_adjustments": audio_timing_module.calculate_timing_adjustments,
                         "AudioTimingError": audio_timing_module.AudioTimingError,
                         "FFmpegTimeStretcher": getattr(audio_timing_module, "FFmpegTimeStretcher", None),
+                        "WSOLATimeStretcher": getattr(audio_timing_module, "WSOLATimeStretcher", None),
+                        "PooledFFmpegTimeStretcher": getattr(audio_timing_module, "PooledFFmpegTimeStretcher", None),
+                        "create_time_stretcher": getattr(audio_timing_module, "create_time_stretcher", None),
                     })
                     
                 except Exception as timing_error:
@@ -258,8 +261,8 @@ class ImportManager:
                 self._add_node_dir_to_path()
                 from utils.timing.parser import SRTParser, SRTSubtitle, SRTParseError, validate_srt_timing_compatibility
                 from engines.chatterbox.audio_timing import (
-                    AudioTimingUtils, PhaseVocoderTimeStretcher, TimedAudioAssembler,
-                    calculate_timing_adjustments, AudioTimingError
+                    AudioTimingUtils, PhaseVocoderTimeStretcher, WSOLATimeStretcher, TimedAudioAssembler,
+                    calculate_timing_adjustments, AudioTimingError, create_time_stretcher
                 )
                 
                 modules.update({
@@ -269,6 +272,8 @@ class ImportManager:
                     "validate_srt_timing_compatibility": validate_srt_timing_compatibility,
                     "AudioTimingUtils": AudioTimingUtils,
                     "PhaseVocoderTimeStretcher": PhaseVocoderTimeStretcher,
+                    "WSOLATimeStretcher": WSOLATimeStretcher,
+                    "create_time_stretcher": create_time_stretcher,
                     "TimedAudioAssembler": TimedAudioAssembler,
                     "calculate_timing_adjustments": calculate_timing_adjustments,
                     "AudioTimingError": AudioTimingError,
@@ -276,10 +281,12 @@ class ImportManager:
                 
                 # Try to get FFmpegTimeStretcher
                 try:
-                    from engines.chatterbox.audio_timing import FFmpegTimeStretcher
+                    from engines.chatterbox.audio_timing import FFmpegTimeStretcher, PooledFFmpegTimeStretcher
                     modules["FFmpegTimeStretcher"] = FFmpegTimeStretcher
+                    modules["PooledFFmpegTimeStretcher"] = PooledFFmpegTimeStretcher
                 except ImportError:
                     modules["FFmpegTimeStretcher"] = None
+                    modules["PooledFFmpegTimeStretcher"] = None
                 
                 self.loaded_modules[module_key] = modules
                 self.import_status[module_key] = {
@@ -297,8 +304,8 @@ class ImportManager:
         try:
             from utils.timing.parser import SRTParser, SRTSubtitle, SRTParseError, validate_srt_timing_compatibility
             from engines.chatterbox.audio_timing import (
-                AudioTimingUtils, PhaseVocoderTimeStretcher, TimedAudioAssembler,
-                calculate_timing_adjustments, AudioTimingError
+                AudioTimingUtils, PhaseVocoderTimeStretcher, WSOLATimeStretcher, TimedAudioAssembler,
+                calculate_timing_adjustments, AudioTimingError, create_time_stretcher
             )
             
             modules.update({
@@ -308,6 +315,8 @@ class ImportManager:
                 "validate_srt_timing_compatibility": validate_srt_timing_compatibility,
                 "AudioTimingUtils": AudioTimingUtils,
                 "PhaseVocoderTimeStretcher": PhaseVocoderTimeStretcher,
+                "WSOLATimeStretcher": WSOLATimeStretcher,
+                "create_time_stretcher": create_time_stretcher,
                 "TimedAudioAssembler": TimedAudioAssembler,
                 "calculate_timing_adjustments": calculate_timing_adjustments,
                 "AudioTimingError": AudioTimingError,
@@ -315,10 +324,12 @@ class ImportManager:
             
             # Try to get FFmpegTimeStretcher
             try:
-                from engines.chatterbox.audio_timing import FFmpegTimeStretcher
+                from engines.chatterbox.audio_timing import FFmpegTimeStretcher, PooledFFmpegTimeStretcher
                 modules["FFmpegTimeStretcher"] = FFmpegTimeStretcher
+                modules["PooledFFmpegTimeStretcher"] = PooledFFmpegTimeStretcher
             except ImportError:
                 modules["FFmpegTimeStretcher"] = None
+                modules["PooledFFmpegTimeStretcher"] = None
             
             self.loaded_modules[module_key] = modules
             self.import_status[module_key] = {
@@ -416,6 +427,9 @@ class ImportManager:
             "calculate_timing_adjustments": calculate_timing_adjustments,
             "PhaseVocoderTimeStretcher": None,  # Not available without librosa
             "FFmpegTimeStretcher": None,  # Not available without FFmpeg
+            "WSOLATimeStretcher": None,
+            "PooledFFmpegTimeStretcher": None,
+            "create_time_stretcher": None,
         }
     
     def _create_dummy_srt_modules(self) -> Dict[str, Any]:
@@ -26,19 +26,24 @@ class AudioAssemblyEngine:
         """
         self.sample_rate = sample_rate
         self.stretcher_cache = {}  # Cache for time stretching instances
+        self.last_layout = None  # smart_natural layout of the last assembly, for incremental re-renders
+        self.patched_segments = None  # segments rewritten when the last assembly patched a previous one
         
     def assemble_concatenation(self, audio_segments: List[torch.Tensor],
-                             fade_duration: float = 0.0) -> torch.Tensor:
+                             fade_duration: float = 0.0, writer=None):
         """
         Concatenate audio segments naturally with optional crossfading
         
         Args:
             audio_segments: List of audio tensors to concatenate
             fade_duration: Duration for crossfading between segments (seconds)
+            writer: Optional StreamingAudioWriter to stream the result to instead of returning a tensor
             
         Returns:
-            Concatenated audio tensor
+            Concatenated audio tensor, or the StreamedAudio handle when streaming to a writer
         """
+        if writer is not None:
+            return self._stream_concatenation(audio_segments, fade_duration, writer)
         if not audio_segments:
             return torch.empty((1, 0))
         if len(audio_segments) == 1:
@@ -52,36 +57,69 @@ class AudioAssemblyEngine:
     
     def _concatenate_with_crossfade(self, audio_segments: List[torch.Tensor], 
                                   fade_duration: float) -> torch.Tensor:
-        """Concatenate audio segments with crossfading between them"""
+        """Concatenate audio segments with crossfading between them, writing into one output buffer"""
         fade_samples = int(fade_duration * self.sample_rate)
-        result = audio_segments[0]
-        
-        for i in range(1, len(audio_segments)):
-            current_segment = audio_segments[i]
-            
-            if fade_samples > 0 and result.size(1) >= fade_samples and current_segment.size(1) >= fade_samples:
-                # Create fade out for end of previous segment
-                fade_out = torch.linspace(1.0, 0.0, fade_samples, device=result.device)
-                fade_in = torch.linspace(0.0, 1.0, fade_samples, device=current_segment.device)
-                
-                # Apply fades
-                result_end = result[:, -fade_samples:] * fade_out
-                current_start = current_segment[:, :fade_samples] * fade_in
-                
-                # Crossfade by overlapping
-                crossfaded = result_end + current_start
-                
-                # Combine: previous audio (minus fade region) + crossfaded region + rest of current segment
-                result = torch.cat([
-                    result[:, :-fade_samples],
-                    crossfaded,
-                    current_segment[:, fade_samples:]
-                ], dim=1)
+        offsets, crossfades, total_samples = self._plan_concatenation(audio_segments, fade_samples)
+        
+        first = audio_segments[0]
+        dtype = first.dtype
+        for segment in audio_segments[1:]:
+            dtype = torch.promote_types(dtype, segment.dtype)
+        if any(crossfades):
+            fade_out = torch.linspace(1.0, 0.0, fade_samples, device=first.device)
+            fade_in = torch.linspace(0.0, 1.0, fade_samples, device=first.device)
+            # Fading with the float32 ramps promotes half-precision audio, as the concatenating version did
+            dtype = torch.promote_types(dtype, fade_out.dtype)
+        result = torch.empty(first.size(0), total_samples, device=first.device, dtype=dtype)
+        
+        for segment, offset, crossfade in zip(audio_segments, offsets, crossfades):
+            end = offset + segment.size(1)
+            if crossfade:
+                # Fade out the end of the previous audio and overlap-add the faded-in start of this one
+                result[:, offset:offset + fade_samples] *= fade_out
+                result[:, offset:offset + fade_samples] += segment[:, :fade_samples] * fade_in
+                result[:, offset + fade_samples:end] = segment[:, fade_samples:]
             else:
-                # No crossfading, just concatenate
-                result = torch.cat([result, current_segment], dim=1)
+                result[:, offset:end] = segment
         
         return result
+    
+    @staticmethod
+    def _plan_concatenation(audio_segments: List[torch.Tensor], fade_samples: int) -> Tuple[List[int], List[bool], int]:
+        """Each segment's offset in the output, whether it crossfades into the previous audio, and the total length"""
+        offsets = [0]
+        crossfades = [False]
+        total_samples = audio_segments[0].size(1)
+        for current_segment in audio_segments[1:]:
+            crossfade = fade_samples > 0 and total_samples >= fade_samples and current_segment.size(1) >= fade_samples
+            offset = total_samples - fade_samples if crossfade else total_samples
+            offsets.append(offset)
+            crossfades.append(crossfade)
+            total_samples = offset + current_segment.size(1)
+        return offsets, crossfades, total_samples
+    
+    def _stream_concatenation(self, audio_segments: List[torch.Tensor], fade_duration: float, writer):
+        """Concatenate (with optional crossfades) segment by segment into a StreamingAudioWriter"""
+        if not audio_segments:
+            return writer.close()
+        fade_samples = int(fade_duration * self.sample_rate) if fade_duration > 0.0 else 0
+        offsets, crossfades, total_samples = self._plan_concatenation(audio_segments, fade_samples)
+        
+        fade_out = torch.linspace(1.0, 0.0, fade_samples)
+        fade_in = torch.linspace(0.0, 1.0, fade_samples)
+        for i, (segment, offset, crossfade) in enumerate(zip(audio_segments, offsets, crossfades)):
+            segment = segment.detach().to("cpu", torch.float32)
+            if crossfade:
+                head = writer.region(offset, offset + fade_samples)
+                head *= fade_out
+                head += segment[:, :fade_samples] * fade_in
+                writer.add(offset + fade_samples, segment[:, fade_samples:])
+            else:
+                writer.add(offset, segment)
+            # The next segment may crossfade into the last fade_samples of this one
+            writer.flush_until(offsets[i + 1] if i + 1 < len(offsets) else total_samples)
+        
+        return writer.close(total_samples)
         
     def assemble_stretch_to_fit(self, audio_segments: List[torch.Tensor],
                                target_timings: List[Tuple[float, float]],
@@ -111,13 +149,16 @@ class AudioAssemblyEngine:
             return self._basic_stretch_assembly(audio_segments, target_timings, fade_duration)
     
     def assemble_with_overlaps(self, audio_segments: List[torch.Tensor],
-                              subtitles: List, device: str) -> torch.Tensor:
+                              subtitles: List, device: str, writer=None):
         """
         ORIGINAL: Assemble audio by placing segments at their SRT start times, allowing audible overlaps.
         Silence is implicitly added in gaps. EXACT COPY FROM ORIGINAL LINES 1776-1875
+        
+        With a StreamingAudioWriter, segments are mixed into the file in time order and the
+        StreamedAudio handle is returned instead of an output tensor.
         """
         if not audio_segments:
-            return torch.empty(0) # Return empty tensor if no segments
+            return writer.close() if writer is not None else torch.empty(0) # Return empty tensor if no segments
 
         # Use device directly for all operations within this function.
         # device is the consistent target device (e.g., 'cuda' or 'cpu')
@@ -133,17 +174,21 @@ class AudioAssemblyEngine:
 
         # Calculate total duration needed for the output buffer
         max_end_time = 0.0
+        max_end_sample = 0
         for i, (segment_from_list, subtitle) in enumerate(zip(audio_segments, subtitles)):
-            # Ensure segment is on target_device for size calculation
-            segment_on_target = segment_from_list.to(target_device)
-            segment_end_time = subtitle.start_time + (segment_on_target.size(-1) / self.sample_rate)
+            segment_end_time = subtitle.start_time + (segment_from_list.size(-1) / self.sample_rate)
             max_end_time = max(max_end_time, segment_end_time)
+            max_end_sample = max(max_end_sample, int(subtitle.start_time * self.sample_rate) + segment_from_list.size(-1))
         
         # Ensure the buffer is at least as long as the last subtitle's end time
         if subtitles:
             max_end_time = max(max_end_time, subtitles[-1].end_time)
 
-        total_samples = int(max_end_time * self.sample_rate)
+        # Sized once: no segment can extend past the buffer, so it never has to be grown and copied
+        total_samples = max(int(max_end_time * self.sample_rate), max_end_sample)
+        
+        if writer is not None:
+            return self._stream_with_overlaps(audio_segments, subtitles, writer, total_samples)
 
         # Initialize output buffer with zeros
         if num_channels == 1:
@@ -183,23 +228,6 @@ class AudioAssemblyEngine:
             start_sample = int(subtitle.start_time * self.sample_rate)
             end_sample_segment = start_sample + normalized_audio_for_add.size(-1)
 
-            # Resize output_audio if current segment extends beyond current buffer size
-            if end_sample_segment > output_audio.size(-1):
-                new_total_samples = end_sample_segment
-                if num_channels == 1:
-                    new_output_audio = torch.zeros(new_total_samples, device=target_device, dtype=dtype)
-                else:
-                    new_output_audio = torch.zeros(num_channels, new_total_samples, device=target_device, dtype=dtype)
-                
-                # Copy existing audio to the new larger buffer
-                current_len = output_audio.size(-1)
-                if num_channels == 1:
-                    new_output_audio[:current_len] = output_audio
-                else:
-                    new_output_audio[:, :current_len] = output_audio
-                output_audio = new_output_audio
-                # Buffer resized
-
             # Both output_audio and normalized_audio_for_add are on target_device.
             if output_audio.dim() == 1:
                 output_audio[start_sample:end_sample_segment] += normalized_audio_for_add
@@ -211,15 +239,37 @@ class AudioAssemblyEngine:
         # Assembly complete
         return output_audio
     
+    def _stream_with_overlaps(self, audio_segments: List[torch.Tensor], subtitles: List, writer, total_samples: int):
+        """Mix segments at their SRT start times into a StreamingAudioWriter"""
+        starts = [int(subtitle.start_time * self.sample_rate) for subtitle in subtitles[:len(audio_segments)]]
+        # Earliest start of any segment from index i on: everything before it is final
+        next_starts = starts + [total_samples]
+        for i in range(len(starts) - 1, -1, -1):
+            next_starts[i] = min(next_starts[i], next_starts[i + 1])
+        
+        for i, (segment, start_sample) in enumerate(zip(audio_segments, starts)):
+            if segment.dim() == 2 and segment.shape[0] not in (1, writer.channels) and writer.channels != 1:
+                raise RuntimeError(f"Channel mismatch: output buffer has {writer.channels} channels, but segment {i} has {segment.shape[0]} channels.")
+            writer.add(start_sample, segment)
+            writer.flush_until(next_starts[i + 1])
+        
+        return writer.close(total_samples)
+    
     def assemble_smart_natural(self, audio_segments: List[torch.Tensor],
                               processed_segments: List[torch.Tensor],
-                              adjustments: List[Dict], subtitles: List, device: str) -> torch.Tensor:
+                              adjustments: List[Dict], subtitles: List, device: str,
+                              previous: Optional[Tuple[torch.Tensor, List[Tuple]]] = None, writer=None):
         """
         Assemble audio using smart natural timing with processed segments
         ORIGINAL FINAL ASSEMBLY LOGIC FROM LINES 1703-1774
+        
+        previous: (output, layout) of an earlier assembly (self.last_layout). If every segment that
+            did not change keeps its place, a copy of that output is patched instead of rebuilt.
+        writer: Optional StreamingAudioWriter; segments are then written to it in order and the
+            StreamedAudio handle is returned (previous is ignored)
         """
         if not processed_segments:
-            return torch.empty(0)
+            return writer.close() if writer is not None else torch.empty(0)
         
         # Import required for assembly using import manager
         try:
@@ -241,8 +291,11 @@ class AudioAssemblyEngine:
         # Since we don't have access to the mutable_subtitles from timing engine,
         # we'll reconstruct the final timing from the adjustments
         
-        final_audio_parts = []
+        # Plan: the output offset of every segment (silence gaps are left as zeros in the buffer)
+        segment_offsets = []
         current_output_time = 0.0
+        current_sample = 0
+        has_gaps = False
         
         for i, segment_audio in enumerate(processed_segments):
             # Get timing info from adjustments
@@ -251,65 +304,124 @@ class AudioAssemblyEngine:
             # Determine start time for this segment
             segment_start_time = adj.get('final_srt_start', subtitles[i].start_time if i < len(subtitles) else current_output_time)
             
-            # Add silence if there's a gap between current_output_time and segment's start_time
+            # Leave silence if there's a gap between current_output_time and segment's start_time
             if current_output_time < segment_start_time:
                 gap_duration = segment_start_time - current_output_time
-                # Add silence gap
-                silence = AudioTimingUtils.create_silence(gap_duration, self.sample_rate,
-                                                         channels=segment_audio.shape[0] if segment_audio.dim() == 2 else 1,
-                                                         device=segment_audio.device)
-                final_audio_parts.append(silence)
+                current_sample += AudioTimingUtils.seconds_to_samples(gap_duration, self.sample_rate)
                 current_output_time += gap_duration
+                has_gaps = True
             
-            final_audio_parts.append(segment_audio)
+            segment_offsets.append(current_sample)
+            current_sample += segment_audio.size(-1)
             current_output_time += AudioTimingUtils.get_audio_duration(segment_audio, self.sample_rate)
         
-        if not final_audio_parts:
-            # Handle case where no segments were processed (e.g., immediate interruption)
-            if processed_segments:
-                return torch.empty(0, device=processed_segments[0].device, dtype=processed_segments[0].dtype)
-            else:
-                return torch.empty(0)
-        
         # ORIGINAL DIMENSION NORMALIZATION LOGIC
-        # Ensure all parts have the same number of dimensions before concatenating
-        target_dim = processed_segments[0].dim() if processed_segments else 1
+        # Every part is written with the layout of the first segment
+        target_dim = processed_segments[0].dim()
         target_channels = processed_segments[0].shape[0] if target_dim == 2 else 1
-        
-        normalized_final_audio_parts = []
         target_device_for_concat = device  # Use passed device parameter
         
-        for part in final_audio_parts:
-            # Ensure each part is on the target_device before normalization
-            part_on_device = part.to(target_device_for_concat)
-            
-            processed_part_for_append = None
-            current_part_dim = part_on_device.dim()
+        # Same dtype torch.cat would have produced from the segments and float32 silence parts
+        dtype = processed_segments[0].dtype
+        for segment_audio in processed_segments[1:]:
+            dtype = torch.promote_types(dtype, segment_audio.dtype)
+        if has_gaps:
+            dtype = torch.promote_types(dtype, torch.float32)
+        
+        # A segment's samples are fixed by its natural audio, the stretch applied and its final length.
+        # The layout holds the natural audio itself: an id() could be reused by a regenerated segment
+        self.last_layout = [
+            (offset, segment_audio.size(-1), natural_audio, adj.get('stretch_factor_applied', 1.0))
+            for segment_audio, offset, natural_audio, adj in zip(processed_segments, segment_offsets, audio_segments, adjustments)
+        ]
+        if target_dim == 2:
+            output_shape = (target_channels, current_sample)
+        else:
+            output_shape = (current_sample,)
+        
+        if writer is not None:
+            self.patched_segments = None
+            return self._stream_smart_natural(processed_segments, segment_offsets, current_sample,
+                                              target_dim, target_channels, writer)
+        
+        output, write_indices = None, range(len(processed_segments))
+        if previous is not None:
+            patched = self._patch_previous_output(previous, output_shape, dtype, target_device_for_concat)
+            if patched is not None:
+                output, write_indices = patched
+        self.patched_segments = len(write_indices) if output is not None else None
+        
+        # Allocate the output once and write every segment in place
+        if output is None:
+            output = torch.zeros(output_shape, device=target_device_for_concat, dtype=dtype)
+        
+        for i in write_indices:
+            segment_audio, offset = processed_segments[i], segment_offsets[i]
+            part = segment_audio.to(target_device_for_concat)
             
-            if current_part_dim == target_dim:
-                if target_dim == 2 and part_on_device.shape[0] != target_channels:
-                    if part_on_device.shape[0] == 1:
-                        processed_part_for_append = part_on_device.repeat(target_channels, 1)
-                    else:
-                        # This branch raises an error, so no tensor is assigned here
-                        raise RuntimeError(f"Channel mismatch in final assembly: Expected {target_channels} channels, got {part_on_device.shape[0]}")
-                else:
-                    # Part is already on target_device_for_concat and correctly shaped
-                    processed_part_for_append = part_on_device
-            elif current_part_dim == 1 and target_dim == 2: # Mono part, target is multi-channel
-                processed_part_for_append = part_on_device.unsqueeze(0).repeat(target_channels, 1)
-            elif current_part_dim == 2 and target_dim == 1: # Multi-channel part, target is mono
-                processed_part_for_append = torch.sum(part_on_device, dim=0)
-            else:
-                # This branch raises an error
-                raise RuntimeError(f"Dimension mismatch in final assembly: Expected {target_dim}D, got {current_part_dim}D for part with shape {part_on_device.shape}")
+            if part.dim() == target_dim:
+                if target_dim == 2 and part.shape[0] != target_channels and part.shape[0] != 1:
+                    raise RuntimeError(f"Channel mismatch in final assembly: Expected {target_channels} channels, got {part.shape[0]}")
+                # A mono [1, samples] part broadcasts over all channels
+            elif part.dim() == 2 and target_dim == 1: # Multi-channel part, target is mono
+                part = torch.sum(part, dim=0)
+            elif not (part.dim() == 1 and target_dim == 2): # Mono parts broadcast over all channels
+                raise RuntimeError(f"Dimension mismatch in final assembly: Expected {target_dim}D, got {part.dim()}D for part with shape {part.shape}")
             
-            # Ensure the final tensor to be appended is on the target_device_for_concat.
-            if processed_part_for_append is not None:
-                 normalized_final_audio_parts.append(processed_part_for_append.to(target_device_for_concat))
+            output[..., offset:offset + part.size(-1)] = part
+        
+        return output
+    
+    def _stream_smart_natural(self, processed_segments: List[torch.Tensor], segment_offsets: List[int],
+                              total_samples: int, target_dim: int, target_channels: int, writer):
+        """Write smart_natural segments at their planned offsets into a StreamingAudioWriter"""
+        for i, (segment_audio, offset) in enumerate(zip(processed_segments, segment_offsets)):
+            part = segment_audio.detach().to("cpu", torch.float32)
+            if part.dim() == 2 and target_dim == 2 and part.shape[0] != target_channels and part.shape[0] != 1:
+                raise RuntimeError(f"Channel mismatch in final assembly: Expected {target_channels} channels, got {part.shape[0]}")
+            if part.dim() == 2 and target_dim == 1:
+                part = torch.sum(part, dim=0)
+            writer.region(offset, offset + part.size(-1))[:] = part
+            writer.flush_until(segment_offsets[i + 1] if i + 1 < len(segment_offsets) else total_samples)
+        return writer.close(total_samples)
+    
+    def _patch_previous_output(self, previous: Tuple[torch.Tensor, List[Tuple]], output_shape: Tuple[int, ...],
+                               dtype: torch.dtype, device: str) -> Optional[Tuple[torch.Tensor, List[int]]]:
+        """
+        Copy a previous smart_natural output and clear the places of segments that changed
         
-        # All parts in normalized_final_audio_parts are on the target device
-        return torch.cat(normalized_final_audio_parts, dim=-1)
+        Returns:
+            (output, indices of segments still to be written), or None if the layouts are incompatible
+        """
+        previous_output, previous_layout = previous
+        if previous_output is None or previous_layout is None:
+            return None
+        target_device = torch.device(device)
+        same_device = (previous_output.device.type == target_device.type and
+                       target_device.index in (None, previous_output.device.index))
+        if tuple(previous_output.shape) != output_shape or previous_output.dtype != dtype or not same_device:
+            return None
+        
+        # (offset, length, stretch factor) -> natural audio placed there; same audio means the same tensor
+        previous_placements = {}
+        for offset, length, natural_audio, factor in previous_layout:
+            previous_placements.setdefault((offset, length, factor), []).append(natural_audio)
+        
+        changed = []
+        for i, (offset, length, natural_audio, factor) in enumerate(self.last_layout):
+            candidates = previous_placements.get((offset, length, factor), [])
+            match = next((j for j, previous_audio in enumerate(candidates) if previous_audio is natural_audio), None)
+            if match is None:
+                changed.append(i)
+            else:
+                candidates.pop(match)  # still in place: neither cleared nor rewritten
+        
+        # The previous tensor may still be held by ComfyUI as an earlier node output, so never write into it
+        output = previous_output.clone()
+        for (offset, length, _), stale in previous_placements.items():
+            if stale:
+                output[..., offset:offset + length] = 0
+        return output, changed
     
     def apply_time_stretching(self, audio: torch.Tensor, 
                             stretch_factor: float,
@@ -320,7 +432,7 @@ class AudioAssemblyEngine:
         Args:
             audio: Input audio tensor
             stretch_factor: Stretching factor (>1 = slower, <1 = faster)
-            method: Stretching method ("auto", "ffmpeg", "phase_vocoder")
+            method: Stretching method ("auto", "wsola", "ffmpeg", "phase_vocoder")
             
         Returns:
             Time-stretched audio tensor
@@ -330,13 +442,23 @@ class AudioAssemblyEngine:
         
         try:
             # Try to use chatterbox audio timing utilities
-            if method == "auto" or method == "ffmpeg":
-                from engines.chatterbox.audio_timing import FFmpegTimeStretcher
+            if method == "auto" or method == "wsola":
+                from engines.chatterbox.audio_timing import WSOLATimeStretcher
+                
+                cache_key = f"wsola_{self.sample_rate}"
+                if cache_key not in self.stretcher_cache:
+                    self.stretcher_cache[cache_key] = WSOLATimeStretcher()
+                
+                stretcher = self.stretcher_cache[cache_key]
+                return stretcher.time_stretch(audio, stretch_factor, self.sample_rate)
+            
+            elif method == "ffmpeg":
+                from engines.chatterbox.audio_timing import PooledFFmpegTimeStretcher
                 
                 cache_key = f"ffmpeg_{self.sample_rate}"
                 if cache_key not in self.stretcher_cache:
                     try:
-                        self.stretcher_cache[cache_key] = FFmpegTimeStretcher()
+                        self.stretcher_cache[cache_key] = PooledFFmpegTimeStretcher()
                     except Exception:
                         # Fall back to phase vocoder if FFmpeg not available
                         cache_key = f"phase_vocoder_{self.sample_rate}"
@@ -496,6 +618,12 @@ class AudioAssemblyEngine:
         """Get list of available time stretching methods"""
         methods = ['simple_interpolation']  # Always available fallback
         
+        try:
+            from engines.chatterbox.audio_timing import WSOLATimeStretcher
+            methods.append('wsola')
+        except Exception:
+            pass
+        
         try:
             from engines.chatterbox.audio_timing import FFmpegTimeStretcher
             FFmpegTimeStretcher()  # Test if FFmpeg is available
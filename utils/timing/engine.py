@@ -8,6 +8,8 @@ import numpy as np
 from typing import Dict, Any, Optional, List, Tuple
 from utils.audio.processing import AudioProcessingUtils
 
+STRETCHER_LABELS = {"wsola": "WSOLA", "ffmpeg": "FFmpeg", "phase_vocoder": "Phase Vocoder"}
+
 
 class TimingEngine:
     """
@@ -15,14 +17,18 @@ class TimingEngine:
     Handles smart timing calculations, adjustments, and optimizations
     """
     
-    def __init__(self, sample_rate: int):
+    def __init__(self, sample_rate: int, stretcher_type: Optional[str] = None):
         """
         Initialize timing engine
         
         Args:
             sample_rate: Audio sample rate for calculations
+            stretcher_type: Time stretcher for smart_natural mode ("wsola", "ffmpeg" or "phase_vocoder";
+                None = CHATTERBOX_TIME_STRETCHER, default "wsola")
         """
         self.sample_rate = sample_rate
+        self.stretcher_type = stretcher_type
+        self.restretched_count = 0  # segments actually stretched by the last smart_natural run
         
     def calculate_concatenation_adjustments(self, audio_segments: List[torch.Tensor],
                                           subtitles: List) -> List[Dict]:
@@ -65,10 +71,15 @@ class TimingEngine:
     def calculate_smart_timing_adjustments(self, audio_segments: List[torch.Tensor],
                                          subtitles: List, tolerance: float,
                                          max_stretch_ratio: float,
-                                         min_stretch_ratio: float, device: str) -> Tuple[List[Dict], List[torch.Tensor]]:
+                                         min_stretch_ratio: float, device: str,
+                                         stretch_cache: Optional[Dict] = None) -> Tuple[List[Dict], List[torch.Tensor]]:
         """
         ORIGINAL Smart balanced timing: Adjusts SRT segment timings based on actual spoken duration
         and a user-defined timing_tolerance - EXACT ORIGINAL IMPLEMENTATION FROM LINES 1497-1774
+        
+        stretch_cache: Optional (id(natural audio), factor) -> (natural audio, stretched audio) dict
+            from a previous run; matching stretches are reused and the dict is left holding only
+            this run's stretches (see utils/timing/incremental.py)
         """
         # Import required modules using the same pattern as SRT node
         try:
@@ -81,6 +92,7 @@ class TimingEngine:
             AudioTimingUtils = modules.get("AudioTimingUtils")
             FFmpegTimeStretcher = modules.get("FFmpegTimeStretcher")
             PhaseVocoderTimeStretcher = modules.get("PhaseVocoderTimeStretcher")
+            create_time_stretcher = modules.get("create_time_stretcher")
             AudioTimingError = modules.get("AudioTimingError")
             SRTSubtitle = modules.get("SRTSubtitle")
             
@@ -99,20 +111,27 @@ class TimingEngine:
         mutable_subtitles = [SRTSubtitle(s.sequence, s.start_time, s.end_time, s.text) for s in subtitles]
         
         # Initialize stretcher for smart_natural mode
-        try:
-            # Try FFmpeg first
-            print("Smart natural mode: Trying FFmpeg stretcher...")
-            time_stretcher = FFmpegTimeStretcher()
-            self._smart_natural_stretcher = "ffmpeg"
-            print("Smart natural mode: Using FFmpeg stretcher")
-        except AudioTimingError as e:
-            # Fall back to Phase Vocoder
-            print(f"Smart natural mode: FFmpeg initialization failed ({str(e)}), falling back to Phase Vocoder")
-            time_stretcher = PhaseVocoderTimeStretcher()
-            self._smart_natural_stretcher = "phase_vocoder"
-            print("Smart natural mode: Using Phase Vocoder stretcher")
+        if create_time_stretcher is not None:
+            # WSOLA by default; CHATTERBOX_TIME_STRETCHER=ffmpeg selects the pooled FFmpeg stretcher
+            time_stretcher, self._smart_natural_stretcher = create_time_stretcher(self.stretcher_type)
+            print(f"Smart natural mode: Using {STRETCHER_LABELS[self._smart_natural_stretcher]} stretcher")
+        else:
+            try:
+                # Try FFmpeg first
+                print("Smart natural mode: Trying FFmpeg stretcher...")
+                time_stretcher = FFmpegTimeStretcher()
+                self._smart_natural_stretcher = "ffmpeg"
+                print("Smart natural mode: Using FFmpeg stretcher")
+            except AudioTimingError as e:
+                # Fall back to Phase Vocoder
+                print(f"Smart natural mode: FFmpeg initialization failed ({str(e)}), falling back to Phase Vocoder")
+                time_stretcher = PhaseVocoderTimeStretcher()
+                self._smart_natural_stretcher = "phase_vocoder"
+                print("Smart natural mode: Using Phase Vocoder stretcher")
         
-        # Process audio with smart natural timing
+        # Plan every segment first: shifts and stretch factors never depend on the stretched audio,
+        # so all stretching can then run concurrently
+        segment_plans = []
         for i, audio in enumerate(audio_segments):
             # Check for interruption during smart natural processing
             if model_management.interrupt_processing:
@@ -222,18 +241,26 @@ class TimingEngine:
                 # Apply audio stretching
                 segment_report['actions'].append(f"⏱️ Applying stretch/shrink: natural {natural_duration:.3f}s -> target {new_target_duration:.3f}s (factor: {clamped_stretch_factor:.3f}x).")
                 segment_report['stretch_factor_applied'] = clamped_stretch_factor
-                try:
-                    stretched_audio = time_stretcher.time_stretch(audio, clamped_stretch_factor, self.sample_rate)
-                    processed_audio = stretched_audio
-                except Exception as e:
-                    segment_report['actions'].append("Time stretching failed, using padding/truncation")
-                    # Time stretching failed, use fallback
-                    processed_audio = audio # Use original audio if stretching fails
             else:
-                processed_audio = audio
                 segment_report['actions'].append("No significant stretch/shrink needed.")
                 # No stretching needed
             
+            segment_plans.append((segment_report, current_subtitle, new_target_duration))
+        
+        # Stretch all planned segments at once (batched WSOLA, or concurrently on the stretch pool)
+        stretched_segments = self._stretch_planned_segments(
+            time_stretcher, audio_segments, [plan[0]['stretch_factor_applied'] for plan in segment_plans],
+            stretch_cache
+        )
+        
+        for i, (segment_report, current_subtitle, new_target_duration) in enumerate(segment_plans):
+            original_srt_start = subtitles[i].start_time
+            processed_audio = stretched_segments[i]
+            if processed_audio is None:
+                segment_report['actions'].append("Time stretching failed, using padding/truncation")
+                # Time stretching failed, use fallback
+                processed_audio = audio_segments[i] # Use original audio if stretching fails
+            
             # Step 5: Pad with Silence (last resort) or Truncate
             final_processed_duration = AudioTimingUtils.get_audio_duration(processed_audio, self.sample_rate)
             
@@ -277,6 +304,59 @@ class TimingEngine:
         
         return smart_adjustments_report, processed_segments
     
+    def _stretch_planned_segments(self, time_stretcher, audio_segments: List[torch.Tensor],
+                                  stretch_factors: List[float],
+                                  stretch_cache: Optional[Dict] = None) -> List[Optional[torch.Tensor]]:
+        """
+        Stretch every segment whose factor is not 1.0 in one batched/concurrent call
+        
+        Returns:
+            Stretched (or untouched) segments in input order, None where stretching failed
+        """
+        results: List[Optional[torch.Tensor]] = list(audio_segments)
+        indices = [i for i, factor in enumerate(stretch_factors) if factor != 1.0]
+        self.restretched_count = 0
+        
+        # Reuse stretches of unchanged audio with an unchanged factor from the previous run
+        previous_cache = dict(stretch_cache) if stretch_cache is not None else {}
+        if stretch_cache is not None:
+            stretch_cache.clear()
+            pending = []
+            for i in indices:
+                cache_key = (id(audio_segments[i]), stretch_factors[i])
+                cached = previous_cache.get(cache_key)
+                if cached is not None and cached[0] is audio_segments[i]:
+                    results[i] = cached[1]
+                    stretch_cache[cache_key] = cached
+                else:
+                    pending.append(i)
+            indices = pending
+        if not indices:
+            return results
+        self.restretched_count = len(indices)
+        
+        segments = [audio_segments[i] for i in indices]
+        factors = [stretch_factors[i] for i in indices]
+        try:
+            if hasattr(time_stretcher, "time_stretch_batch"):
+                stretched = time_stretcher.time_stretch_batch(segments, factors, self.sample_rate)
+            else:
+                stretched = [time_stretcher.time_stretch(a, f, self.sample_rate) for a, f in zip(segments, factors)]
+            for i, audio in zip(indices, stretched):
+                results[i] = audio
+        except Exception:
+            # Retry one by one so a single bad segment only loses its own stretch
+            for i, audio, factor in zip(indices, segments, factors):
+                try:
+                    results[i] = time_stretcher.time_stretch(audio, factor, self.sample_rate)
+                except Exception:
+                    results[i] = None
+        if stretch_cache is not None:
+            for i in indices:
+                if results[i] is not None:
+                    stretch_cache[(id(audio_segments[i]), stretch_factors[i])] = (audio_segments[i], results[i])
+        return results
+    
     def _fallback_smart_timing(self, audio_segments: List[torch.Tensor], subtitles: List) -> Tuple[List[Dict], List[torch.Tensor]]:
         """Fallback when chatterbox modules not available - SHOULD NOT HAPPEN IN NORMAL OPERATION"""
         # This should not show in reports as it means the import failed completely
@@ -0,0 +1,68 @@
+"""
+Incremental SRT Rendering - Diffs an SRT against the previous render of the same node
+Unchanged subtitle lines reuse their generated audio, stretches and place in the assembled waveform
+"""
+
+import difflib
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import torch
+
+
+def render_settings_key(*settings: Any) -> str:
+    """Stable key for a tuple of render settings (generation or assembly parameters)."""
+    return hashlib.md5(repr(settings).encode()).hexdigest()
+
+
+class SRTRenderManifest:
+    """
+    Record of one SRT render, kept by the node for the next run.
+
+    Generated (natural) audio is reused for every subtitle whose text is unchanged as long as the
+    generation settings match. Stretched segments and the assembled smart_natural waveform are
+    only reused while the assembly settings match too.
+    """
+
+    def __init__(self, generation_key: str, assembly_key: str, subtitles: List,
+                 audio_segments: List[torch.Tensor]):
+        self.generation_key = generation_key
+        self.assembly_key = assembly_key
+        self.texts = [subtitle.text for subtitle in subtitles]
+        self.audio_segments = audio_segments
+        # (id(natural audio), stretch factor) -> (natural audio, stretched audio), see TimingEngine
+        self.stretch_cache: Dict[Tuple[int, float], Tuple[torch.Tensor, torch.Tensor]] = {}
+        # Assembled smart_natural output and its layout, see AudioAssemblyEngine.assemble_smart_natural
+        self.final_audio: Optional[torch.Tensor] = None
+        self.layout: Optional[List[Tuple[int, int, torch.Tensor, float]]] = None
+
+    def match_segments(self, generation_key: str, subtitles: List) -> Dict[int, torch.Tensor]:
+        """
+        Find subtitles of a new SRT whose audio can be reused from this render.
+
+        Lines are aligned with a sequence diff, so inserting or removing a subtitle does not
+        invalidate the lines after it. Empty subtitles are never reused: their silence is sized
+        by their (possibly edited) slot.
+
+        Returns:
+            New subtitle index -> previously generated natural audio
+        """
+        if generation_key != self.generation_key:
+            return {}
+        new_texts = [subtitle.text for subtitle in subtitles]
+        matcher = difflib.SequenceMatcher(None, self.texts, new_texts, autojunk=False)
+        reused = {}
+        for block in matcher.get_matching_blocks():
+            for offset in range(block.size):
+                new_index = block.b + offset
+                if new_texts[new_index].strip():
+                    reused[new_index] = self.audio_segments[block.a + offset]
+        return reused
+
+    def carry_over(self, previous: Optional["SRTRenderManifest"]):
+        """Keep the previous render's stretches and assembled output if all its settings match."""
+        if previous is None or previous.generation_key != self.generation_key or previous.assembly_key != self.assembly_key:
+            return
+        self.stretch_cache = previous.stretch_cache
+        self.final_audio = previous.final_audio
+        self.layout = previous.layout
@@ -0,0 +1,247 @@
+"""
+Streaming SRT Output - Writes assembled SRT audio to a WAV/FLAC file in time order
+Only a short window of not yet finished output audio is kept in memory; the result is a file handle
+"""
+
+import os
+import struct
+from typing import List, Optional
+
+import numpy as np
+import torch
+
+STREAMING_FORMATS = (".wav", ".flac")
+# Float32 WAV with a 16-byte fmt chunk and a fact chunk: the sample data starts 4-byte aligned
+_WAV_HEADER_BYTES = 56
+_WAV_MAX_DATA_BYTES = 0xFFFFFFFF - _WAV_HEADER_BYTES
+
+
+class StreamedAudio:
+    """Handle to an SRT render written to disk by StreamingAudioWriter."""
+
+    def __init__(self, path: str, sample_rate: int, channels: int, num_samples: int):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.num_samples = num_samples
+
+    @property
+    def duration(self) -> float:
+        return self.num_samples / self.sample_rate
+
+    def load(self) -> torch.Tensor:
+        """
+        Audio as a [channels, samples] float32 tensor.
+
+        WAV files are memory-mapped (copy-on-write), so pages are only read from disk when used
+        and the file is never loaded as a whole. A later render to the same path replaces the file
+        instead of overwriting it, so the mapping keeps the old file alive. Windows cannot replace a
+        mapped file, so there (and for FLAC files) the audio is read into memory.
+        """
+        if self.num_samples == 0:
+            return torch.zeros(self.channels, 0)
+        if self.path.lower().endswith(".wav"):
+            if os.name == "nt":
+                data = np.fromfile(self.path, dtype="<f4", offset=_WAV_HEADER_BYTES,
+                                   count=self.num_samples * self.channels).reshape(self.num_samples, self.channels)
+            else:
+                data = np.memmap(self.path, dtype="<f4", mode="c", offset=_WAV_HEADER_BYTES,
+                                 shape=(self.num_samples, self.channels))
+        else:
+            import soundfile as sf
+            data, _ = sf.read(self.path, dtype="float32", always_2d=True)
+        return torch.from_numpy(data).t()
+
+    def __repr__(self):
+        return f"StreamedAudio({self.path!r}, {self.duration:.1f}s, {self.channels}ch @ {self.sample_rate}Hz)"
+
+
+class StreamingAudioWriter:
+    """
+    Incremental writer for assembled SRT audio.
+
+    Assembly code places segments at absolute sample offsets through region(), then calls
+    flush_until() with the earliest offset any later segment can still touch. Everything before
+    that point is final: it is appended to the file and dropped from memory. Segments therefore
+    have to arrive in (roughly) time order; writing before the flushed position is an error.
+
+    Audio is written to a temporary file next to the output, which replaces the output on close
+    and is deleted on abort. An earlier render of the same path (possibly still mapped by
+    StreamedAudio.load, or the last good render before a failed one) is never written into.
+    """
+
+    def __init__(self, path: str, sample_rate: int, channels: int = 1, flush_seconds: float = 10.0):
+        """
+        Args:
+            path: Output file, .wav (32-bit float) or .flac (24-bit, needs soundfile)
+            sample_rate: Audio sample rate
+            channels: Number of output channels
+            flush_seconds: Minimum amount of finished audio written to the file at a time
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in STREAMING_FORMATS:
+            raise ValueError(f"Unsupported streaming output format '{extension}', expected one of {STREAMING_FORMATS}")
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._temp_path = f"{path}.{os.getpid()}.partial"
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.flush_samples = max(1, int(flush_seconds * sample_rate))
+        self.flushed = 0  # samples already written to the file
+        self._pending = torch.zeros(channels, 0)  # audio from self.flushed on, still open for writes
+        self._pending_end = 0  # end of the audio written so far
+        self._closed = False
+
+        if extension == ".wav":
+            self._file = open(self._temp_path, "wb")
+            self._file.write(self._wav_header(0))
+            self._sound_file = None
+        else:
+            import soundfile as sf
+            self._file = None
+            self._sound_file = sf.SoundFile(self._temp_path, "w", samplerate=sample_rate, channels=channels,
+                                            format="FLAC", subtype="PCM_24")
+
+    def _wav_header(self, num_samples: int) -> bytes:
+        data_bytes = num_samples * self.channels * 4
+        return b"".join([
+            b"RIFF", struct.pack("<I", _WAV_HEADER_BYTES - 8 + data_bytes), b"WAVE",
+            # WAVE_FORMAT_IEEE_FLOAT, 32 bits per sample
+            b"fmt ", struct.pack("<IHHIIHH", 16, 3, self.channels, self.sample_rate,
+                                 self.sample_rate * self.channels * 4, self.channels * 4, 32),
+            b"fact", struct.pack("<II", 4, num_samples),
+            b"data", struct.pack("<I", data_bytes),
+        ])
+
+    def region(self, start: int, end: int) -> torch.Tensor:
+        """
+        Writable [channels, end - start] view of the output at absolute sample positions.
+
+        Unwritten audio reads as silence; the output grows as needed.
+        """
+        if self._closed:
+            raise RuntimeError("Streaming writer is already closed")
+        if start < self.flushed:
+            raise ValueError(f"Sample {start} was already written to {self.path} (flushed up to {self.flushed})")
+        needed = end - self.flushed
+        if needed > self._pending.size(-1):
+            # Grow geometrically so a run of small segments does not copy the window every time
+            grown = torch.zeros(self.channels, max(needed, 2 * self._pending.size(-1)))
+            grown[:, :self._pending.size(-1)] = self._pending
+            self._pending = grown
+        self._pending_end = max(self._pending_end, end)
+        return self._pending[:, start - self.flushed:end - self.flushed]
+
+    def add(self, start: int, audio: torch.Tensor):
+        """Mix a segment into the output at a sample offset (mono segments play on every channel)."""
+        audio = audio.detach().to("cpu", torch.float32)
+        if audio.dim() == 1:
+            audio = audio.unsqueeze(0)
+        elif audio.size(0) != self.channels and audio.size(0) != 1:
+            if self.channels != 1:
+                raise RuntimeError(f"Channel mismatch: output has {self.channels} channels, segment has {audio.size(0)}")
+            audio = audio.sum(dim=0, keepdim=True)
+        self.region(start, start + audio.size(-1)).add_(audio)
+
+    def flush_until(self, position: int, force: bool = False):
+        """
+        Write out the audio before `position`, which no later segment will touch.
+
+        Small amounts are held back until flush_seconds of audio is final, unless forced.
+        """
+        ready = min(position, self._pending_end) - self.flushed
+        if ready <= 0 or (ready < self.flush_samples and not force):
+            return
+        self._write(self._pending[:, :ready])
+        self._pending = self._pending[:, ready:].clone()
+        self.flushed += ready
+
+    def _write(self, audio: torch.Tensor):
+        interleaved = audio.t().contiguous().numpy()
+        if self._sound_file is not None:
+            self._sound_file.write(interleaved)
+            return
+        if (self.flushed + audio.size(-1)) * self.channels * 4 > _WAV_MAX_DATA_BYTES:
+            raise ValueError(f"{self.path} would exceed the 4GB WAV size limit, use a .flac output file instead")
+        self._file.write(interleaved.astype("<f4", copy=False).tobytes())
+
+    def close(self, total_samples: Optional[int] = None) -> StreamedAudio:
+        """
+        Flush the remaining audio and finalize the file.
+
+        Args:
+            total_samples: Pad the output with silence up to this length (e.g. the last subtitle's end)
+
+        Returns:
+            Handle to the written file
+        """
+        if self._closed:
+            raise RuntimeError("Streaming writer is already closed")
+        if total_samples is not None and total_samples > self._pending_end:
+            self.region(self._pending_end, total_samples)
+        self.flush_until(self._pending_end, force=True)
+        self._finalize()
+        print(f"💾 Streamed {self.flushed / self.sample_rate:.1f}s of audio to {self.path}")
+        return StreamedAudio(self.path, self.sample_rate, self.channels, self.flushed)
+
+    def abort(self):
+        """Discard a failed or cancelled render, leaving any existing output file untouched."""
+        if self._closed:
+            return
+        self._pending = torch.zeros(self.channels, 0)
+        self._closed = True
+        if self._sound_file is not None:
+            self._sound_file.close()
+        else:
+            self._file.close()
+        try:
+            os.remove(self._temp_path)
+        except OSError:
+            pass
+
+    def _finalize(self):
+        self._pending = torch.zeros(self.channels, 0)
+        self._closed = True
+        if self._sound_file is not None:
+            self._sound_file.close()
+        else:
+            self._file.seek(0)
+            self._file.write(self._wav_header(self.flushed))
+            self._file.close()
+        os.replace(self._temp_path, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        return False
+
+
+def resolve_output_path(output_file: str) -> str:
+    """Relative output files go to the ComfyUI output directory (the working directory outside ComfyUI)."""
+    output_file = os.path.expanduser(output_file.strip())
+    if os.path.isabs(output_file):
+        return output_file
+    try:
+        import folder_paths
+        return os.path.join(folder_paths.get_output_directory(), output_file)
+    except ImportError:
+        return os.path.abspath(output_file)
+
+
+def create_streaming_writer(output_file: str, sample_rate: int,
+                            audio_segments: List[torch.Tensor]) -> Optional[StreamingAudioWriter]:
+    """
+    Writer for an SRT node's output_file input, or None to assemble in memory as usual.
+
+    The channel layout follows the first segment, like every assembly mode does.
+    """
+    if not output_file or not output_file.strip():
+        return None
+    first = audio_segments[0] if audio_segments else None
+    channels = first.shape[0] if first is not None and first.dim() == 2 else 1
+    return StreamingAudioWriter(resolve_output_path(output_file), sample_rate, channels)
@@ -12,6 +12,8 @@ try:
 except ImportError:
     folder_paths = None
 
+from utils.voice.voice_index import VoiceIndex
+
 
 class VoiceDiscovery:
     """
@@ -24,6 +26,7 @@ class VoiceDiscovery:
     - Character mapping for multi-character TTS
     - Support for both F5TTS (with text) and ChatterBox (audio only)
     - Performance caching to avoid repeated filesystem scans
+    - Persisted, incrementally refreshed file index (see VoiceIndex), optionally kept current by a watcher
     - Backward compatibility with existing flat structure
     """
     
@@ -35,6 +38,7 @@ class VoiceDiscovery:
         self._character_aliases = {}
         self._character_language_defaults = {}
         self._aliases_valid = False
+        self._index = VoiceIndex(audio_filter=self._filter_audio_files, on_change=self._on_voice_folder_change)
         
         # Initialize character discovery on first import
         self._initialize_character_discovery()
@@ -78,8 +82,10 @@ class VoiceDiscovery:
         Returns:
             Dict with 'audio_path', 'text_path', 'text_content', 'source_folder'
         """
-        if voice_key == "none" or not self._cache_valid:
+        if voice_key == "none":
             return None
+        if not self._cache_valid:
+            self._refresh_cache()
             
         return self._cache.get(voice_key)
     
@@ -148,39 +154,28 @@ class VoiceDiscovery:
             prefix: Prefix for voice keys (e.g., "voices_examples")
         """
         try:
-            for root, dirs, files in os.walk(base_dir):
-                # Get relative path from base directory
-                rel_path = os.path.relpath(root, base_dir)
-                if rel_path == ".":
-                    rel_path = ""
+            # Audio files with their companion texts (same priority as _find_companion_text) from the index
+            for root, rel_path, audio_file, text_path, text_content in self._index.voice_files(base_dir):
+                audio_path = os.path.join(root, audio_file)
                 
-                # Filter audio files
-                audio_files = self._filter_audio_files(files)
-                
-                for audio_file in audio_files:
-                    audio_path = os.path.join(root, audio_file)
+                if text_path and text_content:
+                    # Create voice key for dropdown
+                    if rel_path:
+                        voice_key = f"{prefix}/{rel_path}/{audio_file}" if prefix else f"{rel_path}/{audio_file}"
+                    else:
+                        voice_key = f"{prefix}/{audio_file}" if prefix else audio_file
                     
-                    # Find companion text file with priority
-                    text_path, text_content = self._find_companion_text(audio_path)
+                    # Clean up voice key (remove double slashes, etc.)
+                    voice_key = voice_key.replace("//", "/").strip("/")
+                    
+                    self._cache[voice_key] = {
+                        'audio_path': audio_path,
+                        'text_path': text_path,
+                        'text_content': text_content,
+                        'source_folder': source_name,
+                        'relative_path': rel_path
+                    }
                     
-                    if text_path and text_content:
-                        # Create voice key for dropdown
-                        if rel_path:
-                            voice_key = f"{prefix}/{rel_path}/{audio_file}" if prefix else f"{rel_path}/{audio_file}"
-                        else:
-                            voice_key = f"{prefix}/{audio_file}" if prefix else audio_file
-                        
-                        # Clean up voice key (remove double slashes, etc.)
-                        voice_key = voice_key.replace("//", "/").strip("/")
-                        
-                        self._cache[voice_key] = {
-                            'audio_path': audio_path,
-                            'text_path': text_path,
-                            'text_content': text_content,
-                            'source_folder': source_name,
-                            'relative_path': rel_path
-                        }
-                        
         except Exception as e:
             print(f"⚠️ Voice Discovery: Error scanning {source_name}: {e}")
     
@@ -239,7 +234,8 @@ class VoiceDiscovery:
         return None, None
     
     def invalidate_cache(self):
-        """Invalidate the cache to force refresh on next access."""
+        """Invalidate the cache to force refresh on next access (re-checks every indexed folder)."""
+        self._index.invalidate()
         self._cache_valid = False
         self._cache.clear()
         self._character_cache_valid = False
@@ -248,6 +244,12 @@ class VoiceDiscovery:
         self._character_aliases.clear()
         self._character_language_defaults.clear()
     
+    def _on_voice_folder_change(self):
+        """Watcher callback: rebuild the caches from the (incrementally updated) index on next access."""
+        self._cache_valid = False
+        self._character_cache_valid = False
+        self._aliases_valid = False
+    
     def get_available_characters(self) -> Set[str]:
         """
         Get set of available character names from voice folders.
@@ -567,32 +569,26 @@ class VoiceDiscovery:
         Folders are ignored as character identifiers - they're only for organization.
         """
         try:
-            for root, dirs, files in os.walk(base_dir):
-                # Filter to only audio files
-                audio_files = self._filter_audio_files(files)
+            # Same index walk as _scan_directory (os.walk order), refreshed at most once per invalidation
+            for root, _, audio_file, text_path, text_content in self._index.voice_files(base_dir):
+                audio_path = os.path.join(root, audio_file)
+                
+                # Extract character name from filename (remove extension)
+                character_name = Path(audio_file).stem.lower()
+                
+                # Skip if this character was already found (first occurrence wins)
+                if character_name in self._character_cache:
+                    continue
+                
+                # Store character info
+                self._character_cache[character_name] = {
+                    'audio_path': audio_path,
+                    'text_path': text_path,
+                    'text_content': text_content or "",
+                    'source_folder': source_name,
+                    'character_directory': root  # Store the actual directory containing the file
+                }
                 
-                for audio_file in audio_files:
-                    audio_path = os.path.join(root, audio_file)
-                    
-                    # Extract character name from filename (remove extension)
-                    character_name = Path(audio_file).stem.lower()
-                    
-                    # Skip if this character was already found (first occurrence wins)
-                    if character_name in self._character_cache:
-                        continue
-                    
-                    # Look for companion text file
-                    text_path, text_content = self._find_companion_text(audio_path)
-                    
-                    # Store character info
-                    self._character_cache[character_name] = {
-                        'audio_path': audio_path,
-                        'text_path': text_path,
-                        'text_content': text_content or "",
-                        'source_folder': source_name,
-                        'character_directory': root  # Store the actual directory containing the file
-                    }
-                    
         except Exception as e:
             print(f"⚠️ Character Discovery: Error scanning audio files in {source_name}: {e}")
     
@@ -117,22 +117,33 @@ class MultilingualEngine:
                     print(f"🔄 Falling back to default model")
                     engine_adapter.load_base_model(params.get("model", "default"), params.get("device", "auto"))
             
+            # Submit the whole language group in one batched call when the engine supports it
+            batched_audio = {}
+            if params.get("batch_size", 1) > 1 and hasattr(engine_adapter, "generate_segments_audio_batch"):
+                group_requests = [
+                    (original_idx, segment_text, self._get_character_voice(character, character_mapping, params)[0], character)
+                    for original_idx, character, segment_text, segment_lang in lang_segments
+                ]
+                batched_audio = engine_adapter.generate_segments_audio_batch(group_requests, **params)
+            
             # Process each segment in this language group
             for original_idx, character, segment_text, segment_lang in lang_segments:
                 segment_display_idx = original_idx + 1  # For display (1-based)
                 
                 # Get character voice or fallback to main
-                if self.engine_type == "f5tts":
-                    char_audio, char_text = character_mapping.get(character, (None, None))
-                    if not char_audio or not char_text:
-                        char_audio = params.get("main_audio_reference")
-                        char_text = params.get("main_text_reference") 
-                else:  # chatterbox
-                    char_audio_tuple = character_mapping.get(character, (None, None))
-                    if char_audio_tuple[0]:
-                        char_audio = char_audio_tuple[0]  # Only get the audio path
-                    else:
-                        char_audio = params.get("main_audio_reference")
+                char_audio, char_text = self._get_character_voice(character, character_mapping, params)
+                
+                if original_idx in batched_audio:
+                    segment_audio = batched_audio[original_idx]
+                    all_audio_segments.append(AudioSegmentResult(
+                        audio=segment_audio,
+                        duration=self._get_audio_duration(segment_audio),
+                        character=character,
+                        text=segment_text,
+                        language=segment_lang,
+                        original_index=original_idx
+                    ))
+                    continue
                 
                 # Show generation message with character and language info
                 if character == "narrator":
@@ -197,6 +208,21 @@ class MultilingualEngine:
             info_message=info_message
         )
     
+    def _get_character_voice(self, character: str, character_mapping: Dict, params: Dict) -> Tuple[Any, Optional[str]]:
+        """Get (audio reference, text reference) for a character, falling back to the main reference."""
+        if self.engine_type == "f5tts":
+            char_audio, char_text = character_mapping.get(character, (None, None))
+            if not char_audio or not char_text:
+                char_audio = params.get("main_audio_reference")
+                char_text = params.get("main_text_reference")
+            return char_audio, char_text
+        
+        # chatterbox only uses the audio path
+        char_audio_tuple = character_mapping.get(character, (None, None))
+        if char_audio_tuple[0]:
+            return char_audio_tuple[0], None
+        return params.get("main_audio_reference"), None
+    
     def _group_segments_by_language(self, character_segments_with_lang: List[Tuple[str, str, str]]) -> Dict[str, List[Tuple[int, str, str, str]]]:
         """Group character segments by language for efficient processing."""
         language_groups = {}
@@ -0,0 +1,351 @@
+"""
+Voice Index - Persisted, incrementally updated index of voice audio files and their companion texts
+Refreshes only re-list directories whose mtime changed; an optional watchdog observer narrows that to changed folders
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    import folder_paths
+except ImportError:
+    folder_paths = None
+
+
+INDEX_VERSION = 1
+# Set to 1 to watch the voice folders for changes (inotify on Linux, needs the watchdog package)
+VOICE_WATCH_ENV = "CHATTERBOX_VOICE_WATCH"
+# Companion text suffixes in priority order: .reference.txt (F5-TTS reference text) > .txt
+COMPANION_TEXT_SUFFIXES = (".reference.txt", ".txt")
+# Sidecar folder of the voice library (precomputed conditionals), never indexed
+LIBRARY_DIR_NAME = ".voice_library"
+# Default Windows and macOS file systems ignore case: "Voice.TXT" is the companion text of "voice.wav"
+_CASE_INSENSITIVE_FS = os.name == "nt" or sys.platform == "darwin"
+# Directories modified this recently are re-listed next time: coarse mtimes (FAT, SMB) can hide a later change
+_RACY_MTIME_NS = 2_000_000_000
+
+
+class VoiceIndex:
+    """
+    Index of the voice folders, persisted between sessions.
+
+    Each directory of a voice folder is recorded with its mtime, its subdirectories, its audio files
+    (size, mtime) and the stat and content of their companion texts. A refresh stats every indexed
+    directory but only re-lists those whose mtime changed, and re-reads a companion text only when its
+    size or mtime changed (texts are stat'ed on every refresh, as in-place edits keep the directory mtime).
+
+    With a watcher running, refreshes after the first skip the stat pass entirely and only re-list the
+    directories that received file system events, so they cost O(changed files).
+    """
+
+    def __init__(self, index_path: Optional[str] = None,
+                 audio_filter: Optional[Callable[[List[str]], List[str]]] = None,
+                 watch: Optional[bool] = None, on_change: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            index_path: JSON file the index is persisted to (default: models/TTS/voice_index.json)
+            audio_filter: Picks the audio files out of a directory listing
+            watch: Watch indexed folders for changes (default: CHATTERBOX_VOICE_WATCH)
+            on_change: Called (from the watcher thread) when an indexed folder changes
+        """
+        self.index_path = index_path or self._get_default_index_path()
+        self._audio_filter = audio_filter or self._default_audio_filter
+        if watch is None:
+            watch = os.environ.get(VOICE_WATCH_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+        self.watch = watch
+        self._on_change = on_change
+        self._lock = threading.RLock()
+        self._roots: Optional[Dict[str, Dict[str, dict]]] = None  # root -> relative dir -> record
+        self._fresh: Set[str] = set()  # roots refreshed since the last change or invalidation
+        self._verified: Set[str] = set()  # roots fully stat'ed since the watcher started
+        self._dirty: Dict[str, Set[str]] = {}  # root -> relative dirs with watcher events
+        self._observer = None
+        self._watched: Set[str] = set()
+
+    @staticmethod
+    def _get_default_index_path() -> str:
+        """Persistent index location (next to the other TTS caches in models/)."""
+        if folder_paths is not None:
+            return os.path.join(folder_paths.models_dir, "TTS", "voice_index.json")
+        return os.path.join(tempfile.gettempdir(), "chatterbox_srt_voice", "voice_index.json")
+
+    @staticmethod
+    def _default_audio_filter(files: List[str]) -> List[str]:
+        audio_extensions = {'.wav', '.mp3', '.flac', '.ogg', '.m4a', '.aac'}
+        return [f for f in files if Path(f).suffix.lower() in audio_extensions]
+
+    def voice_files(self, base_dir: str) -> List[Tuple[str, str, str, Optional[str], Optional[str]]]:
+        """
+        Audio files below base_dir in os.walk (top-down) order, refreshing the index first if needed.
+
+        Returns:
+            List of (directory, relative_dir, audio_file, text_path, text_content); the relative
+            directory is "" for base_dir itself, text_path/text_content are None without a companion text
+        """
+        root = os.path.abspath(base_dir)
+        with self._lock:
+            if root not in self._fresh:
+                self.refresh(root)
+            records = self._roots.get(root, {})
+            voice_files = []
+            stack = [""]
+            while stack:
+                rel_dir = stack.pop()
+                record = records.get(rel_dir)
+                if record is None:
+                    continue
+                directory = os.path.join(root, rel_dir) if rel_dir else root
+                for audio_file, _, _ in record["audio"]:
+                    text_path, text_content = self._companion_text(directory, audio_file, record["texts"])
+                    voice_files.append((directory, rel_dir, audio_file, text_path, text_content))
+                stack.extend(os.path.join(rel_dir, d) if rel_dir else d for d in reversed(record["subdirs"]))
+            return voice_files
+
+    @staticmethod
+    def _companion_text(directory: str, audio_file: str, texts: Dict[str, list]) -> Tuple[Optional[str], Optional[str]]:
+        """First non-empty companion text by priority, like VoiceDiscovery._find_companion_text."""
+        stem = Path(audio_file).stem
+        for suffix in COMPANION_TEXT_SUFFIXES:
+            text = texts.get(stem + suffix)
+            if text is not None and text[2]:
+                return os.path.join(directory, stem + suffix), text[2]
+        return None, None
+
+    def refresh(self, base_dir: str):
+        """Bring the index of one voice folder up to date and persist it if anything changed."""
+        root = os.path.abspath(base_dir)
+        with self._lock:
+            self._load()
+            records = self._roots.setdefault(root, {})
+            if self.watch and root in self._verified:
+                changed = self._update(root, records, self._dirty.pop(root, set()))
+            else:
+                # Start watching before the stat pass, so changes made during it are not missed
+                if self.watch and self._start_watching(root):
+                    self._verified.add(root)
+                self._dirty.pop(root, None)
+                changed = self._update(root, records, None)
+            self._fresh.add(root)
+            if changed:
+                self._save()
+
+    def invalidate(self):
+        """Force a full stat pass on the next refresh of every folder."""
+        with self._lock:
+            self._fresh.clear()
+            self._verified.clear()
+            self._dirty.clear()
+
+    def _update(self, root: str, records: Dict[str, dict], dirty: Optional[Set[str]]) -> bool:
+        """
+        Walk the indexed tree, re-listing changed directories and indexing new ones.
+
+        With dirty=None every directory is stat'ed to detect changes, otherwise only the dirty
+        directories are re-listed. Records of directories no longer reachable are dropped.
+
+        Returns:
+            True if the index changed
+        """
+        changed = False
+        reachable = {}
+        stack = [""]
+        while stack:
+            rel_dir = stack.pop()
+            directory = os.path.join(root, rel_dir) if rel_dir else root
+            previous = records.get(rel_dir)
+            record = previous
+            if previous is None or (dirty is not None and rel_dir in dirty):
+                record = self._list_directory(directory, previous)
+            elif dirty is None:
+                try:
+                    mtime_ns = os.stat(directory).st_mtime_ns
+                except OSError:
+                    record = None
+                else:
+                    if mtime_ns != previous["mtime_ns"] or not self._texts_unchanged(directory, previous):
+                        record = self._list_directory(directory, previous)
+            if record is None:
+                changed = changed or previous is not None
+                continue
+            changed = changed or record is not previous
+            reachable[rel_dir] = record
+            stack.extend(os.path.join(rel_dir, d) if rel_dir else d for d in reversed(record["subdirs"]))
+
+        if len(reachable) != len(records):
+            changed = True
+        records.clear()
+        records.update(reachable)
+        return changed
+
+    @staticmethod
+    def _texts_unchanged(directory: str, record: dict) -> bool:
+        for name, (size, mtime_ns, _) in record["texts"].items():
+            try:
+                stat = os.stat(os.path.join(directory, name))
+            except OSError:
+                return False
+            if stat.st_size != size or stat.st_mtime_ns != mtime_ns:
+                return False
+        return True
+
+    def _list_directory(self, directory: str, previous: Optional[dict]) -> Optional[dict]:
+        """List one directory; companion texts are only read if new or changed. None if it is gone."""
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+            files = []
+            subdirs = []
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        files.append(entry.name)
+                    elif entry.name != LIBRARY_DIR_NAME and not entry.is_symlink():  # os.walk does not follow directory symlinks either
+                        subdirs.append(entry.name)
+        except OSError:
+            return None
+
+        if mtime_ns >= time.time_ns() - _RACY_MTIME_NS:
+            mtime_ns = -1  # too recent to trust: always re-list next time
+
+        # Matched like os.path.isfile would on this platform; texts stay keyed by the expected name
+        # (stem + suffix), which also opens the file on a case-insensitive file system
+        file_names = {(f.casefold() if _CASE_INSENSITIVE_FS else f): f for f in files}
+        previous_texts = previous["texts"] if previous is not None else {}
+        audio = []
+        texts = {}
+        for audio_file in self._audio_filter(files):
+            audio.append([audio_file, *self._stat(os.path.join(directory, audio_file))])
+            stem = Path(audio_file).stem
+            for suffix in COMPANION_TEXT_SUFFIXES:
+                name = stem + suffix
+                actual_name = file_names.get(name.casefold() if _CASE_INSENSITIVE_FS else name)
+                if actual_name is None or name in texts:
+                    continue
+                text_path = os.path.join(directory, actual_name)
+                size, text_mtime_ns = self._stat(text_path)
+                old = previous_texts.get(name)
+                if old is not None and old[0] == size and old[1] == text_mtime_ns:
+                    texts[name] = old
+                else:
+                    texts[name] = [size, text_mtime_ns, self._read_text(text_path)]
+        return {"mtime_ns": mtime_ns, "subdirs": subdirs, "audio": audio, "texts": texts}
+
+    @staticmethod
+    def _stat(path: str) -> Tuple[int, int]:
+        try:
+            stat = os.stat(path)
+            return stat.st_size, stat.st_mtime_ns
+        except OSError:
+            return -1, -1
+
+    @staticmethod
+    def _read_text(text_path: str) -> Optional[str]:
+        try:
+            with open(text_path, 'r', encoding='utf-8') as f:
+                return f.read().strip()
+        except Exception as e:
+            print(f"⚠️ Voice Discovery: Error reading {text_path}: {e}")
+            return None
+
+    def _load(self):
+        """Load the persisted index once per process (a missing or outdated file starts empty)."""
+        if self._roots is not None:
+            return
+        self._roots = {}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION and isinstance(data.get("roots"), dict):
+                self._roots = data["roots"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Voice Discovery: Ignoring unreadable voice index {self.index_path}: {e}")
+
+    def _save(self):
+        """Write the index atomically, so a concurrent ComfyUI process never reads a partial file."""
+        temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": INDEX_VERSION, "roots": self._roots}, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            print(f"⚠️ Voice Discovery: Could not save voice index {self.index_path}: {e}")
+
+    def _start_watching(self, root: str) -> bool:
+        """Schedule a recursive watch on a voice folder. False if watching is unavailable."""
+        if root in self._watched:
+            return True
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            print(f"⚠️ Voice Discovery: {VOICE_WATCH_ENV} is set but watchdog is not installed (pip install watchdog)")
+            self.watch = False
+            return False
+
+        index = self
+
+        class VoiceFolderHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                index._on_event(root, event)
+
+        try:
+            if self._observer is None:
+                self._observer = Observer()
+                self._observer.daemon = True
+                self._observer.start()
+            self._observer.schedule(VoiceFolderHandler(), root, recursive=True)
+        except OSError as e:
+            # e.g. the inotify watch limit (fs.inotify.max_user_watches) is exhausted
+            print(f"⚠️ Voice Discovery: Cannot watch {root}, falling back to stat refreshes: {e}")
+            return False
+        self._watched.add(root)
+        return True
+
+    def _on_event(self, root: str, event):
+        """Mark the directories touched by a file system event as dirty."""
+        if event.event_type in ("opened", "closed_no_write"):
+            return
+        changed_dirs = []
+        for path in (event.src_path, getattr(event, "dest_path", None)):
+            if not path:
+                continue
+            path = os.fsdecode(path)
+            if LIBRARY_DIR_NAME in path.split(os.sep):
+                continue
+            changed_dirs.append(os.path.dirname(path))
+            if event.is_directory:
+                changed_dirs.append(path)
+        with self._lock:
+            dirty = self._dirty.setdefault(root, set())
+            for directory in changed_dirs:
+                rel_dir = os.path.relpath(directory, root)
+                if rel_dir == ".":
+                    rel_dir = ""
+                if not rel_dir.startswith(".."):
+                    dirty.add(rel_dir)
+            self._fresh.discard(root)
+        if self._on_change is not None:
+            self._on_change()
+
+    def stop_watching(self):
+        """Stop the watcher; later refreshes fall back to stat passes."""
+        with self._lock:
+            observer, self._observer = self._observer, None
+            self.watch = False
+            self._watched.clear()
+            self.invalidate()
+        if observer is not None:
+            observer.stop()
+            observer.join(timeout=5)
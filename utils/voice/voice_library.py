@@ -0,0 +1,183 @@
+"""
+Voice Library - Precomputed reference voice conditionals stored as sidecar files next to the voice audio
+A background builder walks the voice catalog so a whole character cast is ready before its first use
+"""
+
+import os
+import threading
+import weakref
+from typing import Any, Dict, List, Optional
+
+import torch
+
+from utils.models.residency import model_residency
+from utils.voice.voice_index import LIBRARY_DIR_NAME
+
+
+# Set to 1 to precompute conditionals for every catalog voice in the background when a model loads
+VOICE_LIBRARY_ENV = "CHATTERBOX_VOICE_LIBRARY"
+
+
+class VoiceLibrary:
+    """
+    Sidecar store of precomputed reference voice conditionals.
+
+    Entries live in a .voice_library folder next to each voice file, one file per model version
+    (<audio file>.<model version>.pt). Each entry records the content hash of the audio it was
+    computed from, so an edited voice file is never paired with stale conditionals.
+
+    Models opt in by implementing precompute_conditionals(audio_path) and reading entries back
+    through load() (see ChatterboxTTS.voice_library).
+    """
+
+    def __init__(self, discovery=None):
+        self._discovery = discovery
+        self._lock = threading.Lock()
+        self._queue: List[Any] = []
+        self._scheduled = set()  # model versions queued or being built
+        self._thread: Optional[threading.Thread] = None
+        self._unwritable_dirs = set()
+
+    @staticmethod
+    def enabled() -> bool:
+        """Whether background building is switched on (CHATTERBOX_VOICE_LIBRARY)."""
+        return os.environ.get(VOICE_LIBRARY_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+    @staticmethod
+    def sidecar_path(audio_path: str, model_version: str) -> str:
+        directory, audio_file = os.path.split(os.path.abspath(audio_path))
+        return os.path.join(directory, LIBRARY_DIR_NAME, f"{audio_file}.{model_version}.pt")
+
+    def load(self, audio_path: str, model_version: str, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Precomputed entry for a voice, or None if there is none for this audio content and model."""
+        path = self.sidecar_path(audio_path, model_version)
+        if not os.path.exists(path):
+            return None
+        try:
+            entry = torch.load(path, map_location="cpu", weights_only=True)
+        except Exception as e:
+            print(f"⚠️ Voice Library: Ignoring unreadable entry {path}: {e}")
+            return None
+        if entry.get("content_hash") != content_hash:
+            return None  # the voice file changed since the entry was built
+        return entry
+
+    def save(self, audio_path: str, model_version: str, content_hash: str, entry: Dict[str, Any]) -> bool:
+        """Store an entry next to the voice (atomically). False if the voice folder is not writable."""
+        path = self.sidecar_path(audio_path, model_version)
+        directory = os.path.dirname(path)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(directory, exist_ok=True)
+            torch.save({**entry, "content_hash": content_hash, "model_version": model_version}, temp_path)
+            os.replace(temp_path, path)
+            return True
+        except OSError as e:
+            if directory not in self._unwritable_dirs:
+                self._unwritable_dirs.add(directory)
+                print(f"⚠️ Voice Library: Cannot write to {directory}, voices there are embedded on use: {e}")
+            return False
+
+    def voice_paths(self) -> List[str]:
+        """Audio files of every catalog voice: character voices and reference voices, without duplicates."""
+        discovery = self._discovery
+        if discovery is None:
+            from utils.voice.discovery import voice_discovery as discovery
+        paths = []
+        for character in sorted(discovery.get_available_characters()):
+            info = discovery.get_character_voice_info(character, engine_type="chatterbox")
+            if info and info.get('audio_path'):
+                paths.append(info['audio_path'])
+        for voice_key in discovery.get_available_voices():
+            info = discovery.get_voice_info(voice_key)
+            if info and info.get('audio_path'):
+                paths.append(info['audio_path'])
+        return list(dict.fromkeys(paths))
+
+    def build(self, model, audio_paths: Optional[List[str]] = None) -> int:
+        """
+        Precompute the conditionals of catalog voices for a model.
+
+        Args:
+            model: Model implementing precompute_conditionals(audio_path)
+            audio_paths: Voices to build (default: the whole catalog)
+
+        Returns:
+            Number of voices that were (re)computed; up-to-date entries are skipped
+        """
+        if audio_paths is None:
+            audio_paths = self.voice_paths()
+        return self._build(lambda: model, audio_paths, while_resident=False)
+
+    def build_in_background(self, model):
+        """
+        Queue a model for a background build (once per model version while it is pending).
+
+        The catalog is read here, on the calling thread, as VoiceDiscovery is not thread-safe.
+        The queue only holds a weak reference, so a model evicted from its cache is freed
+        instead of being kept alive until the build reaches it.
+        """
+        version = model.conditioning_version
+        with self._lock:
+            if version in self._scheduled:
+                return
+            self._scheduled.add(version)
+        audio_paths = self.voice_paths()
+        with self._lock:
+            self._queue.append((weakref.ref(model), version, audio_paths))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="voice_library", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._queue:
+                    self._thread = None
+                    return
+                model_ref, version, audio_paths = self._queue.pop(0)
+            try:
+                with torch.inference_mode():
+                    self._build(model_ref, audio_paths, while_resident=True)
+            except Exception as e:
+                print(f"⚠️ Voice Library: Background build failed: {e}")
+            finally:
+                with self._lock:
+                    self._scheduled.discard(version)
+
+    def _build(self, model_ref, audio_paths: List[str], while_resident: bool) -> int:
+        """
+        Precompute voices one at a time, each under the residency lock.
+
+        With while_resident (background builds) the build stops as soon as the residency manager
+        has offloaded or dropped the model, so it never runs on a model moving between devices
+        or keeps an evicted one alive. Voices left out are embedded on first use as usual.
+        """
+        built = 0
+        failed = 0
+        for index, audio_path in enumerate(audio_paths):
+            model = model_ref()
+            with model_residency.lock:
+                if model is None or (while_resident and not model_residency.is_resident(model)):
+                    print(f"📚 Voice Library: Model was offloaded or unloaded, skipping {len(audio_paths) - index} remaining voices")
+                    break
+                try:
+                    if model.precompute_conditionals(audio_path):
+                        built += 1
+                except Exception as e:
+                    failed += 1
+                    print(f"⚠️ Voice Library: Failed to embed {audio_path}: {e}")
+            del model
+        if built or failed:
+            failed_note = f", {failed} failed" if failed else ""
+            print(f"📚 Voice Library: Precomputed conditionals for {built} voices{failed_note}")
+        return built
+
+
+# Global voice library shared by all loaded models
+voice_library = VoiceLibrary()
+
+
+def get_voice_library() -> VoiceLibrary:
+    """Get the global voice library instance."""
+    return voice_library